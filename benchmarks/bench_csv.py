@@ -0,0 +1,79 @@
+"""CSV encoding throughput: the old DictWriter export vs the Mapping path vs the IssueRow tuple fast path.
+
+Usage: python benchmarks/bench_csv.py [--rows N] [--repeat R]
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.dto import IssueRow  # noqa: E402
+from core.services.csv_export import CSV_HEADERS, iter_csv_chunks  # noqa: E402
+
+
+def make_rows(n: int) -> list[IssueRow]:
+    return [
+        IssueRow(
+            project_id="b.5f6e7d8c-1234-4a5b-9c8d-0e1f2a3b4c5d",
+            project_name="DEV TASK 1 Project",
+            document_id=f"urn:adsk.wipprod:dm.lineage:doc{i % 5000:05d}",
+            document_name=f"Plan {i % 5000:05d}.pdf",
+            document_path=f"Project Files/Level {i % 12}/Drawings",
+            web_link=f"https://acc.autodesk.com/docs/files/projects/p/folders/f?entityId=doc{i % 5000}&viewableGuid=g{i}",
+            issue_id=f"issue-{i:07d}",
+            issue_type="Quality",
+            issue_sub_type="Clash",
+            issue_status="open" if i % 3 else "closed",
+            issue_due_date="2025-08-20" if i % 4 else None,
+            issue_start_date="2025-08-10",
+            issue_title=f"Issue number {i}",
+            issue_description="Check the slab edge, \"see detail 4\"" if i % 7 == 0 else "Routine check",
+            issue_comments="First, Second" if i % 2 else "",
+        )
+        for i in range(n)
+    ]
+
+
+def dictwriter_chunks(rows, chunk_size: int = 64 * 1024):
+    buf = io.StringIO(newline="")
+    writer = csv.DictWriter(buf, fieldnames=CSV_HEADERS, extrasaction="ignore")
+    writer.writeheader()
+    for r in rows:
+        writer.writerow(r.to_csv_row())
+        if buf.tell() >= chunk_size:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def run(label: str, encode, rows, repeat: int) -> float:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        size = sum(len(chunk) for chunk in encode(rows))
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<12} rows={len(rows)} seconds={best:.3f} rows_per_second={len(rows) / best:,.0f} bytes={size}")
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rows = make_rows(args.rows)
+    mappings = [r.to_csv_row() for r in rows]
+    baseline = run("dictwriter", dictwriter_chunks, rows, args.repeat)
+    run("mapping", lambda _: iter_csv_chunks(mappings), rows, args.repeat)
+    fast = run("tuple", iter_csv_chunks, rows, args.repeat)
+    print(f"speedup tuple vs dictwriter: {baseline / fast:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Requests/sec against a local stand-in server: one connection per call vs the pooled session.
+
+Usage: python benchmarks/bench_http_pool.py [--requests N] [--threads T] [--latency-ms MS]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.services.http_pool import build_session  # noqa: E402
+
+
+def make_handler(latency: float):
+    body = json.dumps({"data": {"id": "urn:x", "attributes": {"name": "doc.pdf"}}}).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run(label: str, get, url: str, n: int, threads: int) -> float:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        for r in ex.map(lambda _: get(url, timeout=30), range(n)):
+            r.raise_for_status()
+    dt = time.perf_counter() - t0
+    rps = n / dt
+    print(f"{label:<10} requests={n} threads={threads} seconds={dt:.3f} rps={rps:.1f}")
+    return rps
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency_ms / 1000.0))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/data/v1/projects/p/items/i/tip"
+    try:
+        before = run("unpooled", requests.get, url, args.requests, args.threads)
+        session = build_session(pool_connections=10, pool_maxsize=args.threads, pool_block=True, keep_alive=True)
+        after = run("pooled", session.get, url, args.requests, args.threads)
+        print(f"speedup={after / before:.2f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
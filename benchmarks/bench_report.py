@@ -0,0 +1,65 @@
+"""End-to-end report timing against the local fake Forge server (no network access needed).
+
+Usage: python benchmarks/bench_report.py [--issues N] [--documents N] [--depth D] [--latency-ms MS]
+                                         [--rate-429 P] [--rate-5xx P] [--rate-limit]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+for k in ("FORGE_CLIENT_ID", "FORGE_CLIENT_SECRET", "FORGE_CALLBACK_URL"):
+    os.environ.setdefault(k, "bench")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--issues", type=int, default=1000)
+    ap.add_argument("--documents", type=int, default=300)
+    ap.add_argument("--depth", type=int, default=6)
+    ap.add_argument("--fanout", type=int, default=2)
+    ap.add_argument("--latency-ms", type=float, default=10.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--rate-5xx", type=float, default=0.0)
+    ap.add_argument("--rate-limit", action="store_true", help="keep the client-side rate limiter enabled")
+    args = ap.parse_args()
+
+    import django
+    from django.conf import settings
+    django.setup()
+    from django.db import connection
+    from benchmarks.fake_forge import Dataset, FakeForge
+
+    connection.creation.create_test_db(verbosity=0)
+    ds = Dataset(issues=args.issues, documents=args.documents, depth=args.depth, fanout=args.fanout)
+    with FakeForge(ds, latency_ms=args.latency_ms, rate_429=args.rate_429, rate_5xx=args.rate_5xx) as forge:
+        settings.FORGE_BASE_URL = forge.base_url
+        settings.ACC_ACCOUNT_ID = ds.account_id
+        settings.TARGET_PROJECT_NAME = ds.project_name
+        settings.FORGE_RATE_LIMIT_ENABLED = args.rate_limit
+        settings.FORGE_RETRY_BACKOFF_BASE = 0.05
+        settings.REPORT_RUN_DEADLINE = 0
+
+        from core.models import OAuthToken
+        from core.services.acc_client import ACCClient
+        from core.services.aggregate import IssueAggregator
+        from core.services.metrics import http_metrics
+
+        OAuthToken.objects.create(access_token="bench", refresh_token="bench", expires_at=int(time.time()) + 3600)
+        t0 = time.perf_counter()
+        rows = IssueAggregator(ACCClient()).collect_rows()
+        dt = time.perf_counter() - t0
+
+        calls = sum(forge.counts.values())
+        print(f"issues={len(ds.issues)} documents={len(ds.items)} folders={len(ds.folders)} rows={len(rows)}")
+        print(f"seconds={dt:.2f} server_calls={calls} calls_per_second={calls / dt:.1f}")
+        for line in http_metrics.summary_lines():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""Local stand-in for the Forge/ACC endpoints the report uses, backed by a synthetic dataset.
+
+Usage: python benchmarks/fake_forge.py [--port 8765] [--issues N] [--documents N] [--depth D] [--fanout F]
+                                       [--latency-ms MS] [--rate-429 P] [--rate-5xx P]
+
+Then point the app at it with FORGE_BASE_URL=http://127.0.0.1:<port> and the printed
+ACC_ACCOUNT_ID / TARGET_PROJECT_NAME. /authentication/v2/authorize redirects straight back
+to the callback, so the normal /auth/login/ flow works offline.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_FOLDER = "urn:adsk.wipprod:fs.folder:co.root"
+
+
+class Dataset:
+    def __init__(self, *, issues=200, documents=100, depth=4, fanout=3, pdf_ratio=0.7, comments_max=3,
+                 seed=1, account_id="acc123", project_name="DEV TASK 1 Project"):
+        rnd = random.Random(seed)
+        self.hub_id = f"b.{account_id}"
+        self.account_id = account_id
+        self.project_name = project_name
+        self.project_id = "b.proj-0001"
+        self.issues_project_id = "proj-0001"
+
+        self.folders: dict[str, dict] = {ROOT_FOLDER: {"name": "Project Files", "parent": None}}
+        level = [ROOT_FOLDER]
+        for d in range(1, depth):
+            nxt = []
+            for parent in level:
+                for k in range(fanout):
+                    fid = f"urn:adsk.wipprod:fs.folder:co.d{d}-{len(self.folders):05d}"
+                    self.folders[fid] = {"name": f"Folder {d}-{k}", "parent": parent}
+                    nxt.append(fid)
+            level = nxt
+        leaves = level
+
+        self.items: dict[str, dict] = {}
+        for n in range(documents):
+            urn = f"urn:adsk.wipprod:dm.lineage:doc{n:06d}"
+            is_pdf = rnd.random() < pdf_ratio
+            self.items[urn] = {
+                "name": f"Sheet-{n:05d}.pdf" if is_pdf else f"Model-{n:05d}.dwg",
+                "file_type": "pdf" if is_pdf else "dwg",
+                "folder": rnd.choice(leaves),
+                "version": 1 + rnd.randrange(3),
+            }
+        self.children: dict[str, list[tuple[str, str]]] = {fid: [] for fid in self.folders}
+        for fid, f in self.folders.items():
+            if f["parent"]:
+                self.children[f["parent"]].append(("folders", fid))
+        for urn, it in self.items.items():
+            self.children[it["folder"]].append(("items", urn))
+
+        self.issue_types = [
+            {"id": "t1", "name": "Quality", "subtypes": [{"id": "s1", "name": "Clash"}, {"id": "s2", "name": "Defect"}]},
+            {"id": "t2", "name": "Safety", "subtypes": [{"id": "s3", "name": "Hazard"}]},
+        ]
+        subtypes = [("t1", "s1"), ("t1", "s2"), ("t2", "s3")]
+        statuses = ["open", "closed", "in_review", "draft"]
+        urns = list(self.items)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.issues: list[dict] = []
+        self.comments: dict[str, list[dict]] = {}
+        for n in range(issues):
+            iid = f"issue-{n:06d}"
+            docs = rnd.sample(urns, k=min(len(urns), rnd.choice([0, 1, 1, 2])))
+            tid, sid = rnd.choice(subtypes)
+            created = base + timedelta(hours=n)
+            comments = [
+                {
+                    "id": f"{iid}-c{k}",
+                    "body": f"Comment {k} on {iid}",
+                    "createdAt": (created + timedelta(minutes=k + 1)).isoformat().replace("+00:00", "Z"),
+                }
+                for k in range(rnd.randrange(comments_max + 1))
+            ]
+            self.comments[iid] = comments
+            self.issues.append({
+                "id": iid,
+                "title": f"Issue {n}",
+                "description": f"Synthetic issue {n}",
+                "status": rnd.choice(statuses),
+                "issueTypeId": tid,
+                "issueSubtypeId": sid,
+                "startDate": (created + timedelta(days=1)).date().isoformat(),
+                "dueDate": (created + timedelta(days=14)).date().isoformat(),
+                "createdAt": created.isoformat().replace("+00:00", "Z"),
+                "updatedAt": (created + timedelta(minutes=len(comments) + 1)).isoformat().replace("+00:00", "Z"),
+                "commentCount": len(comments),
+                "placements": [{"lineageUrn": docs[0], "viewable": {"guid": f"g-{n}"}}] if docs else [],
+                "linkedDocuments": [{"urn": u, "details": {"viewable": {"id": f"v-{n}"}}} for u in docs[1:]],
+            })
+
+    def folder_json(self, fid: str) -> dict:
+        return {"type": "folders", "id": fid, "attributes": {"name": self.folders[fid]["name"], "displayName": self.folders[fid]["name"]}}
+
+    def folder_path(self, fid: str) -> str:
+        names = []
+        while fid:
+            names.append(self.folders[fid]["name"])
+            fid = self.folders[fid]["parent"]
+        return "/".join(reversed(names))
+
+    def item_json(self, urn: str) -> dict:
+        it = self.items[urn]
+        return {
+            "type": "items",
+            "id": urn,
+            "attributes": {"displayName": it["name"]},
+            "relationships": {"tip": {"data": {"type": "versions", "id": self.version_id(urn)}}},
+        }
+
+    def version_id(self, urn: str) -> str:
+        return f"urn:adsk.wipprod:fs.file:vf.{urn.rsplit(':', 1)[-1]}?version={self.items[urn]['version']}"
+
+    def version_json(self, urn: str, base_url: str) -> dict:
+        it = self.items[urn]
+        return {
+            "type": "versions",
+            "id": self.version_id(urn),
+            "attributes": {
+                "name": it["name"],
+                "displayName": it["name"],
+                "fileType": it["file_type"],
+                "versionNumber": it["version"],
+            },
+            "links": {"webView": {"href": f"{base_url}/docs/files/projects/{self.issues_project_id}?entityId={urllib.parse.quote(urn, safe='')}"}},
+            "relationships": {"item": {"data": {"type": "items", "id": urn}}},
+        }
+
+
+class FakeForge:
+    def __init__(self, dataset: Dataset, *, host="127.0.0.1", port=0, latency_ms=0.0, rate_429=0.0,
+                 rate_5xx=0.0, retry_after=1, page_size=50, commands_limit=50, seed=1):
+        self.dataset = dataset
+        self.latency = latency_ms / 1000.0
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.commands_limit = commands_limit
+        self.rnd = random.Random(seed)
+        self.rnd_lock = threading.Lock()
+        self.counts: Counter = Counter()
+        self.counts_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeForge":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _roll(self) -> float:
+        with self.rnd_lock:
+            return self.rnd.random()
+
+    def _count(self, name: str):
+        with self.counts_lock:
+            self.counts[name] += 1
+
+    def _handler_class(self):
+        forge = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                forge._dispatch(self, "GET")
+
+            def do_POST(self):
+                forge._dispatch(self, "POST")
+
+        return Handler
+
+    def _routes(self):
+        return [
+            ("POST", r"/authentication/v2/token", self._token, False),
+            ("GET", r"/authentication/v2/authorize", self._authorize, False),
+            ("GET", r"/project/v1/hubs/([^/]+)/projects", self._projects, True),
+            ("GET", r"/project/v1/hubs/([^/]+)/projects/([^/]+)/topFolders", self._top_folders, True),
+            ("GET", r"/construction/issues/v1/projects/([^/]+)/issues", self._issues, True),
+            ("GET", r"/construction/issues/v1/projects/([^/]+)/issue-types", self._issue_types, True),
+            ("GET", r"/construction/issues/v1/projects/([^/]+)/issues/([^/]+)/comments", self._comments, True),
+            ("GET", r"/data/v1/projects/([^/]+)/items/([^/]+)/tip", self._item_tip, True),
+            ("GET", r"/data/v1/projects/([^/]+)/items/([^/]+)/parent", self._item_parent, True),
+            ("GET", r"/data/v1/projects/([^/]+)/folders/([^/]+)", self._folder, True),
+            ("GET", r"/data/v1/projects/([^/]+)/folders/([^/]+)/parent", self._folder_parent, True),
+            ("GET", r"/data/v1/projects/([^/]+)/folders/([^/]+)/contents", self._folder_contents, True),
+            ("POST", r"/data/v1/projects/([^/]+)/commands", self._commands, True),
+        ]
+
+    def _dispatch(self, h: BaseHTTPRequestHandler, method: str):
+        split = urllib.parse.urlsplit(h.path)
+        query = dict(urllib.parse.parse_qsl(split.query, keep_blank_values=True))
+        length = int(h.headers.get("Content-Length") or 0)
+        body = h.rfile.read(length) if length else b""
+        for m, pattern, fn, faulty in self._routes():
+            match = re.fullmatch(pattern, split.path)
+            if m != method or not match:
+                continue
+            self._count(f"{method} {pattern}")
+            if self.latency:
+                time.sleep(self.latency)
+            if faulty and self.rate_429 and self._roll() < self.rate_429:
+                return self._send(h, 429, {"developerMessage": "Too many requests"}, {"Retry-After": str(self.retry_after)})
+            if faulty and self.rate_5xx and self._roll() < self.rate_5xx:
+                return self._send(h, 503, {"developerMessage": "Service unavailable"})
+            args = [urllib.parse.unquote(g) for g in match.groups()]
+            return fn(h, query, body, *args)
+        self._send(h, 404, {"developerMessage": f"No route for {method} {split.path}"})
+
+    def _send(self, h, status: int, payload=None, headers=None, etag=False):
+        raw = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        extra = dict(headers or {})
+        if etag and status == 200:
+            tag = '"' + hashlib.sha1(raw).hexdigest()[:16] + '"'
+            extra["ETag"] = tag
+            if h.headers.get("If-None-Match") == tag:
+                status, raw = 304, b""
+        h.send_response(status)
+        if raw:
+            h.send_header("Content-Type", "application/vnd.api+json" if "/data/" in h.path else "application/json")
+        h.send_header("Content-Length", str(len(raw)))
+        for k, v in extra.items():
+            h.send_header(k, v)
+        h.end_headers()
+        h.wfile.write(raw)
+
+    def _host_url(self, h) -> str:
+        return f"http://{h.headers.get('Host') or '%s:%s' % self.server.server_address[:2]}"
+
+    def _token(self, h, query, body):
+        return self._send(h, 200, {"access_token": f"fake-{time.time_ns()}", "refresh_token": f"refresh-{time.time_ns()}", "expires_in": 3600, "token_type": "Bearer"})
+
+    def _authorize(self, h, query, body):
+        target = query.get("redirect_uri", "/") + "?" + urllib.parse.urlencode({"code": "fake-code"})
+        h.send_response(302)
+        h.send_header("Location", target)
+        h.send_header("Content-Length", "0")
+        h.end_headers()
+
+    def _projects(self, h, query, body, hub_id):
+        ds = self.dataset
+        if hub_id != ds.hub_id:
+            return self._send(h, 404, {"developerMessage": "hub not found"})
+        return self._send(h, 200, {"data": [
+            {"type": "projects", "id": "b.other-project", "attributes": {"name": "Some Other Project"}},
+            {"type": "projects", "id": ds.project_id, "attributes": {"name": ds.project_name}},
+        ]})
+
+    def _top_folders(self, h, query, body, hub_id, project_id):
+        return self._send(h, 200, {"data": [self.dataset.folder_json(ROOT_FOLDER)]})
+
+    def _check_issues_project(self, h, project_id) -> bool:
+        if project_id not in (self.dataset.issues_project_id, self.dataset.project_id):
+            self._send(h, 404, {"detail": "project not found"})
+            return False
+        return True
+
+    def _page(self, rows: list, query: dict) -> dict:
+        limit = int(query.get("limit", 100))
+        offset = int(query.get("offset", 0))
+        return {"pagination": {"limit": limit, "offset": offset, "totalResults": len(rows)}, "results": rows[offset:offset + limit]}
+
+    def _issues(self, h, query, body, project_id):
+        if not self._check_issues_project(h, project_id):
+            return
+        deleted = query.get("filter[deleted]") == "true"
+        rows = [i for i in self.dataset.issues if bool(i.get("deletedAt")) == deleted]
+        for key, field in (("filter[status]", "status"), ("filter[issueTypeId]", "issueTypeId")):
+            if query.get(key):
+                wanted = set(query[key].split(","))
+                rows = [i for i in rows if i.get(field) in wanted]
+        for key, field in (("filter[updatedAt]", "updatedAt"), ("filter[dueDate]", "dueDate"), ("filter[startDate]", "startDate")):
+            if query.get(key):
+                start, _, end = query[key].partition("..")
+                rows = [
+                    i for i in rows
+                    if i.get(field) and (not start or i[field][:len(start)] >= start) and (not end or i[field][:len(end)] <= end)
+                ]
+        page = self._page(rows, query)
+        if query.get("fields"):
+            keep = set(query["fields"].split(",")) | {"id"}
+            page["results"] = [{k: v for k, v in i.items() if k in keep} for i in page["results"]]
+        return self._send(h, 200, page)
+
+    def _issue_types(self, h, query, body, project_id):
+        if self._check_issues_project(h, project_id):
+            return self._send(h, 200, {"results": self.dataset.issue_types})
+
+    def _comments(self, h, query, body, project_id, issue_id):
+        if not self._check_issues_project(h, project_id):
+            return
+        if issue_id not in self.dataset.comments:
+            return self._send(h, 404, {"detail": "issue not found"})
+        return self._send(h, 200, self._page(self.dataset.comments[issue_id], query))
+
+    def _item_tip(self, h, query, body, project_id, urn):
+        if urn not in self.dataset.items:
+            return self._send(h, 404, {"errors": [{"detail": "item not found"}]})
+        return self._send(h, 200, {"data": self.dataset.version_json(urn, self._host_url(h))}, etag=True)
+
+    def _item_parent(self, h, query, body, project_id, urn):
+        if urn not in self.dataset.items:
+            return self._send(h, 404, {"errors": [{"detail": "item not found"}]})
+        return self._send(h, 200, {"data": self.dataset.folder_json(self.dataset.items[urn]["folder"])}, etag=True)
+
+    def _folder(self, h, query, body, project_id, fid):
+        if fid not in self.dataset.folders:
+            return self._send(h, 404, {"errors": [{"detail": "folder not found"}]})
+        return self._send(h, 200, {"data": self.dataset.folder_json(fid)}, etag=True)
+
+    def _folder_parent(self, h, query, body, project_id, fid):
+        parent = (self.dataset.folders.get(fid) or {}).get("parent")
+        if not parent:
+            return self._send(h, 404, {"errors": [{"detail": "no parent"}]})
+        return self._send(h, 200, {"data": self.dataset.folder_json(parent)}, etag=True)
+
+    def _folder_contents(self, h, query, body, project_id, fid):
+        ds = self.dataset
+        if fid not in ds.folders:
+            return self._send(h, 404, {"errors": [{"detail": "folder not found"}]})
+        children = ds.children[fid]
+        page = int(query.get("page[number]", 0))
+        limit = int(query.get("page[limit]", self.page_size))
+        chunk = children[page * limit:(page + 1) * limit]
+        base = self._host_url(h)
+        data = [ds.folder_json(cid) if kind == "folders" else ds.item_json(cid) for kind, cid in chunk]
+        included = [ds.version_json(cid, base) for kind, cid in chunk if kind == "items"]
+        links = {"self": {"href": f"{base}{h.path}"}}
+        if (page + 1) * limit < len(children):
+            q = urllib.parse.urlencode({"page[number]": page + 1, "page[limit]": limit})
+            links["next"] = {"href": f"{base}/data/v1/projects/{project_id}/folders/{urllib.parse.quote(fid, safe='')}/contents?{q}"}
+        return self._send(h, 200, {"data": data, "included": included, "links": links})
+
+    def _commands(self, h, query, body, project_id):
+        ds = self.dataset
+        try:
+            data = json.loads(body or b"{}").get("data") or {}
+        except ValueError:
+            return self._send(h, 400, {"errors": [{"detail": "invalid JSON"}]})
+        ext = (data.get("attributes") or {}).get("extension") or {}
+        if ext.get("type") != "commands:autodesk.core:ListItems":
+            return self._send(h, 400, {"errors": [{"detail": "unsupported command"}]})
+        with_path = bool((ext.get("data") or {}).get("includePathInProject"))
+        requested = [r.get("id") for r in ((data.get("relationships") or {}).get("resources") or {}).get("data") or []]
+        if len(requested) > self.commands_limit:
+            return self._send(h, 400, {"errors": [{"detail": f"at most {self.commands_limit} resources per command"}]})
+        base = self._host_url(h)
+        found = [u for u in requested if u in ds.items]
+        included = []
+        for urn in found:
+            item = ds.item_json(urn)
+            if with_path:
+                item["attributes"]["pathInProject"] = "/" + ds.folder_path(ds.items[urn]["folder"])
+            included.append(item)
+        included += [ds.version_json(urn, base) for urn in found]
+        return self._send(h, 200, {
+            "data": {
+                "type": "commands",
+                "id": f"cmd-{time.time_ns()}",
+                "attributes": {"status": "success", "extension": ext},
+                "relationships": {"resources": {"data": [{"type": "items", "id": u} for u in found]}},
+            },
+            "included": included,
+        })
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--issues", type=int, default=2000)
+    ap.add_argument("--documents", type=int, default=500)
+    ap.add_argument("--depth", type=int, default=6)
+    ap.add_argument("--fanout", type=int, default=2)
+    ap.add_argument("--pdf-ratio", type=float, default=0.7)
+    ap.add_argument("--comments-max", type=int, default=3)
+    ap.add_argument("--latency-ms", type=float, default=20.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--rate-5xx", type=float, default=0.0)
+    ap.add_argument("--retry-after", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    ds = Dataset(issues=args.issues, documents=args.documents, depth=args.depth, fanout=args.fanout,
+                 pdf_ratio=args.pdf_ratio, comments_max=args.comments_max, seed=args.seed)
+    forge = FakeForge(ds, host=args.host, port=args.port, latency_ms=args.latency_ms, rate_429=args.rate_429,
+                      rate_5xx=args.rate_5xx, retry_after=args.retry_after, seed=args.seed)
+    print(f"FORGE_BASE_URL={forge.base_url}")
+    print(f"ACC_ACCOUNT_ID={ds.account_id}")
+    print(f"TARGET_PROJECT_NAME={ds.project_name}")
+    print(f"folders={len(ds.folders)} documents={len(ds.items)} issues={len(ds.issues)}")
+    try:
+        forge.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        forge.server.server_close()
+        for name, n in forge.counts.most_common():
+            print(f"{n:>8} {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -68,6 +68,16 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = "static/"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "forge_http": {
+        "BACKEND": env("FORGE_HTTP_CACHE_BACKEND", default="django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": env("FORGE_HTTP_CACHE_LOCATION", default=str(BASE_DIR / "cache" / "forge_http")),
+    },
+}
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 FORGE_CLIENT_ID = env("FORGE_CLIENT_ID")
@@ -82,6 +92,46 @@ FORGE_BASE_URL = env("FORGE_BASE_URL", default="https://developer.api.autodesk.c
 ACC_ACCOUNT_ID = env("ACC_ACCOUNT_ID", default="")
 REPORT_OUTPUT_DIR = env("REPORT_OUTPUT_DIR", default=str(BASE_DIR / "reports"))
 TARGET_PROJECT_NAME = env("TARGET_PROJECT_NAME", default="DEV TASK 1 Project")
+FORGE_HTTP_POOL_CONNECTIONS = env.int("FORGE_HTTP_POOL_CONNECTIONS", default=10)
+FORGE_HTTP_POOL_MAXSIZE = env.int("FORGE_HTTP_POOL_MAXSIZE", default=20)
+FORGE_HTTP_POOL_BLOCK = env.bool("FORGE_HTTP_POOL_BLOCK", default=False)
+FORGE_HTTP_KEEP_ALIVE = env.bool("FORGE_HTTP_KEEP_ALIVE", default=True)
+FORGE_TOKEN_REFRESH_LEEWAY = env.int("FORGE_TOKEN_REFRESH_LEEWAY", default=60)
+FORGE_TOKEN_PROACTIVE_REFRESH = env.int("FORGE_TOKEN_PROACTIVE_REFRESH", default=300)
+FORGE_TOKEN_REFRESH_LEASE_TTL = env.float("FORGE_TOKEN_REFRESH_LEASE_TTL", default=30.0)
+FORGE_TOKEN_REFRESH_WAIT = env.float("FORGE_TOKEN_REFRESH_WAIT", default=15.0)
+FORGE_CIRCUIT_ENABLED = env.bool("FORGE_CIRCUIT_ENABLED", default=True)
+FORGE_CIRCUIT_FAILURE_THRESHOLD = env.int("FORGE_CIRCUIT_FAILURE_THRESHOLD", default=5)
+FORGE_CIRCUIT_RESET_TIMEOUT = env.float("FORGE_CIRCUIT_RESET_TIMEOUT", default=30.0)
+REPORT_RUN_DEADLINE = env.float("REPORT_RUN_DEADLINE", default=3600.0)
+FORGE_HTTP_CACHE_ENABLED = env.bool("FORGE_HTTP_CACHE_ENABLED", default=False)
+FORGE_HTTP_CACHE_ALIAS = "forge_http"
+FORGE_HTTP_CACHE_RETENTION = env.int("FORGE_HTTP_CACHE_RETENTION", default=7 * 86400)
+FORGE_ASYNC_CONCURRENCY = env.int("FORGE_ASYNC_CONCURRENCY", default=16)
+FORGE_COMMENTS_CONCURRENCY = env.int("FORGE_COMMENTS_CONCURRENCY", default=8)
+FORGE_COMMENT_CACHE_ENABLED = env.bool("FORGE_COMMENT_CACHE_ENABLED", default=True)
+FORGE_DOC_FAILURE_TTL = env.int("FORGE_DOC_FAILURE_TTL", default=900)
+REPORT_DOC_RESOLVER = env.str("REPORT_DOC_RESOLVER", default="lookup")
+REPORT_ISSUE_SOURCE = env.str("REPORT_ISSUE_SOURCE", default="api")
+REPORT_ISSUE_BATCH_SIZE = env.int("REPORT_ISSUE_BATCH_SIZE", default=500)
+REPORT_CSV_GZIP = env.bool("REPORT_CSV_GZIP", default=True)
+REPORT_JOB_WORKERS = env.int("REPORT_JOB_WORKERS", default=2)
+REPORT_JOB_LEASE_TTL = env.float("REPORT_JOB_LEASE_TTL", default=120.0)
+REPORT_JOB_POLL_INTERVAL = env.float("REPORT_JOB_POLL_INTERVAL", default=0.5)
+REPORT_MAX_AGE = env.float("REPORT_MAX_AGE", default=300.0)
+FORGE_DM_BATCH_SIZE = env.int("FORGE_DM_BATCH_SIZE", default=50)
+FORGE_ISSUES_PAGE_CONCURRENCY = env.int("FORGE_ISSUES_PAGE_CONCURRENCY", default=4)
+FORGE_ISSUES_PAGE_RETRIES = env.int("FORGE_ISSUES_PAGE_RETRIES", default=2)
+FORGE_ISSUES_FIELDS = env.list("FORGE_ISSUES_FIELDS", default=None)
+FORGE_RATE_LIMIT_ENABLED = env.bool("FORGE_RATE_LIMIT_ENABLED", default=True)
+FORGE_RATE_LIMIT_MIN_RATE = env.float("FORGE_RATE_LIMIT_MIN_RATE", default=0.5)
+FORGE_RATE_LIMIT_DECREASE_WINDOW = env.float("FORGE_RATE_LIMIT_DECREASE_WINDOW", default=1.0)
+FORGE_RATE_LIMITS = {
+    "data/v1": env.float("FORGE_RATE_LIMIT_DATA", default=20.0),
+    "issues/v1": env.float("FORGE_RATE_LIMIT_ISSUES", default=10.0),
+    "project/v1": env.float("FORGE_RATE_LIMIT_PROJECT", default=5.0),
+    "other": env.float("FORGE_RATE_LIMIT_OTHER", default=10.0),
+}
 
 LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
@@ -13,6 +13,7 @@ class Document:
     path: str
     web_link: str = ""
     is_pdf: bool = False
+    version: Optional[int] = None
 
 @dataclass(frozen=True)
 class IssueRow:
@@ -1,36 +1,76 @@
 import os
 import time
+import shutil
 import logging
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from core.services.acc_client import ACCClient
-from core.services.aggregate import IssueAggregator
-from core.services.csv_export import rows_to_csv
+from core.services.issue_query import IssueQuery
+from core.services.report_jobs import DONE, get_report_jobs, report_params
 from core.services.auth import AuthExpired
-from core.models import Lock
+from core.services.rate_limit import get_limiter
+from core.services.http_cache import get_response_cache
+from core.services.comment_cache import get_comment_cache
+from core.services.metrics import http_metrics
 import requests
 
 class Command(BaseCommand):
     help = "Generate ACC Issues CSV for PDFs in target project"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--resolver",
+            choices=["lookup", "crawl"],
+            default=None,
+            help="Document resolution: per-item lookups, or one crawl of the project folder tree",
+        )
+        parser.add_argument(
+            "--source",
+            choices=["api", "store"],
+            default=None,
+            help="Issue source: list everything from the API, or sync changes into the local issue store",
+        )
+        parser.add_argument(
+            "--full-sync",
+            action="store_true",
+            help="With --source store, ignore the sync watermark and reconcile every issue",
+        )
+        parser.add_argument("--status", action="append", help="Only issues with this status (repeatable or comma-separated)")
+        parser.add_argument("--issue-type", action="append", help="Only issues of this type, by id or name (repeatable)")
+        parser.add_argument("--due-from", help="Only issues due on or after this date (YYYY-MM-DD)")
+        parser.add_argument("--due-to", help="Only issues due on or before this date (YYYY-MM-DD)")
+        parser.add_argument("--start-from", help="Only issues starting on or after this date (YYYY-MM-DD)")
+        parser.add_argument("--start-to", help="Only issues starting on or before this date (YYYY-MM-DD)")
+        parser.add_argument("--updated-from", help="Only issues updated at or after this ISO timestamp")
+        parser.add_argument("--updated-to", help="Only issues updated at or before this ISO timestamp")
+
     def handle(self, *args, **options):
         logger = logging.getLogger("app")
         logger.info("event=report.cli_start project=%s", settings.TARGET_PROJECT_NAME)
-        lock_name = "report_issues"
         try:
-            if Lock.objects.filter(name=lock_name).exists():
-                raise CommandError("Another report_issues run is already in progress")
-            Lock.objects.create(name=lock_name)
-            client = ACCClient()
-            rows = IssueAggregator(client).collect_rows()
+            query = IssueQuery.from_mapping(options)
+        except ValueError as e:
+            raise CommandError(str(e))
+        params = report_params(
+            query,
+            resolver=options.get("resolver"),
+            source=options.get("source"),
+            full_sync=options.get("full_sync", False),
+        )
+        try:
+            wait = float(getattr(settings, "REPORT_RUN_DEADLINE", 0) or 0) or None
+            job = get_report_jobs().run_or_join(params, timeout=wait)
+            if job.status != DONE:
+                raise CommandError(f"Report build failed: {job.error}")
             os.makedirs(settings.REPORT_OUTPUT_DIR, exist_ok=True)
             ts = time.strftime("%Y%m%d_%H%M%S")
             path = os.path.join(settings.REPORT_OUTPUT_DIR, f"acc_issues_{ts}.csv")
-            content = rows_to_csv(rows)
-            with open(path, "wb") as f:
-                f.write(content)
-            logger.info("event=report.cli_written path=%s rows=%s bytes=%s", path, len(rows), len(content))
-            self.stdout.write(self.style.SUCCESS(f"Wrote {path} ({len(rows)} rows)"))
+            self._publish(job.path, path)
+            logger.info("event=report.cli_written path=%s rows=%s job=%s", path, job.rows_built, job.id)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path} ({job.rows_built} rows)"))
+            self._report_rate_limits(logger)
+            self._report_http_cache(logger)
+            self._report_comment_cache(logger)
+            self._report_http_metrics(logger)
         except AuthExpired:
             logger.error("event=report.cli_error type=auth_expired")
             raise CommandError(
@@ -52,8 +92,61 @@ class Command(BaseCommand):
         except requests.RequestException as e:
             logger.error("event=report.cli_error type=network error=%s", type(e).__name__)
             raise CommandError(f"Network error calling Autodesk APIs: {e}")
-        finally:
+        except TimeoutError as e:
+            logger.error("event=report.cli_error type=timeout error=%s", e)
+            raise CommandError(str(e))
+
+    def _publish(self, src, path):
+        tmp = f"{path}.part"
+        try:
+            try:
+                os.link(src, tmp)
+            except OSError:
+                shutil.copyfile(src, tmp)
+            os.replace(tmp, path)
+        except BaseException:
             try:
-                Lock.objects.filter(name=lock_name).delete()
-            except Exception:
+                os.unlink(tmp)
+            except OSError:
                 pass
+            raise
+
+    def _report_rate_limits(self, logger):
+        for family, st in get_limiter().stats().items():
+            if not st["acquired"]:
+                continue
+            logger.info(
+                "event=ratelimit.stats family=%s rate=%s max_rate=%s acquired=%s throttled=%s waited_seconds=%s",
+                family, st["rate"], st["max_rate"], st["acquired"], st["throttled"], st["waited_seconds"],
+            )
+            self.stdout.write(
+                f"rate limit {family}: {st['acquired']} calls, {st['throttled']} throttled, "
+                f"{st['waited_seconds']}s waited, rate {st['rate']}/{st['max_rate']} per second"
+            )
+
+    def _report_http_cache(self, logger):
+        cache = get_response_cache()
+        if not cache.enabled:
+            return
+        st = cache.stats()
+        logger.info(
+            "event=http_cache.stats hits=%s revalidated=%s misses=%s stores=%s hit_ratio=%s",
+            st["hits"], st["revalidated"], st["misses"], st["stores"], st["hit_ratio"],
+        )
+        self.stdout.write(
+            f"http cache: {st['hits']} hits, {st['revalidated']} revalidated, "
+            f"{st['misses']} misses (hit ratio {st['hit_ratio']})"
+        )
+
+    def _report_comment_cache(self, logger):
+        cache = get_comment_cache()
+        if not cache.enabled:
+            return
+        st = cache.stats()
+        logger.info("event=comment_cache.stats hits=%s misses=%s hit_ratio=%s", st["hits"], st["misses"], st["hit_ratio"])
+        self.stdout.write(f"comment cache: {st['hits']} hits, {st['misses']} misses (hit ratio {st['hit_ratio']})")
+
+    def _report_http_metrics(self, logger):
+        for line in http_metrics.summary_lines():
+            logger.info("event=http.summary %s", line)
+            self.stdout.write(line)
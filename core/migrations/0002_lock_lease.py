@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lock',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lock',
+            name='owner',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_lock_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentLookupFailure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100)),
+                ('urn', models.CharField(max_length=255)),
+                ('failed_at', models.DateTimeField(auto_now=True)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DocumentRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100)),
+                ('urn', models.CharField(max_length=255)),
+                ('name', models.CharField(max_length=512)),
+                ('path', models.TextField(blank=True, default='')),
+                ('web_link', models.TextField(blank=True, default='')),
+                ('is_pdf', models.BooleanField(default=False)),
+                ('version_number', models.IntegerField(null=True)),
+                ('resolved_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='documentlookupfailure',
+            constraint=models.UniqueConstraint(fields=('project_id', 'urn'), name='uniq_document_lookup_failure'),
+        ),
+        migrations.AddConstraint(
+            model_name='documentrecord',
+            constraint=models.UniqueConstraint(fields=('project_id', 'urn'), name='uniq_document_record'),
+        ),
+    ]
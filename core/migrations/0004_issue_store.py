@@ -0,0 +1,65 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_document_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100, unique=True)),
+                ('watermark', models.CharField(blank=True, default='', max_length=40)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StoredIssue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100)),
+                ('issue_id', models.CharField(max_length=100)),
+                ('updated_at', models.CharField(blank=True, default='', max_length=40)),
+                ('data', models.JSONField()),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StoredIssueType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100)),
+                ('type_id', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=255)),
+                ('parent_type_id', models.CharField(blank=True, default='', max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StoredComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100)),
+                ('issue_id', models.CharField(max_length=100)),
+                ('comment_id', models.CharField(max_length=100)),
+                ('created_at', models.CharField(blank=True, default='', max_length=40)),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project_id', 'issue_id'], name='stored_comment_issue')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='storedissue',
+            constraint=models.UniqueConstraint(fields=('project_id', 'issue_id'), name='uniq_stored_issue'),
+        ),
+        migrations.AddConstraint(
+            model_name='storedissuetype',
+            constraint=models.UniqueConstraint(fields=('project_id', 'type_id'), name='uniq_stored_issue_type'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_issue_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentThread',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=100)),
+                ('issue_id', models.CharField(max_length=100)),
+                ('updated_at', models.CharField(max_length=40)),
+                ('comment_count', models.IntegerField(null=True)),
+                ('comments', models.JSONField()),
+                ('stored_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='commentthread',
+            constraint=models.UniqueConstraint(fields=('project_id', 'issue_id'), name='uniq_comment_thread'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:25
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_comment_thread_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(default='queued', max_length=16)),
+                ('params', models.JSONField(default=dict)),
+                ('issues_fetched', models.IntegerField(default=0)),
+                ('documents_resolved', models.IntegerField(default=0)),
+                ('rows_built', models.IntegerField(default=0)),
+                ('path', models.TextField(blank=True, default='')),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='report_job_queue')],
+            },
+        ),
+    ]
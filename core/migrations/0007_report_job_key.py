@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_report_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='reportjob',
+            index=models.Index(fields=['key', 'status'], name='report_job_key'),
+        ),
+    ]
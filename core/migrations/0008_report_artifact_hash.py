@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_report_job_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='sha256',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import uuid
 from django.db import models
 class OAuthToken(models.Model):
     access_token = models.TextField()
@@ -8,3 +9,78 @@ class OAuthToken(models.Model):
 class Lock(models.Model):
     name = models.CharField(max_length=100, unique=True)
     acquired_at = models.DateTimeField(auto_now_add=True)
+    owner = models.CharField(max_length=64, blank=True, default="")
+    expires_at = models.DateTimeField(null=True, blank=True)
+class DocumentRecord(models.Model):
+    project_id = models.CharField(max_length=100)
+    urn = models.CharField(max_length=255)
+    name = models.CharField(max_length=512)
+    path = models.TextField(blank=True, default="")
+    web_link = models.TextField(blank=True, default="")
+    is_pdf = models.BooleanField(default=False)
+    version_number = models.IntegerField(null=True)
+    resolved_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["project_id", "urn"], name="uniq_document_record")]
+class DocumentLookupFailure(models.Model):
+    project_id = models.CharField(max_length=100)
+    urn = models.CharField(max_length=255)
+    failed_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["project_id", "urn"], name="uniq_document_lookup_failure")]
+class StoredIssue(models.Model):
+    project_id = models.CharField(max_length=100)
+    issue_id = models.CharField(max_length=100)
+    updated_at = models.CharField(max_length=40, blank=True, default="")
+    data = models.JSONField()
+    synced_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["project_id", "issue_id"], name="uniq_stored_issue")]
+class StoredComment(models.Model):
+    project_id = models.CharField(max_length=100)
+    issue_id = models.CharField(max_length=100)
+    comment_id = models.CharField(max_length=100)
+    created_at = models.CharField(max_length=40, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    class Meta:
+        indexes = [models.Index(fields=["project_id", "issue_id"], name="stored_comment_issue")]
+class StoredIssueType(models.Model):
+    project_id = models.CharField(max_length=100)
+    type_id = models.CharField(max_length=100)
+    name = models.CharField(max_length=255)
+    parent_type_id = models.CharField(max_length=100, blank=True, default="")
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["project_id", "type_id"], name="uniq_stored_issue_type")]
+class IssueSyncState(models.Model):
+    project_id = models.CharField(max_length=100, unique=True)
+    watermark = models.CharField(max_length=40, blank=True, default="")
+    synced_at = models.DateTimeField(auto_now=True)
+class CommentThread(models.Model):
+    project_id = models.CharField(max_length=100)
+    issue_id = models.CharField(max_length=100)
+    updated_at = models.CharField(max_length=40)
+    comment_count = models.IntegerField(null=True)
+    comments = models.JSONField()
+    stored_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["project_id", "issue_id"], name="uniq_comment_thread")]
+class ReportJob(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, default="queued")
+    key = models.CharField(max_length=64, blank=True, default="")
+    params = models.JSONField(default=dict)
+    issues_fetched = models.IntegerField(default=0)
+    documents_resolved = models.IntegerField(default=0)
+    rows_built = models.IntegerField(default=0)
+    path = models.TextField(blank=True, default="")
+    sha256 = models.CharField(max_length=64, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="report_job_queue"),
+            models.Index(fields=["key", "status"], name="report_job_key"),
+        ]
@@ -1,13 +1,21 @@
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Iterable, Iterator
+from django.conf import settings
 from .auth import AuthSession
 from .projects import ProjectsService
 from .dm import DataManagementService
 from .issues import IssuesService
+from .issue_query import IssueQuery
+from .aio import AsyncACCClient, run_sync
+from .resilience import Deadline
+from .doc_store import DocumentStore
+from .comment_cache import get_comment_cache
+from .dm_helpers import folder_display_name
+from .report_client import ReportClient
 from core.dto import Document
 
-class ACCClient:
-    def __init__(self):
-        self.auth = AuthSession()
+class ACCClient(ReportClient):
+    def __init__(self, deadline: Optional[Deadline] = None):
+        self.auth = AuthSession(deadline=deadline)
         self.projects = ProjectsService(self.auth)
         self.dm = DataManagementService(self.auth, self.projects)
         self.issues = IssuesService(self.auth)
@@ -18,8 +26,11 @@ class ACCClient:
     def signed_s3_url(self, bucket_key: str, object_key: str) -> str:
         return self.dm.signed_s3_url(bucket_key, object_key)
     
-    def list_issues(self, issues_project_id: str) -> List[dict]:
-        return self.issues.list_issues(issues_project_id)
+    def list_issues(self, issues_project_id: str, query: Optional[IssueQuery] = None) -> List[dict]:
+        return self.issues.list_issues(issues_project_id, query=query)
+
+    def iter_issues(self, issues_project_id: str, query: Optional[IssueQuery] = None) -> Iterator[dict]:
+        return self.issues.iter_issues(issues_project_id, query=query)
 
     def item_tip(self, dm_project_id: str, item_urn: str) -> dict:
         return self.dm.item_tip(dm_project_id, item_urn)
@@ -38,3 +49,41 @@ class ACCClient:
 
     def get_item_info(self, dm_project_id: str, item_urn: str) -> Document:
         return self.dm.get_item_info(dm_project_id, item_urn)
+
+    def aio(self, concurrency: Optional[int] = None) -> AsyncACCClient:
+        return AsyncACCClient(self, concurrency)
+
+    def get_item_infos(self, dm_project_id: str, urns: Iterable[str]) -> dict[str, Optional[Document]]:
+        urns = list(urns)
+        store = DocumentStore(dm_project_id)
+        known, failed = store.load(urns)
+
+        async def run():
+            async with self.aio() as a:
+                return await a.get_item_infos(dm_project_id, urns, known=known, failed=failed)
+        docs = run_sync(run())
+        store.save(docs, skip_failures=failed)
+        return docs
+
+    def crawl_documents(self, dm_project_id: str) -> dict[str, Document]:
+        roots = [(f.get("id"), folder_display_name(f)) for f in self.projects.get_top_folders(dm_project_id)]
+
+        async def run():
+            async with self.aio() as a:
+                return await a.dm.crawl_documents(dm_project_id, roots)
+        return run_sync(run())
+
+    def fetch_comments_many(self, issues_project_id: str, issue_ids: Iterable[str]) -> dict[str, Optional[List[dict]]]:
+        concurrency = int(getattr(settings, "FORGE_COMMENTS_CONCURRENCY", 8))
+
+        async def run():
+            async with self.aio(concurrency) as a:
+                return await a.fetch_comments_many(issues_project_id, issue_ids)
+        return run_sync(run())
+
+    def get_comment_threads(self, issues_project_id: str, issues: List[dict]) -> dict[str, List[dict]]:
+        cache = get_comment_cache()
+        cached, missing = cache.lookup(issues_project_id, issues)
+        fetched = self.fetch_comments_many(issues_project_id, [iss["id"] for iss in missing]) if missing else {}
+        cache.store(issues_project_id, missing, {i: t for i, t in fetched.items() if t is not None})
+        return {**cached, **{i: t or [] for i, t in fetched.items()}}
@@ -1,6 +1,11 @@
 import logging
+from itertools import islice
+from typing import Callable, Iterator
 from django.conf import settings
 from core.dto import Document, IssueRow
+from .issue_store import IssueStore
+from .issue_query import IssueQuery
+from .report_client import ReportClient
 from .utils import norm_date, extract_viewable_guid, with_viewable_param, clean_comment_text
 
 class ProjectService:
@@ -20,69 +25,131 @@ class ProjectService:
         return names
 
 class IssueAggregator:
-    def __init__(self, client):
+    def __init__(
+        self,
+        client: ReportClient,
+        resolver: str | None = None,
+        source: str | None = None,
+        full_sync: bool = False,
+        query: IssueQuery | None = None,
+        progress: Callable[[dict], None] | None = None,
+    ):
         self.client = client
+        self.query = query or IssueQuery()
+        self.resolver = resolver or getattr(settings, "REPORT_DOC_RESOLVER", "lookup")
+        self.source = source or getattr(settings, "REPORT_ISSUE_SOURCE", "api")
+        self.full_sync = full_sync
+        self.progress = progress
+        self.batch_size = max(1, int(getattr(settings, "REPORT_ISSUE_BATCH_SIZE", 500)))
         self.logger = logging.getLogger("app")
 
     def _issues_project_id(self, dm_project_id: str) -> str:
         return dm_project_id[2:] if dm_project_id.startswith("b.") else dm_project_id
 
-    def collect_rows(self) -> list[IssueRow]:
+    def _issue_urns(self, iss: dict) -> set[str]:
+        urns = set()
+        for p in iss.get("placements", []) or []:
+            u = p.get("lineageUrn")
+            if u:
+                urns.add(u)
+        for d in iss.get("linkedDocuments", []) or []:
+            u = d.get("urn")
+            if u:
+                urns.add(u)
+        return urns
+
+    def _resolve_documents(self, dm_project_id: str, urns: set[str], info_cache: dict[str, Document | None]):
+        all_urns = sorted(u for u in urns if u not in info_cache)
+        if self.resolver == "crawl" and all_urns:
+            if self._crawl_index is None:
+                self._crawl_index = self.client.crawl_documents(dm_project_id)
+            matched = {u: self._crawl_index[u] for u in all_urns if u in self._crawl_index}
+            info_cache.update(matched)
+            self.logger.info("event=aggregate.documents_crawled indexed=%s matched=%s", len(self._crawl_index), len(matched))
+        pending = [u for u in all_urns if u not in info_cache]
+        if pending:
+            info_cache.update(self.client.get_item_infos(dm_project_id, pending))
+            self.logger.info("event=aggregate.documents_prefetched count=%s", len(pending))
+
+    def _load_comments(self, issues_project_id: str, issues: list[dict]) -> dict[str, list[dict]]:
+        wanted = [iss for iss in issues if iss.get("id") and iss.get("commentCount") != 0]
+        ids = [iss["id"] for iss in wanted]
+        comments_map = self.client.get_comment_threads(issues_project_id, wanted) if ids else {}
+        self.logger.info("event=aggregate.comments_loaded fetched=%s skipped=%s", len(ids), len(issues) - len(ids))
+        return comments_map
+
+    def _issue_batches(self, issues_project_id: str, type_map: dict) -> Iterator[list[dict]]:
+        if self.source == "store":
+            query = self.query.with_type_ids(type_map)
+            issues = (iss for iss in self._store.iter_issues(self.batch_size) if query.matches(iss))
+        else:
+            issues = self.client.iter_issues(issues_project_id, query=self.query.with_type_ids(type_map))
+        while batch := list(islice(issues, self.batch_size)):
+            yield batch
+
+    def _build_rows(self, iss: dict, docs: list[tuple[str, Document]], comments: list[dict], ctx: dict) -> Iterator[IssueRow]:
+        if comments:
+            comments_sorted = sorted(comments, key=lambda c: c.get("createdAt") or "")
+            bodies = [clean_comment_text(c.get("body")) for c in comments_sorted]
+            bodies = [b for b in bodies if b]
+            all_comments = ", ".join(bodies)
+        else:
+            all_comments = ""
+        guid = extract_viewable_guid(iss)
+        for u, info in docs:
+            deep_link = with_viewable_param(info.web_link, guid)
+            yield IssueRow(
+                project_id=ctx["dm_project_id"],
+                project_name=settings.TARGET_PROJECT_NAME,
+                document_id=u,
+                document_name=info.name,
+                document_path=info.path,
+                web_link=deep_link,
+                issue_id=iss.get("id", ""),
+                issue_type=ctx["type_map"].get(iss.get("issueTypeId", ""), ""),
+                issue_sub_type=ctx["subtype_map"].get(iss.get("issueSubtypeId", ""), ""),
+                issue_status=iss.get("status", ""),
+                issue_due_date=norm_date(iss.get("dueDate")),
+                issue_start_date=norm_date(iss.get("startDate")),
+                issue_title=(iss.get("title") or "") or "",
+                issue_description=(iss.get("description") or "").strip(),
+                issue_comments=all_comments,
+            )
+
+    def iter_rows(self) -> Iterator[IssueRow]:
         self.logger.info("event=aggregate.start project=%s", settings.TARGET_PROJECT_NAME)
         dm_project_id = self.client.get_project_id_by_name(settings.TARGET_PROJECT_NAME)
         issues_project_id = self._issues_project_id(dm_project_id)
-        type_map, subtype_map = self.client.issues.issue_types_map(issues_project_id)
-        issues = self.client.list_issues(issues_project_id)
-        self.logger.info("event=aggregate.issues_fetched count=%s", len(issues))
+        self._crawl_index = None
+        if self.source == "store":
+            self._store = IssueStore(issues_project_id)
+            self._store.sync(self.client, full=self.full_sync)
+            type_map, subtype_map = self._store.type_maps()
+        else:
+            type_map, subtype_map = self.client.issues.issue_types_map(issues_project_id)
+        ctx = {"dm_project_id": dm_project_id, "type_map": type_map, "subtype_map": subtype_map}
         info_cache: dict[str, Document | None] = {}
-        rows: list[IssueRow] = []
-        for iss in issues:
-            urns = set()
-            for p in iss.get("placements", []) or []:
-                u = p.get("lineageUrn")
-                if u:
-                    urns.add(u)
-            for d in iss.get("linkedDocuments", []) or []:
-                u = d.get("urn")
-                if u:
-                    urns.add(u)
-            comments = self.client.issues.get_comments(issues_project_id, iss.get("id"))
-            if comments:
-                comments_sorted = sorted(comments, key=lambda c: c.get("createdAt") or "")
-                bodies = [clean_comment_text(c.get("body")) for c in comments_sorted]
-                bodies = [b for b in bodies if b]
-                all_comments = ", ".join(bodies)
+        n_issues = n_rows = 0
+        for batch in self._issue_batches(issues_project_id, type_map):
+            n_issues += len(batch)
+            issue_urns = [(iss, self._issue_urns(iss)) for iss in batch]
+            self._resolve_documents(dm_project_id, set().union(*(urns for _, urns in issue_urns)), info_cache)
+            producing = []
+            for iss, urns in issue_urns:
+                docs = [(u, info_cache[u]) for u in sorted(urns) if info_cache.get(u) and info_cache[u].is_pdf]
+                if docs:
+                    producing.append((iss, docs))
+            if self.source == "store":
+                comments_map = self._store.comments_map([iss.get("id") for iss, _ in producing if iss.get("id")])
             else:
-                all_comments = ""
-            guid = extract_viewable_guid(iss)
-            for u in sorted(urns):
-                if u not in info_cache:
-                    try:
-                        info_cache[u] = self.client.get_item_info(dm_project_id, u)
-                    except Exception:
-                        info_cache[u] = None
-                info = info_cache[u]
-                if not info or not info.is_pdf:
-                    continue
-                deep_link = with_viewable_param(info.web_link, guid)
-                rows.append(
-                    IssueRow(
-                        project_id=dm_project_id,
-                        project_name=settings.TARGET_PROJECT_NAME,
-                        document_id=u,
-                        document_name=info.name,
-                        document_path=info.path,
-                        web_link=deep_link,
-                        issue_id=iss.get("id", ""),
-                        issue_type=type_map.get(iss.get("issueTypeId", ""), ""),
-                        issue_sub_type=subtype_map.get(iss.get("issueSubtypeId", ""), ""),
-                        issue_status=iss.get("status", ""),
-                        issue_due_date=norm_date(iss.get("dueDate")),
-                        issue_start_date=norm_date(iss.get("startDate")),
-                        issue_title=(iss.get("title") or "") or "",
-                        issue_description=(iss.get("description") or "").strip(),
-                        issue_comments=all_comments,
-                    )
-                )
-        self.logger.info("event=aggregate.rows_built count=%s", len(rows))
-        return rows
+                comments_map = self._load_comments(issues_project_id, [iss for iss, _ in producing])
+            for iss, docs in producing:
+                for row in self._build_rows(iss, docs, comments_map.get(iss.get("id"), []), ctx):
+                    n_rows += 1
+                    yield row
+            if self.progress:
+                self.progress({"issues": n_issues, "documents": len(info_cache), "rows": n_rows})
+        self.logger.info("event=aggregate.rows_built issues=%s count=%s source=%s", n_issues, n_rows, self.source)
+
+    def collect_rows(self) -> list[IssueRow]:
+        return list(self.iter_rows())
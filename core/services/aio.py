@@ -0,0 +1,354 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Optional, List, Tuple
+import requests
+from django.conf import settings
+from django.db import connection
+from core.dto import Document
+from .auth import AuthSession, AuthExpired
+from .dm import DataManagementService
+from .issues import IssuesService
+from .dm_helpers import (
+    folder_display_name,
+    document_from_tip,
+    index_folder_contents,
+    next_page_url,
+    list_items_body,
+    documents_from_list_items,
+)
+from .http_retry import arequest_with_retries
+from .resilience import CircuitOpen, DeadlineExceeded
+from .metrics import http_metrics
+
+def _closing_connection(fn, *args):
+    try:
+        return fn(*args)
+    finally:
+        connection.close()
+
+def run_sync(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+class AsyncAuthSession:
+    def __init__(self, auth: AuthSession, concurrency: int | None = None):
+        self.auth = auth
+        self.base = auth.base
+        self.concurrency = concurrency or int(getattr(settings, "FORGE_ASYNC_CONCURRENCY", 16))
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="forge-aio")
+        self._sem: asyncio.Semaphore | None = None
+        self._sem_loop = None
+        self.logger = logging.getLogger("app")
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.concurrency)
+            self._sem_loop = loop
+        return self._sem
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def _run_db(self, fn, *args):
+        return await self._run(_closing_connection, fn, *args)
+
+    async def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        hdrs_in = kwargs.pop("headers", {}) or {}
+        timeout = kwargs.pop("timeout", 30)
+        used = {"token": ""}
+
+        async def make_request(h):
+            return await self._run(self.auth._send, method, url, h, hdrs_in, timeout, kwargs)
+
+        async def get_headers():
+            used["token"] = await self._run_db(self.auth.ensure_token)
+            return {"Authorization": f"Bearer {used['token']}"}
+
+        async def refresh_on_401():
+            await self._run_db(self.auth._refresh_after_401, used["token"])
+
+        breakers = self.auth.breakers
+        async with self._semaphore():
+            breakers.before(url)
+            try:
+                resp = await arequest_with_retries(
+                    make_request,
+                    get_headers,
+                    refresh_on_401,
+                    max_retries=self.auth.max_retries,
+                    backoff_base=self.auth.backoff_base,
+                    backoff_max=self.auth.backoff_max,
+                    deadline=self.auth.deadline,
+                    on_retry=lambda reason: http_metrics.record_retry(method, url, reason),
+                )
+            except requests.RequestException:
+                breakers.observe(url, None)
+                raise
+            except BaseException:
+                breakers.release(url)
+                raise
+        breakers.observe(url, resp.status_code)
+        return await self._run_db(self.auth._finish, method, url, resp)
+
+    async def get(self, url: str, **kwargs) -> requests.Response:
+        cache = self.auth.response_cache
+        lk = await self._run(cache.lookup, url) if cache.enabled else None
+        if lk is None:
+            return await self._request("GET", url, **kwargs)
+        if lk.response is not None:
+            self.logger.info("event=http.cache_hit url=%s", url)
+            return lk.response
+        if lk.conditional_headers:
+            kwargs["headers"] = {**lk.conditional_headers, **(kwargs.get("headers") or {})}
+        resp = await self._request("GET", url, **kwargs)
+        return await self._run(cache.complete, lk, resp)
+
+    async def post(self, url: str, **kwargs) -> requests.Response:
+        return await self._request("POST", url, **kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+class AsyncDataManagementService:
+    def __init__(self, auth: AsyncAuthSession, dm: DataManagementService):
+        self.auth = auth
+        self.dm = dm
+        self._node_tasks: dict[str, asyncio.Future] = {}
+        self.logger = logging.getLogger("app")
+
+    async def item_tip(self, dm_project_id: str, item_urn: str) -> dict:
+        self.logger.info("event=dm.item_tip urn=%s", item_urn)
+        r = await self.auth.get(self.dm._item_url(dm_project_id, item_urn, "tip"), timeout=30)
+        if r.status_code != 200:
+            raise RuntimeError(f"Failed to get item tip: {r.text}")
+        return r.json().get("data") or {}
+
+    async def get_item_parent_folder_id(self, dm_project_id: str, item_urn: str) -> Optional[str]:
+        r = await self.auth.get(self.dm._item_url(dm_project_id, item_urn, "parent"), timeout=30)
+        if r.status_code != 200:
+            return None
+        return (r.json().get("data") or {}).get("id")
+
+    async def get_folder(self, dm_project_id: str, folder_id: str) -> dict:
+        r = await self.auth.get(self.dm._folder_url(dm_project_id, folder_id), timeout=30)
+        if r.status_code != 200:
+            raise RuntimeError(f"Failed to get folder: {r.text}")
+        return r.json().get("data") or {}
+
+    async def get_folder_parent_id(self, dm_project_id: str, folder_id: str) -> Optional[str]:
+        r = await self.auth.get(self.dm._folder_url(dm_project_id, folder_id, "parent"), timeout=30)
+        if r.status_code != 200:
+            return None
+        return (r.json().get("data") or {}).get("id")
+
+    async def list_items(self, dm_project_id: str, item_urns: List[str]) -> dict[str, Document]:
+        self.logger.info("event=dm.list_items count=%s", len(item_urns))
+        r = await self.auth.post(
+            self.dm._commands_url(dm_project_id),
+            json=list_items_body(item_urns),
+            headers={"Content-Type": "application/vnd.api+json"},
+            timeout=30,
+        )
+        if r.status_code in (400, 403, 404):
+            self.dm.batch_unsupported = True
+        if r.status_code != 200:
+            raise RuntimeError(f"Failed to list items: {r.text}")
+        return documents_from_list_items(r.json())
+
+    async def list_items_batched(self, dm_project_id: str, item_urns: List[str]) -> dict[str, Document]:
+        size = self.dm.batch_size
+        if size <= 0 or not item_urns:
+            return {}
+
+        async def chunk(urns):
+            if self.dm.batch_unsupported:
+                return {}
+            try:
+                return await self.list_items(dm_project_id, urns)
+            except (AuthExpired, DeadlineExceeded):
+                raise
+            except Exception as e:
+                self.logger.warning("event=dm.list_items result=fail count=%s error=%s", len(urns), e)
+                return {}
+
+        chunks = [item_urns[i:i + size] for i in range(0, len(item_urns), size)]
+        out: dict[str, Document] = await chunk(chunks[0])
+        for docs in await asyncio.gather(*(chunk(c) for c in chunks[1:])):
+            out.update(docs)
+        self.logger.info("event=dm.list_items_batched requested=%s resolved=%s", len(item_urns), len(out))
+        return out
+
+    async def iter_folder_contents(self, dm_project_id: str, folder_id: str) -> AsyncIterator[dict]:
+        url = self.dm._folder_url(dm_project_id, folder_id, "contents")
+        while url:
+            self.logger.info("event=dm.folder_contents url=%s", url)
+            r = await self.auth.get(url, timeout=30)
+            if r.status_code != 200:
+                raise RuntimeError(f"Failed to list folder contents: {r.text}")
+            j = r.json()
+            yield {"data": j.get("data", []), "included": j.get("included", []) or []}
+            url = next_page_url(j)
+
+    async def crawl_documents(self, dm_project_id: str, roots: Iterable[Tuple[str, str]]) -> dict[str, Document]:
+        index: dict[str, Document] = {}
+        failed: List[str] = []
+
+        async def walk(folder_id: str, name: str, parent_id: Optional[str], parent_path: str):
+            self.dm.folders.put_node(folder_id, name, parent_id)
+            path = self.dm.folders.put_paths(parent_path, [(folder_id, name)])
+            children: List[asyncio.Task] = []
+            try:
+                async for page in self.iter_folder_contents(dm_project_id, folder_id):
+                    docs, subfolders = index_folder_contents(page, path)
+                    index.update(docs)
+                    children += [asyncio.ensure_future(walk(fid, sub, folder_id, path)) for fid, sub in subfolders]
+            except (AuthExpired, CircuitOpen, DeadlineExceeded):
+                for t in children:
+                    t.cancel()
+                raise
+            except Exception as e:
+                self.logger.warning("event=dm.crawl_folder result=fail folder=%s error=%s", folder_id, e)
+                failed.append(folder_id)
+            await asyncio.gather(*children)
+
+        await asyncio.gather(*(walk(fid, name, None, "") for fid, name in roots))
+        self.logger.info(
+            "event=dm.crawl result=ok documents=%s pdfs=%s folders=%s failed_folders=%s",
+            len(index), sum(1 for d in index.values() if d.is_pdf), self.dm.folders.stats()["paths"], len(failed),
+        )
+        return index
+
+    async def _folder_node(self, dm_project_id: str, folder_id: str) -> Tuple[str, Optional[str]]:
+        node = self.dm.folders.node(folder_id)
+        if node is not None:
+            return node
+        task = self._node_tasks.get(folder_id)
+        if task is None:
+            async def fetch():
+                folder, parent = await asyncio.gather(
+                    self.get_folder(dm_project_id, folder_id),
+                    self.get_folder_parent_id(dm_project_id, folder_id),
+                )
+                self.dm.folders.put_node(folder_id, folder_display_name(folder), parent)
+                return folder_display_name(folder), parent
+            task = self._node_tasks[folder_id] = asyncio.ensure_future(fetch())
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._node_tasks.pop(folder_id, None)
+
+    async def build_folder_path(self, dm_project_id: str, start_folder_id: Optional[str]) -> str:
+        if not start_folder_id:
+            return ""
+        chain: List[Tuple[str, str]] = []
+        prefix = ""
+        current = start_folder_id
+        visited = set()
+        while current and current not in visited:
+            cached = self.dm.folders.path(current)
+            if cached is not None:
+                prefix = cached
+                break
+            visited.add(current)
+            name, parent = await self._folder_node(dm_project_id, current)
+            chain.append((current, name))
+            current = parent
+        return self.dm.folders.put_paths(prefix, chain)
+
+    async def get_item_info(self, dm_project_id: str, item_urn: str, cached: Optional[Document] = None) -> Document:
+        if cached is not None and cached.version is not None:
+            tip = await self.item_tip(dm_project_id, item_urn)
+            version = ((tip.get("attributes") or {}).get("versionNumber"))
+            if version is not None and int(version) == cached.version:
+                self.logger.info("event=dm.item_info_reused urn=%s version=%s", item_urn, version)
+                return document_from_tip(item_urn, tip, cached.path)
+            folder_id = await self.get_item_parent_folder_id(dm_project_id, item_urn)
+        else:
+            tip, folder_id = await asyncio.gather(
+                self.item_tip(dm_project_id, item_urn),
+                self.get_item_parent_folder_id(dm_project_id, item_urn),
+                return_exceptions=True,
+            )
+            for outcome in (tip, folder_id):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+        path = await self.build_folder_path(dm_project_id, folder_id)
+        doc = document_from_tip(item_urn, tip, path)
+        self.logger.info("event=dm.item_info urn=%s name=%s pdf=%s path_len=%s", item_urn, doc.name, doc.is_pdf, len(path))
+        return doc
+
+class AsyncIssuesService:
+    def __init__(self, auth: AsyncAuthSession, issues: IssuesService):
+        self.auth = auth
+        self.issues = issues
+
+    async def fetch_comments(self, issues_project_id: str, issue_id: str) -> Optional[list[dict]]:
+        out: list[dict] = []
+        limit = 100
+        offset: Optional[int] = 0
+        while offset is not None:
+            r = await self.auth.get(self.issues._comments_page_url(issues_project_id, issue_id, limit, offset), timeout=30)
+            if r.status_code != 200:
+                return None
+            j = r.json()
+            out.extend(j.get("results", []))
+            offset = self.issues._next_comments_offset(j, limit, offset)
+        return out
+
+class AsyncACCClient:
+    def __init__(self, client, concurrency: int | None = None):
+        self.auth = AsyncAuthSession(client.auth, concurrency)
+        self.dm = AsyncDataManagementService(self.auth, client.dm)
+        self.issues = AsyncIssuesService(self.auth, client.issues)
+        self.logger = logging.getLogger("app")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.auth.close()
+
+    async def get_item_infos(
+        self,
+        dm_project_id: str,
+        urns: Iterable[str],
+        known: Optional[dict[str, Document]] = None,
+        failed: Iterable[str] = frozenset(),
+    ) -> dict[str, Document | None]:
+        urns = list(urns)
+        known = known or {}
+        failed = set(failed)
+        batched = await self.dm.list_items_batched(dm_project_id, [u for u in urns if u not in failed])
+
+        async def one(u):
+            if u in failed:
+                return None
+            if u in batched:
+                return batched[u]
+            try:
+                return await self.dm.get_item_info(dm_project_id, u, known.get(u))
+            except (AuthExpired, DeadlineExceeded):
+                raise
+            except Exception:
+                return None
+
+        docs = await asyncio.gather(*(one(u) for u in urns))
+        self.logger.info("event=aio.item_infos count=%s resolved=%s", len(urns), sum(1 for d in docs if d))
+        st = self.dm.dm.folders.stats()
+        self.logger.info("event=dm.folder_cache folders=%s paths=%s hits=%s misses=%s", st["folders"], st["paths"], st["hits"], st["misses"])
+        return dict(zip(urns, docs))
+
+    async def fetch_comments_many(self, issues_project_id: str, issue_ids: Iterable[str]) -> dict[str, Optional[list[dict]]]:
+        issue_ids = list(issue_ids)
+        results = await asyncio.gather(*(self.issues.fetch_comments(issues_project_id, i) for i in issue_ids))
+        self.logger.info("event=aio.comments count=%s failed=%s", len(issue_ids), sum(1 for r in results if r is None))
+        return dict(zip(issue_ids, results))
@@ -1,43 +1,175 @@
 import time
+import threading
 import logging
 import requests
 from django.conf import settings
+from django.db import connection
 from core.models import OAuthToken
 from .http_retry import request_with_retries
+from .http_pool import get_session
+from .rate_limit import get_limiter
+from .resilience import Deadline, get_breakers
+from .http_cache import get_response_cache
+from .metrics import http_metrics
+from . import leases
+
+REFRESH_LEASE = "oauth_refresh"
 
 class AuthExpired(Exception):
     pass
 
-class AuthSession:
+class _TokenCache:
     def __init__(self):
+        self.lock = threading.RLock()
+        self.access_token = ""
+        self.expires_at = 0
+        self.timer: threading.Timer | None = None
+
+    def fresh(self, leeway: int) -> bool:
+        return bool(self.access_token) and self.expires_at - leeway > int(time.time())
+
+    def store(self, row: OAuthToken):
+        self.access_token = row.access_token
+        self.expires_at = row.expires_at
+
+    def schedule(self, delay: float, fn):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = threading.Timer(delay, fn)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def clear(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.access_token = ""
+            self.expires_at = 0
+
+_token_cache = _TokenCache()
+
+def invalidate_token_cache():
+    _token_cache.clear()
+
+class AuthSession:
+    def __init__(self, http: requests.Session | None = None, deadline: Deadline | None = None):
         self.base = settings.FORGE_BASE_URL.rstrip("/")
+        self.http = http if http is not None else get_session()
+        self.limiter = get_limiter()
+        self.breakers = get_breakers()
+        self.response_cache = get_response_cache()
+        self.deadline = deadline
         self.max_retries = getattr(settings, "FORGE_RETRY_MAX_RETRIES", 5)
         self.backoff_base = getattr(settings, "FORGE_RETRY_BACKOFF_BASE", 0.5)
         self.backoff_max = getattr(settings, "FORGE_RETRY_BACKOFF_MAX", 10.0)
+        self.refresh_leeway = int(getattr(settings, "FORGE_TOKEN_REFRESH_LEEWAY", 60))
+        self.proactive_refresh = int(getattr(settings, "FORGE_TOKEN_PROACTIVE_REFRESH", 300))
+        self.refresh_lease_ttl = float(getattr(settings, "FORGE_TOKEN_REFRESH_LEASE_TTL", 30))
+        self.refresh_wait = float(getattr(settings, "FORGE_TOKEN_REFRESH_WAIT", 15))
         self.logger = logging.getLogger("app")
 
     def _row(self) -> OAuthToken | None:
         return OAuthToken.objects.order_by("-updated_at").first()
 
     def ensure_token(self) -> str:
-        row = self._row()
-        if not row:
-            self.logger.info("event=auth.ensure_token result=missing")
-            raise RuntimeError("Not authenticated")
-        if row.expires_at - 60 <= int(time.time()):
-            self.logger.info("event=auth.ensure_token action=refresh")
-            self._refresh(row)
-        self.logger.info("event=auth.ensure_token result=ok")
-        return row.access_token
+        c = _token_cache
+        if c.fresh(self.refresh_leeway):
+            return c.access_token
+        with c.lock:
+            if c.fresh(self.refresh_leeway):
+                return c.access_token
+            row = self._row()
+            if not row:
+                self.logger.info("event=auth.ensure_token result=missing")
+                raise RuntimeError("Not authenticated")
+            if row.expires_at - self.refresh_leeway <= int(time.time()):
+                self.logger.info("event=auth.ensure_token action=refresh")
+                self._refresh(row)
+            else:
+                self._adopt(row)
+                self.logger.info("event=auth.ensure_token result=loaded expires_at=%s", row.expires_at)
+            return c.access_token
+
+    def _adopt(self, row: OAuthToken):
+        _token_cache.store(row)
+        if self.proactive_refresh <= 0:
+            return
+        delay = row.expires_at - self.proactive_refresh - int(time.time())
+        if delay > 0:
+            _token_cache.schedule(delay, self._background_refresh)
+
+    def _background_refresh(self):
+        c = _token_cache
+        try:
+            with c.lock:
+                if c.expires_at - self.proactive_refresh > int(time.time()):
+                    return
+                row = self._row()
+                if not row:
+                    return
+                if row.expires_at > c.expires_at:
+                    self._adopt(row)
+                    self.logger.info("event=auth.background_refresh result=reused")
+                    return
+                self.logger.info("event=auth.background_refresh action=refresh")
+                self._refresh(row)
+        except Exception as e:
+            self.logger.warning("event=auth.background_refresh result=fail error=%s", type(e).__name__)
+        finally:
+            connection.close()
 
     def headers(self) -> dict:
         return {"Authorization": f"Bearer {self.ensure_token()}"}
 
     def _clear_tokens(self):
+        invalidate_token_cache()
         OAuthToken.objects.all().delete()
         self.logger.info("event=auth.tokens_cleared")
 
+    def _peer_token(self, row: OAuthToken) -> OAuthToken | None:
+        current = self._row()
+        if not current or current.access_token == row.access_token:
+            return None
+        if current.expires_at - self.refresh_leeway <= int(time.time()):
+            return None
+        return current
+
+    def _wait_for_peer_refresh(self, row: OAuthToken) -> OAuthToken | None:
+        deadline = time.monotonic() + self.refresh_wait
+        while time.monotonic() < deadline:
+            current = self._peer_token(row)
+            if current:
+                return current
+            if not leases.is_held(REFRESH_LEASE):
+                return self._peer_token(row)
+            time.sleep(0.25)
+        return None
+
     def _refresh(self, row: OAuthToken):
+        owner = leases.acquire(REFRESH_LEASE, self.refresh_lease_ttl)
+        if owner is None:
+            self.logger.info("event=auth.refresh action=wait_for_peer")
+            current = self._wait_for_peer_refresh(row)
+            if current:
+                self._adopt(current)
+                self.logger.info("event=auth.refresh result=reused_peer")
+                return
+            owner = leases.acquire(REFRESH_LEASE, self.refresh_lease_ttl)
+            if owner is None:
+                self.logger.warning("event=auth.refresh result=lease_timeout")
+                raise RuntimeError("Token refresh failed")
+        try:
+            current = self._peer_token(row)
+            if current:
+                self._adopt(current)
+                self.logger.info("event=auth.refresh result=reused_peer")
+                return
+            self._exchange_refresh_token(self._row() or row)
+        finally:
+            leases.release(REFRESH_LEASE, owner)
+
+    def _exchange_refresh_token(self, row: OAuthToken):
         url = f"{self.base}/authentication/v2/token"
         data = {
             "grant_type": "refresh_token",
@@ -47,9 +179,14 @@ class AuthSession:
             "redirect_uri": settings.FORGE_CALLBACK_URL,
         }
         self.logger.info("event=auth.refresh start=1")
-        r = requests.post(url, data=data, timeout=30)
+        r = self.http.post(url, data=data, timeout=30)
         if r.status_code != 200:
             self.logger.warning("event=auth.refresh result=fail status=%s", r.status_code)
+            current = self._row()
+            if current and current.refresh_token != row.refresh_token:
+                self._adopt(current)
+                self.logger.info("event=auth.refresh result=reused_peer")
+                return
             self._clear_tokens()
             raise RuntimeError("Token refresh failed")
         p = r.json()
@@ -57,22 +194,31 @@ class AuthSession:
         row.refresh_token = p.get("refresh_token", row.refresh_token)
         row.expires_at = int(time.time()) + int(p.get("expires_in", 0))
         row.save()
+        self._adopt(row)
         self.logger.info("event=auth.refresh result=success")
 
-    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
-        hdrs_in = kwargs.pop("headers", {}) or {}
-        timeout = kwargs.pop("timeout", 30)
-
-        def make_request(h):
-            merged = {}
-            merged.update(h)
-            merged.update(hdrs_in)
-            return requests.request(method, url, headers=merged, timeout=timeout, **kwargs)
-
-        def get_headers():
-            return self.headers()
+    def _send(self, method: str, url: str, auth_headers: dict, hdrs_in: dict, timeout, kwargs: dict) -> requests.Response:
+        merged = {}
+        merged.update(auth_headers)
+        merged.update(hdrs_in)
+        self.limiter.acquire(url, self.deadline)
+        if self.deadline is not None:
+            timeout = self.deadline.timeout(timeout)
+        t0 = time.perf_counter()
+        try:
+            resp = self.http.request(method, url, headers=merged, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            http_metrics.record(method, url, None, time.perf_counter() - t0)
+            raise
+        http_metrics.record(method, url, resp.status_code, time.perf_counter() - t0, len(getattr(resp, "content", b"") or b""))
+        self.limiter.observe(url, resp.status_code, resp.headers.get("Retry-After"))
+        return resp
 
-        def refresh_on_401():
+    def _refresh_after_401(self, used_token: str):
+        with _token_cache.lock:
+            if _token_cache.access_token and _token_cache.access_token != used_token:
+                self.logger.info("event=http.refresh_on_401 result=already_refreshed")
+                return
             row = self._row()
             if not row:
                 self._clear_tokens()
@@ -86,14 +232,7 @@ class AuthSession:
                 self.logger.info("event=http.refresh_on_401 result=refresh_failed")
                 raise AuthExpired("Access token invalid or expired")
 
-        resp = request_with_retries(
-            make_request,
-            get_headers,
-            refresh_on_401,
-            max_retries=self.max_retries,
-            backoff_base=self.backoff_base,
-            backoff_max=self.backoff_max,
-        )
+    def _finish(self, method: str, url: str, resp: requests.Response) -> requests.Response:
         self.logger.info("event=http.request method=%s url=%s status=%s", method, url, getattr(resp, "status_code", None))
         if resp.status_code == 401:
             self._clear_tokens()
@@ -101,8 +240,52 @@ class AuthSession:
             raise AuthExpired("Access token invalid or expired")
         return resp
 
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        hdrs_in = kwargs.pop("headers", {}) or {}
+        timeout = kwargs.pop("timeout", 30)
+        used = {"token": ""}
+
+        def make_request(h):
+            return self._send(method, url, h, hdrs_in, timeout, kwargs)
+
+        def get_headers():
+            used["token"] = self.ensure_token()
+            return {"Authorization": f"Bearer {used['token']}"}
+
+        def refresh_on_401():
+            self._refresh_after_401(used["token"])
+
+        self.breakers.before(url)
+        try:
+            resp = request_with_retries(
+                make_request,
+                get_headers,
+                refresh_on_401,
+                max_retries=self.max_retries,
+                backoff_base=self.backoff_base,
+                backoff_max=self.backoff_max,
+                deadline=self.deadline,
+                on_retry=lambda reason: http_metrics.record_retry(method, url, reason),
+            )
+        except requests.RequestException:
+            self.breakers.observe(url, None)
+            raise
+        except BaseException:
+            self.breakers.release(url)
+            raise
+        self.breakers.observe(url, resp.status_code)
+        return self._finish(method, url, resp)
+
     def get(self, url: str, **kwargs) -> requests.Response:
-        return self._request("GET", url, **kwargs)
+        lk = self.response_cache.lookup(url)
+        if lk is None:
+            return self._request("GET", url, **kwargs)
+        if lk.response is not None:
+            self.logger.info("event=http.cache_hit url=%s", url)
+            return lk.response
+        if lk.conditional_headers:
+            kwargs["headers"] = {**lk.conditional_headers, **(kwargs.get("headers") or {})}
+        return self.response_cache.complete(lk, self._request("GET", url, **kwargs))
 
     def post(self, url: str, **kwargs) -> requests.Response:
         return self._request("POST", url, **kwargs)
@@ -0,0 +1,81 @@
+import logging
+import threading
+from django.conf import settings
+from core.models import CommentThread
+
+logger = logging.getLogger("app")
+
+class CommentCache:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, issue: dict) -> tuple[str, int | None]:
+        return issue.get("updatedAt") or "", issue.get("commentCount")
+
+    def lookup(self, issues_project_id: str, issues: list[dict]) -> tuple[dict[str, list[dict]], list[dict]]:
+        if not self.enabled:
+            return {}, list(issues)
+        by_id = {iss["id"]: iss for iss in issues if iss.get("id")}
+        rows = CommentThread.objects.filter(project_id=issues_project_id, issue_id__in=list(by_id)).values_list(
+            "issue_id", "updated_at", "comment_count", "comments"
+        )
+        cached: dict[str, list[dict]] = {}
+        for iid, updated_at, count, comments in rows:
+            if updated_at and (updated_at, count) == self._key(by_id[iid]):
+                cached[iid] = comments
+        missing = [iss for iid, iss in by_id.items() if iid not in cached]
+        with self.lock:
+            self.hits += len(cached)
+            self.misses += len(missing)
+        logger.info("event=comment_cache.lookup project=%s hits=%s misses=%s", issues_project_id, len(cached), len(missing))
+        return cached, missing
+
+    def store(self, issues_project_id: str, issues: list[dict], threads: dict[str, list[dict]]):
+        if not self.enabled:
+            return
+        rows = [
+            CommentThread(
+                project_id=issues_project_id,
+                issue_id=iss["id"],
+                updated_at=self._key(iss)[0],
+                comment_count=self._key(iss)[1],
+                comments=threads[iss["id"]],
+            )
+            for iss in issues
+            if iss.get("id") in threads and iss.get("updatedAt")
+        ]
+        CommentThread.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["project_id", "issue_id"],
+            update_fields=["updated_at", "comment_count", "comments", "stored_at"],
+        )
+
+    def stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            }
+
+_lock = threading.Lock()
+_cache: CommentCache | None = None
+
+def get_comment_cache() -> CommentCache:
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = CommentCache(enabled=bool(getattr(settings, "FORGE_COMMENT_CACHE_ENABLED", True)))
+    return _cache
+
+def reset_comment_cache():
+    global _cache
+    with _lock:
+        _cache = None
@@ -1,7 +1,12 @@
 import csv
 import io
+import os
 import logging
-from typing import Iterable, Mapping, Any
+import tempfile
+from dataclasses import fields
+from operator import attrgetter
+from typing import Iterable, Iterator, Mapping, Any
+from core.dto import IssueRow
 
 CSV_HEADERS = [
     "project id",
@@ -23,6 +28,8 @@ CSV_HEADERS = [
 
 _logger = logging.getLogger("app")
 
+_issue_row_values = attrgetter(*(f.name for f in fields(IssueRow)))
+
 def _to_mapping(row: Any) -> Mapping[str, str]:
     if hasattr(row, "to_csv_row"):
         return row.to_csv_row()
@@ -30,13 +37,51 @@ def _to_mapping(row: Any) -> Mapping[str, str]:
         return row
     raise TypeError(f"Unsupported row type: {type(row).__name__}")
 
-def rows_to_csv(rows: Iterable[Any]) -> bytes:
+def _to_values(row: Any) -> tuple | list:
+    if type(row) is IssueRow:
+        return _issue_row_values(row)
+    m = _to_mapping(row)
+    return [m.get(h, "") for h in CSV_HEADERS]
+
+def iter_csv_chunks(rows: Iterable[Any], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
     buf = io.StringIO(newline="")
-    writer = csv.DictWriter(buf, fieldnames=CSV_HEADERS, extrasaction="ignore")
-    writer.writeheader()
+    writer = csv.writer(buf)
+    writerow = writer.writerow
+    writerow(CSV_HEADERS)
+    yield buf.getvalue().encode("utf-8")
+    buf.seek(0)
+    buf.truncate()
     n = 0
     for r in rows:
-        writer.writerow(_to_mapping(r))
+        writerow(_to_values(r))
         n += 1
+        if buf.tell() >= chunk_size:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
     _logger.info("event=csv.rows_written count=%s", n)
-    return buf.getvalue().encode("utf-8")
+
+def rows_to_csv(rows: Iterable[Any]) -> bytes:
+    return b"".join(iter_csv_chunks(rows))
+
+def csv_header() -> bytes:
+    return next(iter_csv_chunks(()))
+
+def tee_csv_atomic(path: str, rows: Iterable[Any]) -> Iterator[bytes]:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".acc_issues_", suffix=".csv.part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter_csv_chunks(rows):
+                f.write(chunk)
+                yield chunk
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
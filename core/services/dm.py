@@ -1,18 +1,74 @@
 import urllib.parse
+import threading
 from collections import deque
 from typing import Tuple, Optional, List
 import logging
 from .auth import AuthSession
 from .projects import ProjectsService
 from core.dto import Document
+from django.conf import settings
+from .dm_helpers import folder_display_name, document_from_tip
+
+class FolderCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.nodes: dict[str, Tuple[str, Optional[str]]] = {}
+        self.paths: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def node(self, folder_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        with self.lock:
+            return self.nodes.get(folder_id)
+
+    def put_node(self, folder_id: str, name: str, parent_id: Optional[str]):
+        with self.lock:
+            self.nodes[folder_id] = (name, parent_id)
+
+    def path(self, folder_id: str) -> Optional[str]:
+        with self.lock:
+            p = self.paths.get(folder_id)
+            if p is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return p
+
+    def put_paths(self, prefix: str, chain: List[Tuple[str, str]]) -> str:
+        path = prefix
+        with self.lock:
+            for folder_id, name in reversed(chain):
+                if name:
+                    path = f"{path}/{name}" if path else name
+                self.paths[folder_id] = path
+        return path
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"folders": len(self.nodes), "paths": len(self.paths), "hits": self.hits, "misses": self.misses}
 
 class DataManagementService:
     def __init__(self, auth: AuthSession, projects: ProjectsService):
         self.auth = auth
         self.projects = projects
         self.base = self.auth.base
+        self.folders = FolderCache()
+        self.batch_size = int(getattr(settings, "FORGE_DM_BATCH_SIZE", 50))
+        self.batch_unsupported = False
         self.logger = logging.getLogger("app")
 
+    def _item_url(self, dm_project_id: str, item_urn: str, suffix: str) -> str:
+        enc_item = urllib.parse.quote(item_urn, safe="")
+        return f"{self.base}/data/v1/projects/{dm_project_id}/items/{enc_item}/{suffix}"
+
+    def _folder_url(self, dm_project_id: str, folder_id: str, suffix: str = "") -> str:
+        enc_folder = urllib.parse.quote(folder_id, safe="")
+        url = f"{self.base}/data/v1/projects/{dm_project_id}/folders/{enc_folder}"
+        return f"{url}/{suffix}" if suffix else url
+
+    def _commands_url(self, dm_project_id: str) -> str:
+        return f"{self.base}/data/v1/projects/{dm_project_id}/commands"
+
     def _folder_contents(self, project_id: str, folder_id: str) -> dict:
         enc_folder = urllib.parse.quote(folder_id, safe="")
         url = f"{self.base}/data/v1/projects/{project_id}/folders/{enc_folder}/contents"
@@ -21,32 +77,6 @@ class DataManagementService:
             raise RuntimeError(f"Failed to list folder contents: {r.text}")
         return r.json()
 
-    def _folder_contents_all(self, project_id: str, folder_id: str) -> dict:
-        enc_folder = urllib.parse.quote(folder_id, safe="")
-        url = f"{self.base}/data/v1/projects/{project_id}/folders/{enc_folder}/contents"
-        data_accum: List[dict] = []
-        included_accum: List[dict] = []
-        while url:
-            self.logger.info("event=dm.folder_contents url=%s", url)
-            r = self.auth.get(url, timeout=30)
-            if r.status_code != 200:
-                raise RuntimeError(f"Failed to list folder contents: {r.text}")
-            j = r.json()
-            data_accum.extend(j.get("data", []))
-            included = j.get("included", [])
-            if included:
-                included_accum.extend(included)
-            links = j.get("links") or {}
-            next_link = links.get("next")
-            if isinstance(next_link, dict):
-                url = next_link.get("href") or next_link.get("url") or ""
-            elif isinstance(next_link, str):
-                url = next_link
-            else:
-                url = ""
-        self.logger.info("event=dm.folder_contents result=ok data=%s included=%s", len(data_accum), len(included_accum))
-        return {"data": data_accum, "included": included_accum}
-
     def signed_s3_url(self, bucket_key: str, object_key: str) -> str:
         url = f"{self.base}/oss/v2/buckets/{bucket_key}/objects/{object_key}/signeds3download"
         self.logger.info("event=dm.signed_url bucket=%s object=%s", bucket_key, object_key)
@@ -56,8 +86,7 @@ class DataManagementService:
         return r.json().get("url")
 
     def item_tip(self, dm_project_id: str, item_urn: str) -> dict:
-        enc_item = urllib.parse.quote(item_urn, safe="")
-        url = f"{self.base}/data/v1/projects/{dm_project_id}/items/{enc_item}/tip"
+        url = self._item_url(dm_project_id, item_urn, "tip")
         self.logger.info("event=dm.item_tip urn=%s", item_urn)
         r = self.auth.get(url, timeout=30)
         if r.status_code != 200:
@@ -65,8 +94,7 @@ class DataManagementService:
         return r.json().get("data") or {}
 
     def get_item_parent_folder_id(self, dm_project_id: str, item_urn: str) -> Optional[str]:
-        enc_item = urllib.parse.quote(item_urn, safe="")
-        url = f"{self.base}/data/v1/projects/{dm_project_id}/items/{enc_item}/parent"
+        url = self._item_url(dm_project_id, item_urn, "parent")
         r = self.auth.get(url, timeout=30)
         if r.status_code != 200:
             return None
@@ -74,16 +102,14 @@ class DataManagementService:
         return data.get("id")
 
     def get_folder(self, dm_project_id: str, folder_id: str) -> dict:
-        enc_folder = urllib.parse.quote(folder_id, safe="")
-        url = f"{self.base}/data/v1/projects/{dm_project_id}/folders/{enc_folder}"
+        url = self._folder_url(dm_project_id, folder_id)
         r = self.auth.get(url, timeout=30)
         if r.status_code != 200:
             raise RuntimeError(f"Failed to get folder: {r.text}")
         return r.json().get("data") or {}
 
     def get_folder_parent_id(self, dm_project_id: str, folder_id: str) -> Optional[str]:
-        enc_folder = urllib.parse.quote(folder_id, safe="")
-        url = f"{self.base}/data/v1/projects/{dm_project_id}/folders/{enc_folder}/parent"
+        url = self._folder_url(dm_project_id, folder_id, "parent")
         r = self.auth.get(url, timeout=30)
         if r.status_code != 200:
             return None
@@ -93,30 +119,31 @@ class DataManagementService:
     def build_folder_path(self, dm_project_id: str, start_folder_id: Optional[str]) -> str:
         if not start_folder_id:
             return ""
-        names: List[str] = []
+        chain: List[Tuple[str, str]] = []
+        prefix = ""
         current = start_folder_id
         visited = set()
         while current and current not in visited:
+            cached = self.folders.path(current)
+            if cached is not None:
+                prefix = cached
+                break
             visited.add(current)
-            f = self.get_folder(dm_project_id, current)
-            attrs = f.get("attributes") or {}
-            name = attrs.get("displayName") or attrs.get("name") or ""
-            if name:
-                names.append(name)
-            current = self.get_folder_parent_id(dm_project_id, current)
-        names.reverse()
-        return "/".join(names)
+            node = self.folders.node(current)
+            if node is None:
+                name = folder_display_name(self.get_folder(dm_project_id, current))
+                parent = self.get_folder_parent_id(dm_project_id, current)
+                self.folders.put_node(current, name, parent)
+            else:
+                name, parent = node
+            chain.append((current, name))
+            current = parent
+        return self.folders.put_paths(prefix, chain)
 
     def get_item_info(self, dm_project_id: str, item_urn: str) -> Document:
         tip = self.item_tip(dm_project_id, item_urn)
-        attrs = tip.get("attributes") or {}
-        links = tip.get("links") or {}
-        web = links.get("webView", {}) if isinstance(links, dict) else {}
-        web_href = web.get("href") if isinstance(web, dict) else ""
-        name = attrs.get("name") or attrs.get("displayName") or ""
-        file_type = (attrs.get("fileType") or "").lower()
-        is_pdf = file_type == "pdf" or name.lower().endswith(".pdf")
         folder_id = self.get_item_parent_folder_id(dm_project_id, item_urn)
         path = self.build_folder_path(dm_project_id, folder_id)
-        self.logger.info("event=dm.item_info urn=%s name=%s pdf=%s path_len=%s", item_urn, name, is_pdf, len(path))
-        return Document(id=item_urn, name=name, path=path, web_link=web_href, is_pdf=is_pdf)
+        doc = document_from_tip(item_urn, tip, path)
+        self.logger.info("event=dm.item_info urn=%s name=%s pdf=%s path_len=%s", item_urn, doc.name, doc.is_pdf, len(path))
+        return doc
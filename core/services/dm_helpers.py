@@ -1,4 +1,8 @@
-from typing import Tuple, List
+import re
+from typing import Tuple, List, Dict, Iterable
+from core.dto import Document
+
+_VERSION_PARAM = re.compile(r"[?&]version=(\d+)")
 
 def extract_pdf_names_from_contents(contents: dict) -> List[str]:
     names: List[str] = []
@@ -13,3 +17,85 @@ def extract_pdf_names_from_contents(contents: dict) -> List[str]:
             if name:
                 names.append(name)
     return names
+
+def next_page_url(payload: dict) -> str:
+    next_link = (payload.get("links") or {}).get("next")
+    if isinstance(next_link, dict):
+        return next_link.get("href") or next_link.get("url") or ""
+    if isinstance(next_link, str):
+        return next_link
+    return ""
+
+def folder_display_name(folder: dict) -> str:
+    attrs = folder.get("attributes") or {}
+    return attrs.get("displayName") or attrs.get("name") or ""
+
+def document_from_tip(item_urn: str, tip: dict, path: str) -> Document:
+    attrs = tip.get("attributes") or {}
+    links = tip.get("links") or {}
+    web = links.get("webView", {}) if isinstance(links, dict) else {}
+    web_href = web.get("href") if isinstance(web, dict) else ""
+    name = attrs.get("name") or attrs.get("displayName") or ""
+    file_type = (attrs.get("fileType") or "").lower()
+    is_pdf = file_type == "pdf" or name.lower().endswith(".pdf")
+    version = attrs.get("versionNumber")
+    return Document(
+        id=item_urn,
+        name=name,
+        path=path,
+        web_link=web_href,
+        is_pdf=is_pdf,
+        version=int(version) if version is not None else None,
+    )
+
+def index_folder_contents(contents: dict, path: str) -> Tuple[Dict[str, Document], List[Tuple[str, str]]]:
+    versions = {v.get("id"): v for v in contents.get("included", []) or [] if v.get("type") == "versions"}
+    docs: Dict[str, Document] = {}
+    subfolders: List[Tuple[str, str]] = []
+    for entry in contents.get("data", []) or []:
+        if entry.get("type") == "folders":
+            subfolders.append((entry.get("id"), folder_display_name(entry)))
+            continue
+        if entry.get("type") != "items":
+            continue
+        tip_id = (((entry.get("relationships") or {}).get("tip") or {}).get("data") or {}).get("id")
+        tip = versions.get(tip_id)
+        if tip is not None:
+            docs[entry.get("id")] = document_from_tip(entry.get("id"), tip, path)
+    return docs, subfolders
+
+def list_items_body(urns: Iterable[str]) -> dict:
+    return {
+        "jsonapi": {"version": "1.0"},
+        "data": {
+            "type": "commands",
+            "attributes": {
+                "extension": {
+                    "type": "commands:autodesk.core:ListItems",
+                    "version": "1.0.0",
+                    "data": {"includePathInProject": True},
+                }
+            },
+            "relationships": {"resources": {"data": [{"type": "items", "id": u} for u in urns]}},
+        },
+    }
+
+def documents_from_list_items(payload: dict) -> Dict[str, Document]:
+    included = payload.get("included", []) or []
+    versions = {v.get("id"): v for v in included if v.get("type") == "versions"}
+    docs: Dict[str, Document] = {}
+    for item in included:
+        if item.get("type") != "items":
+            continue
+        attrs = item.get("attributes") or {}
+        path = (attrs.get("pathInProject") or "").strip("/")
+        tip_id = (((item.get("relationships") or {}).get("tip") or {}).get("data") or {}).get("id") or ""
+        tip = versions.get(tip_id)
+        if tip is None:
+            m = _VERSION_PARAM.search(tip_id)
+            tip = {
+                "attributes": {"displayName": attrs.get("displayName"), "versionNumber": int(m.group(1)) if m else None},
+                "links": item.get("links") or {},
+            }
+        docs[item.get("id")] = document_from_tip(item.get("id"), tip, path)
+    return docs
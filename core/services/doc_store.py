@@ -0,0 +1,65 @@
+import logging
+import datetime as dt
+from typing import Iterable, Optional
+from django.conf import settings
+from django.utils import timezone
+from core.dto import Document
+from core.models import DocumentRecord, DocumentLookupFailure
+
+class DocumentStore:
+    def __init__(self, dm_project_id: str):
+        self.project_id = dm_project_id
+        self.failure_ttl = int(getattr(settings, "FORGE_DOC_FAILURE_TTL", 900))
+        self.logger = logging.getLogger("app")
+
+    def load(self, urns: Iterable[str]) -> tuple[dict[str, Document], set[str]]:
+        urns = list(urns)
+        known: dict[str, Document] = {}
+        for rec in DocumentRecord.objects.filter(project_id=self.project_id, urn__in=urns):
+            known[rec.urn] = Document(
+                id=rec.urn,
+                name=rec.name,
+                path=rec.path,
+                web_link=rec.web_link,
+                is_pdf=rec.is_pdf,
+                version=rec.version_number,
+            )
+        failed = set(
+            DocumentLookupFailure.objects.filter(
+                project_id=self.project_id, urn__in=urns, expires_at__gt=timezone.now()
+            ).values_list("urn", flat=True)
+        )
+        self.logger.info("event=doc_store.load requested=%s known=%s failed=%s", len(urns), len(known), len(failed))
+        return known, failed
+
+    def save(self, docs: dict[str, Optional[Document]], skip_failures: Iterable[str] = ()):
+        resolved = [d for d in docs.values() if d is not None]
+        DocumentRecord.objects.bulk_create(
+            [
+                DocumentRecord(
+                    project_id=self.project_id,
+                    urn=d.id,
+                    name=d.name,
+                    path=d.path,
+                    web_link=d.web_link or "",
+                    is_pdf=d.is_pdf,
+                    version_number=d.version,
+                )
+                for d in resolved
+            ],
+            update_conflicts=True,
+            unique_fields=["project_id", "urn"],
+            update_fields=["name", "path", "web_link", "is_pdf", "version_number", "resolved_at"],
+        )
+        skip = set(skip_failures)
+        failed = [u for u, d in docs.items() if d is None and u not in skip]
+        expires_at = timezone.now() + dt.timedelta(seconds=self.failure_ttl)
+        DocumentLookupFailure.objects.bulk_create(
+            [DocumentLookupFailure(project_id=self.project_id, urn=u, expires_at=expires_at) for u in failed],
+            update_conflicts=True,
+            unique_fields=["project_id", "urn"],
+            update_fields=["expires_at", "failed_at"],
+        )
+        if resolved:
+            DocumentLookupFailure.objects.filter(project_id=self.project_id, urn__in=[d.id for d in resolved]).delete()
+        self.logger.info("event=doc_store.save resolved=%s failed=%s", len(resolved), len(failed))
@@ -0,0 +1,142 @@
+import re
+import json
+import time
+import hashlib
+import threading
+import logging
+from dataclasses import dataclass, field
+from requests.structures import CaseInsensitiveDict
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger("app")
+
+DEFAULT_TTLS = [
+    (r"/data/v1/projects/[^/]+/items/[^/]+/tip$", 900),
+    (r"/data/v1/projects/[^/]+/items/[^/]+/parent$", 86400),
+    (r"/data/v1/projects/[^/]+/folders/[^/]+/parent$", 86400),
+    (r"/data/v1/projects/[^/]+/folders/[^/]+$", 86400),
+]
+
+class CachedResponse:
+    from_cache = True
+
+    def __init__(self, url: str, entry: dict):
+        self.url = url
+        self.status_code = 200
+        self.content = entry["body"]
+        self.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        self.encoding = "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+@dataclass
+class CacheLookup:
+    url: str
+    ttl: int
+    entry: dict | None = None
+    response: CachedResponse | None = None
+    conditional_headers: dict = field(default_factory=dict)
+
+class ResponseCache:
+    def __init__(self, rules, *, alias: str, retention: int, enabled: bool = True):
+        self.rules = [(re.compile(pattern), int(ttl)) for pattern, ttl in rules]
+        self.alias = alias
+        self.retention = retention
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+
+    def ttl_for(self, url: str) -> int | None:
+        path = url.split("?", 1)[0]
+        for pattern, ttl in self.rules:
+            if pattern.search(path):
+                return ttl
+        return None
+
+    def _key(self, url: str) -> str:
+        return "forge-http:" + hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def lookup(self, url: str) -> CacheLookup | None:
+        if not self.enabled:
+            return None
+        ttl = self.ttl_for(url)
+        if ttl is None:
+            return None
+        entry = caches[self.alias].get(self._key(url))
+        lk = CacheLookup(url=url, ttl=ttl, entry=entry)
+        if not entry:
+            return lk
+        if time.time() - entry["stored_at"] < ttl:
+            self._count("hits")
+            lk.response = CachedResponse(url, entry)
+            return lk
+        if entry.get("etag"):
+            lk.conditional_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            lk.conditional_headers["If-Modified-Since"] = entry["last_modified"]
+        return lk
+
+    def complete(self, lk: CacheLookup, resp):
+        if resp.status_code == 304 and lk.entry:
+            self._count("revalidated")
+            lk.entry["stored_at"] = time.time()
+            caches[self.alias].set(self._key(lk.url), lk.entry, self.retention)
+            return CachedResponse(lk.url, lk.entry)
+        self._count("misses")
+        if resp.status_code == 200:
+            headers = {k: resp.headers[k] for k in ("Content-Type", "ETag", "Last-Modified") if k in resp.headers}
+            entry = {
+                "body": resp.content,
+                "headers": headers,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "stored_at": time.time(),
+            }
+            caches[self.alias].set(self._key(lk.url), entry, self.retention)
+            self._count("stores")
+        return resp
+
+    def stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_ratio": round((self.hits + self.revalidated) / total, 3) if total else 0.0,
+            }
+
+_lock = threading.Lock()
+_cache: ResponseCache | None = None
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    getattr(settings, "FORGE_HTTP_CACHE_TTLS", DEFAULT_TTLS),
+                    alias=getattr(settings, "FORGE_HTTP_CACHE_ALIAS", "forge_http"),
+                    retention=int(getattr(settings, "FORGE_HTTP_CACHE_RETENTION", 7 * 86400)),
+                    enabled=bool(getattr(settings, "FORGE_HTTP_CACHE_ENABLED", False)),
+                )
+    return _cache
+
+def reset_response_cache():
+    global _cache
+    with _lock:
+        _cache = None
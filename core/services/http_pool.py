@@ -0,0 +1,53 @@
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger("app")
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+
+def build_session(*, pool_connections: int, pool_maxsize: int, pool_block: bool, keep_alive: bool) -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=0,
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    if not keep_alive:
+        s.headers["Connection"] = "close"
+    return s
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                pool_connections = int(getattr(settings, "FORGE_HTTP_POOL_CONNECTIONS", 10))
+                pool_maxsize = int(getattr(settings, "FORGE_HTTP_POOL_MAXSIZE", 20))
+                pool_block = bool(getattr(settings, "FORGE_HTTP_POOL_BLOCK", False))
+                keep_alive = bool(getattr(settings, "FORGE_HTTP_KEEP_ALIVE", True))
+                _session = build_session(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=pool_block,
+                    keep_alive=keep_alive,
+                )
+                logger.info(
+                    "event=http.pool_init connections=%s maxsize=%s block=%s keep_alive=%s",
+                    pool_connections, pool_maxsize, pool_block, keep_alive,
+                )
+    return _session
+
+def close_session():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            logger.info("event=http.pool_closed")
@@ -1,5 +1,6 @@
 import time
 import random
+import asyncio
 import datetime as dt
 import email.utils
 import logging
@@ -7,7 +8,7 @@ import requests
 
 logger = logging.getLogger("app")
 
-def _parse_retry_after(value: str) -> float | None:
+def parse_retry_after(value: str) -> float | None:
     if not value:
         return None
     try:
@@ -25,18 +26,39 @@ def _parse_retry_after(value: str) -> float | None:
         except Exception:
             return None
 
-def _sleep_backoff(attempt: int, retry_after_header: str | None, backoff_base: float, backoff_max: float):
-    ra = _parse_retry_after(retry_after_header) if retry_after_header else None
+def _backoff_delay(attempt: int, retry_after_header: str | None, backoff_base: float, backoff_max: float) -> float:
+    ra = parse_retry_after(retry_after_header) if retry_after_header else None
     if ra is not None:
         delay = ra
     else:
         delay = backoff_base * (2 ** (attempt - 1)) + random.uniform(0, backoff_base)
-    delay = min(delay, backoff_max)
+    return min(delay, backoff_max)
+
+def _fits_deadline(attempt: int, delay: float, deadline) -> bool:
+    if deadline is None or delay < deadline.remaining():
+        return True
+    logger.info("event=retry.deadline attempt=%s delay=%s remaining=%s", attempt, round(delay, 3), round(deadline.remaining(), 3))
+    return False
+
+def sleep_backoff(attempt: int, retry_after_header: str | None, backoff_base: float, backoff_max: float, deadline=None) -> bool:
+    delay = _backoff_delay(attempt, retry_after_header, backoff_base, backoff_max)
+    if not _fits_deadline(attempt, delay, deadline):
+        return False
     if delay > 0:
         logger.info("event=retry.backoff attempt=%s delay=%s", attempt, round(delay, 3))
         time.sleep(delay)
+    return True
+
+async def async_sleep_backoff(attempt: int, retry_after_header: str | None, backoff_base: float, backoff_max: float, deadline=None) -> bool:
+    delay = _backoff_delay(attempt, retry_after_header, backoff_base, backoff_max)
+    if not _fits_deadline(attempt, delay, deadline):
+        return False
+    if delay > 0:
+        logger.info("event=retry.backoff attempt=%s delay=%s", attempt, round(delay, 3))
+        await asyncio.sleep(delay)
+    return True
 
-def request_with_retries(make_request, get_headers, refresh_on_401, *, max_retries: int, backoff_base: float, backoff_max: float) -> requests.Response:
+def request_with_retries(make_request, get_headers, refresh_on_401, *, max_retries: int, backoff_base: float, backoff_max: float, deadline=None, on_retry=None) -> requests.Response:
     attempt = 1
     did_refresh = False
     while True:
@@ -45,15 +67,18 @@ def request_with_retries(make_request, get_headers, refresh_on_401, *, max_retri
             resp = make_request(headers)
         except requests.RequestException as e:
             logger.info("event=retry.network_error attempt=%s error=%s", attempt, type(e).__name__)
-            if attempt >= max_retries:
+            if attempt >= max_retries or not sleep_backoff(attempt, None, backoff_base, backoff_max, deadline):
                 raise
-            _sleep_backoff(attempt, None, backoff_base, backoff_max)
+            if on_retry:
+                on_retry("network")
             attempt += 1
             continue
         if resp.status_code == 401:
             logger.info("event=retry.auth_401 attempt=%s did_refresh=%s", attempt, did_refresh)
             if did_refresh:
                 return resp
+            if on_retry:
+                on_retry("auth_401")
             refresh_on_401()
             did_refresh = True
             headers = get_headers()
@@ -64,8 +89,51 @@ def request_with_retries(make_request, get_headers, refresh_on_401, *, max_retri
             logger.info("event=retry.http attempt=%s status=%s", attempt, resp.status_code)
             if attempt >= max_retries:
                 return resp
-            retry_after = resp.headers.get("Retry-After") if isinstance(resp.headers, dict) else None
-            _sleep_backoff(attempt, retry_after, backoff_base, backoff_max)
+            retry_after = resp.headers.get("Retry-After") if hasattr(resp.headers, "get") else None
+            if not sleep_backoff(attempt, retry_after, backoff_base, backoff_max, deadline):
+                return resp
+            if on_retry:
+                on_retry("429" if resp.status_code == 429 else "5xx")
+            attempt += 1
+            continue
+        return resp
+
+async def arequest_with_retries(make_request, get_headers, refresh_on_401, *, max_retries: int, backoff_base: float, backoff_max: float, deadline=None, on_retry=None) -> requests.Response:
+    attempt = 1
+    did_refresh = False
+    while True:
+        headers = await get_headers()
+        try:
+            resp = await make_request(headers)
+        except requests.RequestException as e:
+            logger.info("event=retry.network_error attempt=%s error=%s", attempt, type(e).__name__)
+            if attempt >= max_retries or not await async_sleep_backoff(attempt, None, backoff_base, backoff_max, deadline):
+                raise
+            if on_retry:
+                on_retry("network")
+            attempt += 1
+            continue
+        if resp.status_code == 401:
+            logger.info("event=retry.auth_401 attempt=%s did_refresh=%s", attempt, did_refresh)
+            if did_refresh:
+                return resp
+            if on_retry:
+                on_retry("auth_401")
+            await refresh_on_401()
+            did_refresh = True
+            headers = await get_headers()
+            resp = await make_request(headers)
+            if resp.status_code == 401:
+                return resp
+        if resp.status_code == 429 or (500 <= resp.status_code < 600):
+            logger.info("event=retry.http attempt=%s status=%s", attempt, resp.status_code)
+            if attempt >= max_retries:
+                return resp
+            retry_after = resp.headers.get("Retry-After") if hasattr(resp.headers, "get") else None
+            if not await async_sleep_backoff(attempt, retry_after, backoff_base, backoff_max, deadline):
+                return resp
+            if on_retry:
+                on_retry("429" if resp.status_code == 429 else "5xx")
             attempt += 1
             continue
         return resp
@@ -0,0 +1,111 @@
+import datetime as dt
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+ISSUE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "issueTypeId",
+    "issueSubtypeId",
+    "dueDate",
+    "startDate",
+    "updatedAt",
+    "deletedAt",
+    "commentCount",
+    "placements",
+    "linkedDocuments",
+)
+
+PARAMS = ("status", "issue_type", "due_from", "due_to", "start_from", "start_to", "updated_from", "updated_to")
+
+def _split(value) -> tuple[str, ...]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    return tuple(p.strip() for v in value for p in str(v).split(",") if p.strip())
+
+def _date(name: str, value: Optional[str]) -> str:
+    if not value:
+        return ""
+    try:
+        return dt.date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD form, got {value!r}")
+
+def _timestamp(name: str, value: Optional[str]) -> str:
+    if not value:
+        return ""
+    try:
+        dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 date or timestamp, got {value!r}")
+    return value
+
+def _range(start: str, end: str) -> str:
+    return f"{start}..{end}" if start or end else ""
+
+def _within(value: Optional[str], start: str, end: str) -> bool:
+    if not start and not end:
+        return True
+    if not value:
+        return False
+    return (not start or value[:len(start)] >= start) and (not end or value[:len(end)] <= end)
+
+@dataclass(frozen=True)
+class IssueQuery:
+    status: tuple[str, ...] = ()
+    issue_type: tuple[str, ...] = ()
+    due_from: str = ""
+    due_to: str = ""
+    start_from: str = ""
+    start_to: str = ""
+    updated_from: str = ""
+    updated_to: str = ""
+
+    @classmethod
+    def from_mapping(cls, data: Mapping) -> "IssueQuery":
+        getlist = getattr(data, "getlist", None)
+        return cls(
+            status=_split(getlist("status") if getlist else data.get("status")),
+            issue_type=_split(getlist("issue_type") if getlist else data.get("issue_type")),
+            due_from=_date("due_from", data.get("due_from")),
+            due_to=_date("due_to", data.get("due_to")),
+            start_from=_date("start_from", data.get("start_from")),
+            start_to=_date("start_to", data.get("start_to")),
+            updated_from=_timestamp("updated_from", data.get("updated_from")),
+            updated_to=_timestamp("updated_to", data.get("updated_to")),
+        )
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, name) for name in PARAMS)
+
+    def as_mapping(self) -> dict:
+        out = {name: getattr(self, name) for name in PARAMS}
+        return {k: list(v) if isinstance(v, tuple) else v for k, v in out.items() if v}
+
+    def with_type_ids(self, type_map: Mapping[str, str]) -> "IssueQuery":
+        by_name = {name.lower(): tid for tid, name in type_map.items()}
+        ids = tuple(t if t in type_map else by_name.get(t.lower(), t) for t in self.issue_type)
+        return IssueQuery(**{**self.__dict__, "issue_type": ids})
+
+    def params(self) -> dict[str, str]:
+        out = {
+            "filter[status]": ",".join(self.status),
+            "filter[issueTypeId]": ",".join(self.issue_type),
+            "filter[dueDate]": _range(self.due_from, self.due_to),
+            "filter[startDate]": _range(self.start_from, self.start_to),
+            "filter[updatedAt]": _range(self.updated_from, self.updated_to),
+        }
+        return {k: v for k, v in out.items() if v}
+
+    def matches(self, issue: dict) -> bool:
+        return (
+            (not self.status or issue.get("status") in self.status)
+            and (not self.issue_type or issue.get("issueTypeId") in self.issue_type)
+            and _within(issue.get("dueDate"), self.due_from, self.due_to)
+            and _within(issue.get("startDate"), self.start_from, self.start_to)
+            and _within(issue.get("updatedAt"), self.updated_from, self.updated_to)
+        )
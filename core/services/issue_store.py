@@ -0,0 +1,138 @@
+import logging
+from typing import Iterator, Optional
+from django.db import transaction
+from core.models import StoredIssue, StoredComment, StoredIssueType, IssueSyncState
+from .issues import issue_type_maps
+
+class IssueStore:
+    def __init__(self, issues_project_id: str):
+        self.project_id = issues_project_id
+        self.logger = logging.getLogger("app")
+
+    def watermark(self) -> str:
+        return IssueSyncState.objects.filter(project_id=self.project_id).values_list("watermark", flat=True).first() or ""
+
+    def sync(self, client, full: bool = False) -> dict:
+        since = "" if full else self.watermark()
+        self.logger.info("event=issue_store.sync_start project=%s since=%s full=%s", self.project_id, since or "-", full)
+        types = client.issues.issue_types(self.project_id)
+        changed_issues: list[dict] = []
+        deleted: list[str] = []
+        seen: set[str] = set()
+        watermark = since
+        for page in client.issues.iter_issue_pages(self.project_id, since or None):
+            live = [iss for iss in page if iss.get("id") and not iss.get("deletedAt")]
+            deleted += [iss["id"] for iss in page if iss.get("id") and iss.get("deletedAt")]
+            if not full:
+                known = dict(
+                    StoredIssue.objects.filter(project_id=self.project_id, issue_id__in=[i["id"] for i in live])
+                    .values_list("issue_id", "updated_at")
+                )
+                live = [iss for iss in live if known.get(iss["id"]) != (iss.get("updatedAt") or "")]
+            changed_issues += live
+            seen.update(iss.get("id") for iss in page)
+            for iss in page:
+                watermark = max(watermark, iss.get("updatedAt") or "")
+        if since:
+            for page in client.issues.iter_issue_pages(self.project_id, since, deleted=True):
+                deleted += [iss["id"] for iss in page if iss.get("id")]
+                for iss in page:
+                    watermark = max(watermark, iss.get("updatedAt") or "")
+        comments, failed = self._fetch_comments(client, changed_issues)
+        if failed:
+            floor = min(iss.get("updatedAt") or "" for iss in changed_issues if iss["id"] in failed)
+            watermark = min(watermark, floor) if floor else since
+            changed_issues = [iss for iss in changed_issues if iss["id"] not in failed]
+            self.logger.warning("event=issue_store.comments_failed project=%s count=%s", self.project_id, len(failed))
+        changed = [iss["id"] for iss in changed_issues]
+        with transaction.atomic():
+            self._save_types(types)
+            self._upsert_issues(changed_issues)
+            StoredComment.objects.filter(project_id=self.project_id, issue_id__in=changed).delete()
+            StoredComment.objects.bulk_create(
+                [
+                    StoredComment(
+                        project_id=self.project_id,
+                        issue_id=iid,
+                        comment_id=c.get("id") or "",
+                        created_at=c.get("createdAt") or "",
+                        body=c.get("body") or "",
+                    )
+                    for iid, thread in comments.items()
+                    for c in thread
+                ],
+                batch_size=500,
+            )
+            gone_ids = set(deleted)
+            if full:
+                stored = StoredIssue.objects.filter(project_id=self.project_id).values_list("issue_id", flat=True)
+                gone_ids.update(set(stored) - seen)
+            removed, _ = StoredIssue.objects.filter(project_id=self.project_id, issue_id__in=gone_ids).delete()
+            StoredComment.objects.filter(project_id=self.project_id, issue_id__in=gone_ids).delete()
+            IssueSyncState.objects.update_or_create(project_id=self.project_id, defaults={"watermark": watermark})
+        result = {"changed": len(changed), "removed": removed, "failed": len(failed), "watermark": watermark}
+        self.logger.info(
+            "event=issue_store.sync_done project=%s changed=%s removed=%s failed=%s watermark=%s",
+            self.project_id, result["changed"], result["removed"], result["failed"], watermark or "-",
+        )
+        return result
+
+    def _upsert_issues(self, issues: list[dict]):
+        StoredIssue.objects.bulk_create(
+            [
+                StoredIssue(project_id=self.project_id, issue_id=iss["id"], updated_at=iss.get("updatedAt") or "", data=iss)
+                for iss in issues
+            ],
+            update_conflicts=True,
+            unique_fields=["project_id", "issue_id"],
+            update_fields=["updated_at", "data", "synced_at"],
+            batch_size=500,
+        )
+
+    def _fetch_comments(self, client, issues: list[dict]) -> tuple[dict[str, list[dict]], set[str]]:
+        issue_ids = [iss["id"] for iss in issues if iss.get("commentCount") != 0]
+        if not issue_ids:
+            return {}, set()
+        fetched = client.fetch_comments_many(self.project_id, issue_ids)
+        failed = {iid for iid, thread in fetched.items() if thread is None}
+        return {iid: thread for iid, thread in fetched.items() if thread is not None}, failed
+
+    def _save_types(self, types: list[dict]):
+        rows = []
+        for t in types:
+            if t.get("id"):
+                rows.append(StoredIssueType(project_id=self.project_id, type_id=t["id"], name=t.get("name") or ""))
+            for st in t.get("subtypes") or []:
+                if st.get("id"):
+                    rows.append(
+                        StoredIssueType(project_id=self.project_id, type_id=st["id"], name=st.get("name") or "", parent_type_id=t.get("id") or "")
+                    )
+        StoredIssueType.objects.filter(project_id=self.project_id).delete()
+        StoredIssueType.objects.bulk_create(rows)
+
+    def iter_issues(self, chunk_size: int = 500) -> Iterator[dict]:
+        qs = StoredIssue.objects.filter(project_id=self.project_id).order_by("id").values_list("data", flat=True)
+        return qs.iterator(chunk_size=chunk_size)
+
+    def comments_map(self, issue_ids: Optional[list[str]] = None) -> dict[str, list[dict]]:
+        out: dict[str, list[dict]] = {iid: [] for iid in issue_ids or []}
+        qs = StoredComment.objects.filter(project_id=self.project_id)
+        if issue_ids is not None:
+            qs = qs.filter(issue_id__in=issue_ids)
+        for iid, cid, created, body in qs.values_list("issue_id", "comment_id", "created_at", "body"):
+            out.setdefault(iid, []).append({"id": cid, "createdAt": created, "body": body})
+        return out
+
+    def type_maps(self) -> tuple[dict, dict]:
+        types: dict[str, dict] = {}
+        subtypes: list[tuple[str, dict]] = []
+        for type_id, name, parent in StoredIssueType.objects.filter(project_id=self.project_id).values_list(
+            "type_id", "name", "parent_type_id"
+        ):
+            if parent:
+                subtypes.append((parent, {"id": type_id, "name": name}))
+            else:
+                types[type_id] = {"id": type_id, "name": name, "subtypes": []}
+        for parent, st in subtypes:
+            types.setdefault(parent, {"id": parent, "subtypes": []})["subtypes"].append(st)
+        return issue_type_maps(list(types.values()))
@@ -1,61 +1,160 @@
 import logging
-from .auth import AuthSession
+import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional
+import requests
+from django.conf import settings
+from .auth import AuthSession, AuthExpired
+from .http_retry import sleep_backoff
+from .resilience import CircuitOpen, DeadlineExceeded
+from .issue_query import IssueQuery, ISSUE_FIELDS
+
+def issue_type_maps(types: list[dict]) -> tuple[dict, dict]:
+    type_map: dict[str, str] = {}
+    subtype_map: dict[str, str] = {}
+    for t in types:
+        tid = t.get("id")
+        tname = t.get("name")
+        if tid and tname:
+            type_map[tid] = tname
+        for st in (t.get("subtypes") or []):
+            sid = st.get("id")
+            sname = st.get("name")
+            if sid and sname:
+                subtype_map[sid] = sname
+    return type_map, subtype_map
 
 class IssuesService:
     def __init__(self, auth: AuthSession):
         self.auth = auth
         self.base = self.auth.base
+        self.page_concurrency = int(getattr(settings, "FORGE_ISSUES_PAGE_CONCURRENCY", 4))
+        self.page_retries = int(getattr(settings, "FORGE_ISSUES_PAGE_RETRIES", 2))
+        fields = getattr(settings, "FORGE_ISSUES_FIELDS", None)
+        self.fields = tuple(ISSUE_FIELDS if fields is None else fields)
         self.logger = logging.getLogger("app")
 
-    def list_issues(self, issues_project_id: str) -> list[dict]:
-        out: list[dict] = []
-        limit = 100
-        offset = 0
-        while True:
-            url = f"{self.base}/construction/issues/v1/projects/{issues_project_id}/issues?limit={limit}&offset={offset}"
+    def _issues_url(self, issues_project_id: str, limit: int, offset: int, filters: dict) -> str:
+        query = urllib.parse.urlencode({"limit": limit, "offset": offset, **filters}, safe="[]:.,")
+        return f"{self.base}/construction/issues/v1/projects/{issues_project_id}/issues?{query}"
+
+    def _issue_filters(self, updated_since: Optional[str], query: Optional[IssueQuery] = None, deleted: bool = False) -> dict:
+        filters = query.params() if query else {}
+        if updated_since:
+            filters["filter[updatedAt]"] = f"{updated_since}.."
+        if deleted:
+            filters["filter[deleted]"] = "true"
+        if self.fields:
+            filters["fields"] = ",".join(self.fields)
+        return filters
+
+    def _fetch_issue_page(self, issues_project_id: str, limit: int, offset: int, filters: Optional[dict] = None) -> dict:
+        url = self._issues_url(issues_project_id, limit, offset, filters or {})
+        for attempt in range(self.page_retries + 1):
             self.logger.info("event=issues.page_fetch url=%s limit=%s offset=%s", url, limit, offset)
-            r = self.auth.get(url, timeout=30)
-            if r.status_code != 200:
-                self.logger.warning("event=issues.page_fetch result=fail status=%s", r.status_code)
-                raise RuntimeError(f"Failed to list issues: {r.text}")
-            j = r.json()
-            batch = j.get("results", [])
-            out.extend(batch)
+            try:
+                r = self.auth.get(url, timeout=30)
+                if r.status_code != 200:
+                    self.logger.warning("event=issues.page_fetch result=fail status=%s", r.status_code)
+                    raise RuntimeError(f"Failed to list issues: {r.text}")
+                j = r.json()
+            except (AuthExpired, CircuitOpen, DeadlineExceeded):
+                raise
+            except (RuntimeError, ValueError, requests.RequestException) as e:
+                if attempt >= self.page_retries:
+                    raise
+                self.logger.warning("event=issues.page_retry offset=%s attempt=%s error=%s", offset, attempt + 1, e)
+                if not sleep_backoff(attempt + 1, None, self.auth.backoff_base, self.auth.backoff_max, self.auth.deadline):
+                    raise
+                continue
             pag = j.get("pagination") or {}
-            total = int(pag.get("totalResults", len(out)))
-            self.logger.info("event=issues.page_fetch result=ok got=%s total=%s", len(batch), total)
-            offset += limit
-            if offset >= total or not batch:
-                break
+            self.logger.info(
+                "event=issues.page_fetch result=ok got=%s total=%s", len(j.get("results", [])), pag.get("totalResults")
+            )
+            return j
+
+    def iter_issue_pages(
+        self,
+        issues_project_id: str,
+        updated_since: Optional[str] = None,
+        query: Optional[IssueQuery] = None,
+        deleted: bool = False,
+    ) -> Iterator[list[dict]]:
+        limit = 100
+        filters = self._issue_filters(updated_since, query, deleted)
+        first = self._fetch_issue_page(issues_project_id, limit, 0, filters)
+        batch = first.get("results", [])
+        if not batch:
+            return
+        yield batch
+        total = int((first.get("pagination") or {}).get("totalResults", len(batch)))
+        offsets = iter(range(limit, total, limit))
+        workers = max(1, self.page_concurrency)
+        ex = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="forge-issues")
+        try:
+            window = deque(ex.submit(self._fetch_issue_page, issues_project_id, limit, o, filters) for o in islice(offsets, workers))
+            while window:
+                page = window.popleft().result()
+                nxt = next(offsets, None)
+                if nxt is not None:
+                    window.append(ex.submit(self._fetch_issue_page, issues_project_id, limit, nxt, filters))
+                batch = page.get("results", [])
+                if batch:
+                    yield batch
+        finally:
+            ex.shutdown(wait=True, cancel_futures=True)
+
+    def iter_issues(
+        self, issues_project_id: str, updated_since: Optional[str] = None, query: Optional[IssueQuery] = None
+    ) -> Iterator[dict]:
+        for page in self.iter_issue_pages(issues_project_id, updated_since, query):
+            yield from page
+
+    def list_issues(
+        self, issues_project_id: str, updated_since: Optional[str] = None, query: Optional[IssueQuery] = None
+    ) -> list[dict]:
+        out = list(self.iter_issues(issues_project_id, updated_since, query))
         self.logger.info("event=issues.list total=%s", len(out))
         return out
 
-    def issue_types_map(self, issues_project_id: str) -> tuple[dict, dict]:
+    def issue_types(self, issues_project_id: str) -> list[dict]:
         url = f"{self.base}/construction/issues/v1/projects/{issues_project_id}/issue-types?include=subtypes"
         self.logger.info("event=issues.types_fetch url=%s", url)
         r = self.auth.get(url, timeout=30)
         if r.status_code != 200:
             self.logger.warning("event=issues.types_fetch result=fail status=%s", r.status_code)
             raise RuntimeError(f"Failed to get issue types: {r.text}")
-        j = r.json()
-        type_map: dict[str, str] = {}
-        subtype_map: dict[str, str] = {}
-        for t in j.get("results", []):
-            tid = t.get("id")
-            tname = t.get("name")
-            if tid and tname:
-                type_map[tid] = tname
-            for st in (t.get("subtypes") or []):
-                sid = st.get("id")
-                sname = st.get("name")
-                if sid and sname:
-                    subtype_map[sid] = sname
+        return r.json().get("results", [])
+
+    def issue_types_map(self, issues_project_id: str) -> tuple[dict, dict]:
+        type_map, subtype_map = issue_type_maps(self.issue_types(issues_project_id))
         self.logger.info("event=issues.types_fetch result=ok types=%s subtypes=%s", len(type_map), len(subtype_map))
         return type_map, subtype_map
 
+    def _comments_url(self, issues_project_id: str, issue_id: str) -> str:
+        return f"{self.base}/construction/issues/v1/projects/{issues_project_id}/issues/{issue_id}/comments"
+
+    def _comments_page_url(self, issues_project_id: str, issue_id: str, limit: int, offset: int) -> str:
+        return f"{self._comments_url(issues_project_id, issue_id)}?limit={limit}&offset={offset}"
+
+    def _next_comments_offset(self, payload: dict, limit: int, offset: int) -> Optional[int]:
+        got = len(payload.get("results", []))
+        total = int((payload.get("pagination") or {}).get("totalResults", offset + got))
+        nxt = offset + limit
+        return nxt if got and nxt < total else None
+
     def get_comments(self, issues_project_id: str, issue_id: str) -> list[dict]:
-        url = f"{self.base}/construction/issues/v1/projects/{issues_project_id}/issues/{issue_id}/comments"
-        r = self.auth.get(url, timeout=30)
-        if r.status_code != 200:
-            return []
-        return r.json().get("results", [])
+        out: list[dict] = []
+        limit = 100
+        offset: Optional[int] = 0
+        while offset is not None:
+            r = self.auth.get(self._comments_page_url(issues_project_id, issue_id, limit, offset), timeout=30)
+            if r.status_code != 200:
+                self.logger.warning("event=issues.comments_fetch result=fail issue=%s status=%s", issue_id, r.status_code)
+                return []
+            j = r.json()
+            out.extend(j.get("results", []))
+            offset = self._next_comments_offset(j, limit, offset)
+        return out
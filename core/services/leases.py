@@ -0,0 +1,70 @@
+import uuid
+import threading
+import logging
+import datetime as dt
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from core.models import Lock
+
+logger = logging.getLogger("app")
+
+def acquire(name: str, ttl: float, owner: str | None = None) -> str | None:
+    owner = owner or uuid.uuid4().hex
+    now = timezone.now()
+    until = now + dt.timedelta(seconds=ttl)
+    taken = Lock.objects.filter(Q(expires_at__lt=now) | Q(expires_at__isnull=True), name=name).update(owner=owner, expires_at=until, acquired_at=now)
+    if taken:
+        logger.info("event=lease.acquire name=%s result=taken_over", name)
+        return owner
+    try:
+        with transaction.atomic():
+            Lock.objects.create(name=name, owner=owner, expires_at=until)
+    except IntegrityError:
+        return None
+    logger.info("event=lease.acquire name=%s result=ok", name)
+    return owner
+
+def renew(name: str, owner: str, ttl: float) -> bool:
+    until = timezone.now() + dt.timedelta(seconds=ttl)
+    return Lock.objects.filter(name=name, owner=owner).update(expires_at=until) == 1
+
+def release(name: str, owner: str):
+    Lock.objects.filter(name=name, owner=owner).delete()
+    logger.info("event=lease.release name=%s", name)
+
+def is_held(name: str) -> bool:
+    return Lock.objects.filter(name=name, expires_at__gte=timezone.now()).exists()
+
+class Heartbeat:
+    def __init__(self, name: str, owner: str, ttl: float, interval: float | None = None):
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.interval = interval if interval is not None else max(ttl / 3, 0.05)
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread = threading.Thread(target=self._beat, name=f"lease-heartbeat:{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not renew(self.name, self.owner, self.ttl):
+                        logger.warning("event=lease.lost name=%s", self.name)
+                        self.lost.set()
+                        return
+                except Exception as e:
+                    logger.warning("event=lease.renew_error name=%s error=%s", self.name, e)
+        finally:
+            connection.close()
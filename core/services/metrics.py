@@ -0,0 +1,131 @@
+import re
+import threading
+import urllib.parse
+from collections import defaultdict
+
+ID_PARENTS = {"projects", "items", "folders", "hubs", "issues", "buckets", "objects", "versions"}
+_VERSION = re.compile(r"^v\d+$")
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def endpoint_template(url: str) -> str:
+    path = urllib.parse.urlsplit(url).path
+    out = []
+    prev = ""
+    for seg in path.strip("/").split("/"):
+        out.append("{id}" if prev in ID_PARENTS and not _VERSION.match(seg) else seg)
+        prev = seg
+    return "/" + "/".join(out)
+
+class _Endpoint:
+    def __init__(self):
+        self.statuses: dict[str, int] = defaultdict(int)
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.bytes = 0
+        self.retries: dict[str, int] = defaultdict(int)
+        self.throttled = 0
+
+class HttpMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints: dict[tuple[str, str], _Endpoint] = {}
+
+    def _get(self, method: str, url: str) -> _Endpoint:
+        key = (method, endpoint_template(url))
+        ep = self.endpoints.get(key)
+        if ep is None:
+            ep = self.endpoints[key] = _Endpoint()
+        return ep
+
+    def record(self, method: str, url: str, status: int | None, elapsed: float, nbytes: int = 0):
+        with self.lock:
+            ep = self._get(method, url)
+            ep.statuses[str(status) if status is not None else "error"] += 1
+            ep.count += 1
+            ep.latency_sum += elapsed
+            ep.bytes += nbytes
+            if status == 429:
+                ep.throttled += 1
+            for i, le in enumerate(LATENCY_BUCKETS):
+                if elapsed <= le:
+                    ep.buckets[i] += 1
+
+    def record_retry(self, method: str, url: str, reason: str):
+        with self.lock:
+            self._get(method, url).retries[reason] += 1
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+    def snapshot(self) -> list[dict]:
+        with self.lock:
+            out = []
+            for (method, endpoint), ep in sorted(self.endpoints.items()):
+                out.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": ep.count,
+                    "statuses": dict(ep.statuses),
+                    "buckets": list(ep.buckets),
+                    "latency_sum": ep.latency_sum,
+                    "bytes": ep.bytes,
+                    "retries": dict(ep.retries),
+                    "throttled": ep.throttled,
+                })
+            return out
+
+    def render_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines = [
+            "# HELP forge_http_requests_total Forge API responses by endpoint template and status.",
+            "# TYPE forge_http_requests_total counter",
+        ]
+        for s in snap:
+            for status, n in sorted(s["statuses"].items()):
+                lines.append(f'forge_http_requests_total{{method="{s["method"]}",endpoint="{s["endpoint"]}",status="{status}"}} {n}')
+        lines += [
+            "# HELP forge_http_request_duration_seconds Forge API call latency.",
+            "# TYPE forge_http_request_duration_seconds histogram",
+        ]
+        for s in snap:
+            labels = f'method="{s["method"]}",endpoint="{s["endpoint"]}"'
+            for le, n in zip(LATENCY_BUCKETS, s["buckets"]):
+                lines.append(f'forge_http_request_duration_seconds_bucket{{{labels},le="{le}"}} {n}')
+            lines.append(f'forge_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s["count"]}')
+            lines.append(f'forge_http_request_duration_seconds_sum{{{labels}}} {round(s["latency_sum"], 6)}')
+            lines.append(f'forge_http_request_duration_seconds_count{{{labels}}} {s["count"]}')
+        lines += [
+            "# HELP forge_http_response_bytes_total Response body bytes received from Forge.",
+            "# TYPE forge_http_response_bytes_total counter",
+        ]
+        for s in snap:
+            lines.append(f'forge_http_response_bytes_total{{method="{s["method"]}",endpoint="{s["endpoint"]}"}} {s["bytes"]}')
+        lines += [
+            "# HELP forge_http_retries_total Retries issued by the retry layer.",
+            "# TYPE forge_http_retries_total counter",
+        ]
+        for s in snap:
+            for reason, n in sorted(s["retries"].items()):
+                lines.append(f'forge_http_retries_total{{method="{s["method"]}",endpoint="{s["endpoint"]}",reason="{reason}"}} {n}')
+        lines += [
+            "# HELP forge_http_throttled_total 429 responses received from Forge.",
+            "# TYPE forge_http_throttled_total counter",
+        ]
+        for s in snap:
+            lines.append(f'forge_http_throttled_total{{method="{s["method"]}",endpoint="{s["endpoint"]}"}} {s["throttled"]}')
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self) -> list[str]:
+        snap = sorted(self.snapshot(), key=lambda s: s["count"], reverse=True)
+        out = []
+        for s in snap:
+            avg_ms = round(1000 * s["latency_sum"] / s["count"], 1) if s["count"] else 0.0
+            out.append(
+                f"{s['method']} {s['endpoint']}: {s['count']} calls, avg {avg_ms}ms, "
+                f"{sum(s['retries'].values())} retries, {s['throttled']} throttled, {s['bytes']} bytes"
+            )
+        return out
+
+http_metrics = HttpMetrics()
@@ -29,3 +29,11 @@ class ProjectsService:
                 return pid
         self.logger.info("event=projects.match result=not_found name=%s", project_name)
         raise RuntimeError(f"Project '{project_name}' not found")
+
+    def get_top_folders(self, dm_project_id: str) -> list[dict]:
+        url = f"{self.base}/project/v1/hubs/{self._hub_id()}/projects/{dm_project_id}/topFolders"
+        self.logger.info("event=projects.top_folders project=%s", dm_project_id)
+        r = self.auth.get(url, timeout=30)
+        if r.status_code != 200:
+            raise RuntimeError(f"Failed to list top folders: {r.text}")
+        return r.json().get("data", [])
@@ -0,0 +1,162 @@
+import time
+import threading
+import logging
+import urllib.parse
+from django.conf import settings
+from .http_retry import parse_retry_after
+
+logger = logging.getLogger("app")
+
+FAMILIES = (
+    ("data/v1", "/data/v1/"),
+    ("issues/v1", "/construction/issues/v1/"),
+    ("project/v1", "/project/v1/"),
+)
+DEFAULT_FAMILY = "other"
+
+def endpoint_family(url: str) -> str:
+    path = urllib.parse.urlsplit(url).path
+    for name, marker in FAMILIES:
+        if marker in path:
+            return name
+    return DEFAULT_FAMILY
+
+class AdaptiveTokenBucket:
+    def __init__(self, name: str, rate: float, *, min_rate: float, decrease_factor: float, increase_step: float, increase_every: int,
+                 decrease_window: float):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.increase_every = increase_every
+        self.decrease_window = decrease_window
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, deadline=None) -> float:
+        sleep = deadline.sleep if deadline is not None else time.sleep
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    self.waited += waited
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            sleep(delay)
+            waited += delay
+
+    def on_throttle(self, retry_after: float | None):
+        with self.lock:
+            now = time.monotonic()
+            self.throttled += 1
+            self.successes = 0
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            if now - self.last_decrease < self.decrease_window:
+                return
+            self.last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        logger.info("event=ratelimit.decrease family=%s rate=%s retry_after=%s", self.name, round(self.rate, 3), retry_after)
+
+    def on_success(self):
+        with self.lock:
+            if self.rate >= self.max_rate:
+                return
+            self.successes += 1
+            if self.successes < self.increase_every:
+                return
+            self.successes = 0
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited, 3),
+            }
+
+class RateLimiter:
+    def __init__(self, rates: dict[str, float] | None = None, *, enabled: bool = True, min_rate: float = 0.5,
+                 decrease_factor: float = 0.5, increase_step: float = 0.5, increase_every: int = 20,
+                 decrease_window: float = 1.0):
+        self.enabled = enabled
+        merged = dict(getattr(settings, "FORGE_RATE_LIMITS", {}))
+        merged.update(rates or {})
+        self.buckets = {
+            name: AdaptiveTokenBucket(
+                name,
+                float(rate),
+                min_rate=min_rate,
+                decrease_factor=decrease_factor,
+                increase_step=increase_step,
+                increase_every=increase_every,
+                decrease_window=decrease_window,
+            )
+            for name, rate in merged.items()
+        }
+
+    def bucket(self, url: str) -> AdaptiveTokenBucket:
+        return self.buckets.get(endpoint_family(url)) or self.buckets[DEFAULT_FAMILY]
+
+    def acquire(self, url: str, deadline=None) -> float:
+        if not self.enabled:
+            return 0.0
+        return self.bucket(url).acquire(deadline)
+
+    def observe(self, url: str, status_code: int, retry_after_header: str | None = None):
+        if not self.enabled:
+            return
+        b = self.bucket(url)
+        if status_code == 429:
+            b.on_throttle(parse_retry_after(retry_after_header) if retry_after_header else None)
+        elif retry_after_header and status_code >= 500:
+            b.on_throttle(parse_retry_after(retry_after_header))
+        elif status_code < 400:
+            b.on_success()
+
+    def stats(self) -> dict[str, dict]:
+        return {name: b.stats() for name, b in self.buckets.items()}
+
+_lock = threading.Lock()
+_limiter: RateLimiter | None = None
+
+def get_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _lock:
+            if _limiter is None:
+                _limiter = RateLimiter(
+                    enabled=bool(getattr(settings, "FORGE_RATE_LIMIT_ENABLED", True)),
+                    min_rate=float(getattr(settings, "FORGE_RATE_LIMIT_MIN_RATE", 0.5)),
+                    decrease_window=float(getattr(settings, "FORGE_RATE_LIMIT_DECREASE_WINDOW", 1.0)),
+                )
+    return _limiter
+
+def reset_limiter():
+    global _limiter
+    with _lock:
+        _limiter = None
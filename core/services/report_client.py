@@ -0,0 +1,19 @@
+from typing import Iterable, Iterator, List, Optional, Protocol
+from core.dto import Document
+from .issue_query import IssueQuery
+from .issues import IssuesService
+
+class ReportClient(Protocol):
+    issues: IssuesService
+
+    def get_project_id_by_name(self, project_name: str) -> str: ...
+
+    def iter_issues(self, issues_project_id: str, query: Optional[IssueQuery] = None) -> Iterator[dict]: ...
+
+    def get_item_infos(self, dm_project_id: str, urns: Iterable[str]) -> dict[str, Optional[Document]]: ...
+
+    def crawl_documents(self, dm_project_id: str) -> dict[str, Document]: ...
+
+    def get_comment_threads(self, issues_project_id: str, issues: List[dict]) -> dict[str, List[dict]]: ...
+
+    def fetch_comments_many(self, issues_project_id: str, issue_ids: Iterable[str]) -> dict[str, Optional[List[dict]]]: ...
@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Optional
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from core.models import ReportJob
+from . import leases
+from .acc_client import ACCClient
+from .aggregate import IssueAggregator
+from .issue_query import IssueQuery
+from .csv_export import tee_csv_atomic
+from .resilience import run_deadline
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobLeaseLost(RuntimeError):
+    pass
+
+def report_params(
+    query: IssueQuery, resolver: Optional[str] = None, source: Optional[str] = None, full_sync: bool = False
+) -> dict:
+    params = {
+        "query": query.as_mapping(),
+        "resolver": resolver or getattr(settings, "REPORT_DOC_RESOLVER", "lookup"),
+        "source": source or getattr(settings, "REPORT_ISSUE_SOURCE", "api"),
+    }
+    if full_sync:
+        params["full_sync"] = True
+    return params
+
+def report_key(params: dict) -> str:
+    scope = {"project": settings.TARGET_PROJECT_NAME, **params}
+    return hashlib.sha256(json.dumps(scope, sort_keys=True).encode("utf-8")).hexdigest()
+
+def key_lease_name(key: str) -> str:
+    return f"report:{key}"
+
+def job_status(job: ReportJob) -> dict:
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "progress": {
+            "issues_fetched": job.issues_fetched,
+            "documents_resolved": job.documents_resolved,
+            "rows_built": job.rows_built,
+        },
+        "error": job.error or None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+class ReportJobRunner:
+    def __init__(self, workers: Optional[int] = None, lease_ttl: Optional[float] = None):
+        self.workers = int(getattr(settings, "REPORT_JOB_WORKERS", 2) if workers is None else workers)
+        self.lease_ttl = float(getattr(settings, "REPORT_JOB_LEASE_TTL", 120) if lease_ttl is None else lease_ttl)
+        self.poll_interval = float(getattr(settings, "REPORT_JOB_POLL_INTERVAL", 0.5))
+        self.max_age = float(getattr(settings, "REPORT_MAX_AGE", 300))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report-job") if self.workers > 0 else None
+        self.logger = logging.getLogger("app")
+
+    def _jobs(self, key: str, status: str):
+        return ReportJob.objects.filter(key=key, status=status).order_by("created_at")
+
+    def latest(self, key: str) -> Optional[ReportJob]:
+        job = self._jobs(key, DONE).exclude(path="").order_by("-finished_at").first()
+        if job is None or not os.path.exists(job.path):
+            return None
+        return job
+
+    def is_stale(self, job: ReportJob) -> bool:
+        return (timezone.now() - job.finished_at).total_seconds() > self.max_age
+
+    def _prune(self, job: ReportJob):
+        superseded = self._jobs(job.key, DONE).filter(finished_at__lt=job.finished_at).exclude(path="").exclude(path=job.path)
+        for old in superseded:
+            try:
+                os.unlink(old.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning("event=report_job.prune_error job=%s error=%s", old.id, e)
+                continue
+            ReportJob.objects.filter(pk=old.pk).update(path="")
+            self.logger.info("event=report_job.pruned job=%s superseded_by=%s", old.id, job.id)
+
+    def submit(self, params: dict) -> ReportJob:
+        key = report_key(params)
+        job = self._jobs(key, RUNNING).first() or self._jobs(key, QUEUED).first()
+        if job is not None:
+            self.logger.info("event=report_job.coalesced job=%s status=%s", job.id, job.status)
+            if job.status == QUEUED or self.is_orphaned(job):
+                self.kick()
+            return job
+        job = ReportJob.objects.create(params=params, key=key)
+        self.logger.info("event=report_job.queued job=%s", job.id)
+        self.kick()
+        return job
+
+    def kick(self) -> Optional[Future]:
+        if self._pool is None:
+            return None
+        return self._pool.submit(self._drain_in_thread)
+
+    def is_orphaned(self, job: ReportJob) -> bool:
+        return job.status == RUNNING and not leases.is_held(key_lease_name(job.key))
+
+    def _drain_in_thread(self) -> int:
+        close_old_connections()
+        try:
+            return self.drain()
+        except Exception as e:
+            self.logger.error("event=report_job.worker_error error=%s", e)
+            return 0
+        finally:
+            connection.close()
+
+    def drain(self) -> int:
+        ran = 0
+        while (claimed := self.claim()) is not None:
+            self.run(*claimed)
+            ran += 1
+        return ran
+
+    def _take(self, job: ReportJob) -> Optional[str]:
+        owner = leases.acquire(key_lease_name(job.key), self.lease_ttl)
+        if owner is None:
+            return None
+        taken = ReportJob.objects.filter(pk=job.pk, status__in=[QUEUED, RUNNING]).update(
+            status=RUNNING, started_at=timezone.now(), issues_fetched=0, documents_resolved=0, rows_built=0
+        )
+        if not taken:
+            leases.release(key_lease_name(job.key), owner)
+            return None
+        if job.status == RUNNING:
+            self.logger.warning("event=report_job.reclaimed job=%s", job.id)
+        job.refresh_from_db()
+        return owner
+
+    def _adopt_finished(self, job: ReportJob) -> bool:
+        done = self._jobs(job.key, DONE).filter(finished_at__gte=job.created_at).order_by("-finished_at").first()
+        if done is None:
+            return False
+        ReportJob.objects.filter(pk=job.pk, status=QUEUED).update(
+            status=DONE, path=done.path, sha256=done.sha256, rows_built=done.rows_built, finished_at=done.finished_at
+        )
+        self.logger.info("event=report_job.coalesced job=%s into=%s", job.id, done.id)
+        return True
+
+    def claim(self) -> Optional[tuple[ReportJob, str]]:
+        for job in ReportJob.objects.filter(status__in=[QUEUED, RUNNING]).order_by("created_at"):
+            if job.status == RUNNING and not self.is_orphaned(job):
+                continue
+            if job.status == QUEUED and self._adopt_finished(job):
+                continue
+            owner = self._take(job)
+            if owner is not None:
+                return job, owner
+        return None
+
+    def lead_or_join(self, params: dict) -> tuple[ReportJob, Optional[str]]:
+        key = report_key(params)
+        while True:
+            job = self._jobs(key, RUNNING).first()
+            if job is not None and not self.is_orphaned(job):
+                self.logger.info("event=report_job.coalesced job=%s status=running", job.id)
+                return job, None
+            job = job or self._jobs(key, QUEUED).first()
+            if job is not None:
+                if job.status == QUEUED and self._adopt_finished(job):
+                    job.refresh_from_db()
+                    return job, None
+                owner = self._take(job)
+            else:
+                owner = leases.acquire(key_lease_name(key), self.lease_ttl)
+                if owner is not None:
+                    job = ReportJob.objects.create(params=params, key=key, status=RUNNING, started_at=timezone.now())
+            if owner is not None:
+                return job, owner
+            time.sleep(self.poll_interval)
+
+    def wait(self, job: ReportJob, timeout: Optional[float] = None) -> ReportJob:
+        until = time.monotonic() + timeout if timeout else None
+        while True:
+            job.refresh_from_db()
+            if job.status in (DONE, FAILED) or self.is_orphaned(job):
+                return job
+            if until is not None and time.monotonic() >= until:
+                raise TimeoutError(f"Timed out waiting for report job {job.id}")
+            time.sleep(self.poll_interval)
+
+    def run_or_join(self, params: dict, timeout: Optional[float] = None) -> ReportJob:
+        while True:
+            job, owner = self.lead_or_join(params)
+            if owner is not None:
+                for _ in self.build(job, owner):
+                    pass
+                job.refresh_from_db()
+                return job
+            job = self.wait(job, timeout)
+            if job.status == DONE or (job.status == FAILED and job.error != CANCELLED):
+                return job
+
+    def _output_path(self, job: ReportJob) -> str:
+        out_dir = os.path.join(settings.REPORT_OUTPUT_DIR, "jobs")
+        os.makedirs(out_dir, exist_ok=True)
+        return os.path.join(out_dir, f"acc_issues_{job.id}.csv")
+
+    def build(self, job: ReportJob, owner: str) -> Iterator[bytes]:
+        name = key_lease_name(job.key)
+        self.logger.info("event=report_job.start job=%s", job.id)
+        outcome, error = FAILED, CANCELLED
+        n_rows = n_bytes = 0
+        digest = hashlib.sha256()
+        path = self._output_path(job)
+        with leases.Heartbeat(name, owner, self.lease_ttl) as heartbeat:
+
+            def progress(counts: dict):
+                if heartbeat.lost.is_set():
+                    raise JobLeaseLost(f"Lease for report job {job.id} was taken over")
+                ReportJob.objects.filter(pk=job.pk).update(
+                    issues_fetched=counts["issues"], documents_resolved=counts["documents"], rows_built=counts["rows"]
+                )
+
+            def counted(rows):
+                nonlocal n_rows
+                for row in rows:
+                    n_rows += 1
+                    yield row
+
+            try:
+                params = job.params or {}
+                aggregator = IssueAggregator(
+                    ACCClient(deadline=run_deadline()),
+                    resolver=params.get("resolver"),
+                    source=params.get("source"),
+                    full_sync=bool(params.get("full_sync")),
+                    query=IssueQuery.from_mapping(params.get("query") or {}),
+                    progress=progress,
+                )
+                for chunk in tee_csv_atomic(path, counted(aggregator.iter_rows())):
+                    n_bytes += len(chunk)
+                    digest.update(chunk)
+                    yield chunk
+                outcome, error = DONE, ""
+            except JobLeaseLost:
+                outcome = None
+                self.logger.warning("event=report_job.lease_lost job=%s", job.id)
+                raise
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                raise
+            finally:
+                try:
+                    if outcome == DONE:
+                        self.logger.info("event=report_job.done job=%s rows=%s bytes=%s", job.id, n_rows, n_bytes)
+                        ReportJob.objects.filter(pk=job.pk).update(
+                            status=DONE, path=path, sha256=digest.hexdigest(), rows_built=n_rows, finished_at=timezone.now()
+                        )
+                        job.refresh_from_db()
+                        self._prune(job)
+                    elif outcome == FAILED:
+                        self.logger.error("event=report_job.failed job=%s error=%s", job.id, error)
+                        ReportJob.objects.filter(pk=job.pk).update(status=FAILED, error=error, finished_at=timezone.now())
+                finally:
+                    leases.release(name, owner)
+
+    def run(self, job: ReportJob, owner: str):
+        try:
+            for _ in self.build(job, owner):
+                pass
+        except Exception:
+            pass
+
+_lock = threading.Lock()
+_runner: ReportJobRunner | None = None
+
+def get_report_jobs() -> ReportJobRunner:
+    global _runner
+    if _runner is None:
+        with _lock:
+            if _runner is None:
+                _runner = ReportJobRunner()
+    return _runner
+
+def reset_report_jobs():
+    global _runner
+    with _lock:
+        _runner = None
@@ -0,0 +1,137 @@
+import time
+import threading
+import logging
+from django.conf import settings
+from .rate_limit import endpoint_family
+
+logger = logging.getLogger("app")
+
+class CircuitOpen(RuntimeError):
+    pass
+
+class DeadlineExceeded(RuntimeError):
+    pass
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    def check(self):
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(f"Report run exceeded its {self.seconds:g}s deadline")
+
+    def timeout(self, default: float) -> float:
+        self.check()
+        return min(default, self.remaining())
+
+    def sleep(self, delay: float):
+        if delay >= self.remaining():
+            raise DeadlineExceeded(f"Waiting {delay:.3g}s would exceed the {self.seconds:g}s report deadline")
+        time.sleep(delay)
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before(self):
+        with self.lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self.probing = False
+            if self.state == "half_open" and not self.probing:
+                self.probing = True
+                logger.info("event=circuit.half_open family=%s", self.name)
+                return
+        raise CircuitOpen(f"Circuit open for {self.name} endpoints; Autodesk API appears to be down")
+
+    def release(self):
+        with self.lock:
+            self.probing = False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != "closed":
+                logger.info("event=circuit.closed family=%s", self.name)
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning("event=circuit.open family=%s failures=%s", self.name, self.failures)
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+class CircuitBreakers:
+    def __init__(self, *, failure_threshold: int, reset_timeout: float, enabled: bool = True):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.enabled = enabled
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        family = endpoint_family(url)
+        with self.lock:
+            b = self.breakers.get(family)
+            if b is None:
+                b = CircuitBreaker(family, failure_threshold=self.failure_threshold, reset_timeout=self.reset_timeout)
+                self.breakers[family] = b
+            return b
+
+    def before(self, url: str):
+        if self.enabled:
+            self.for_url(url).before()
+
+    def release(self, url: str):
+        if self.enabled:
+            self.for_url(url).release()
+
+    def observe(self, url: str, status_code: int | None):
+        if not self.enabled:
+            return
+        if status_code is None or status_code >= 500:
+            self.for_url(url).record_failure()
+        else:
+            self.for_url(url).record_success()
+
+_lock = threading.Lock()
+_breakers: CircuitBreakers | None = None
+
+def get_breakers() -> CircuitBreakers:
+    global _breakers
+    if _breakers is None:
+        with _lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers(
+                    failure_threshold=int(getattr(settings, "FORGE_CIRCUIT_FAILURE_THRESHOLD", 5)),
+                    reset_timeout=float(getattr(settings, "FORGE_CIRCUIT_RESET_TIMEOUT", 30.0)),
+                    enabled=bool(getattr(settings, "FORGE_CIRCUIT_ENABLED", True)),
+                )
+    return _breakers
+
+def reset_breakers():
+    global _breakers
+    with _lock:
+        _breakers = None
+
+def run_deadline() -> Deadline | None:
+    seconds = float(getattr(settings, "REPORT_RUN_DEADLINE", 0) or 0)
+    return Deadline(seconds) if seconds > 0 else None
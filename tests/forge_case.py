@@ -0,0 +1,139 @@
+import json
+import time
+import threading
+from urllib.parse import parse_qs, urlsplit
+from django.test import override_settings
+from benchmarks.fake_forge import Dataset
+from core.models import OAuthToken
+from core.services.acc_client import ACCClient
+from core.services.auth import AuthSession, invalidate_token_cache
+from core.services.rate_limit import RateLimiter
+from tests.logging_config import CaseLoggerMixin
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None, content=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps(payload or {}).encode("utf-8") if content is None else content
+        self.text = self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeHttp:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.calls.append((method, url, kwargs))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            resp = self.respond(method, url)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+    def respond(self, method, url):
+        return FakeResponse(200)
+
+    @property
+    def sent_headers(self):
+        return [kwargs.get("headers") or {} for _, _, kwargs in self.calls]
+
+
+class ScriptedHttp(FakeHttp):
+    def __init__(self, responses, delay=0.0):
+        super().__init__(delay)
+        self.responses = list(responses)
+
+    def respond(self, method, url):
+        with self.lock:
+            return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+class RoutedHttp(FakeHttp):
+    def __init__(self, routes, delay=0.0):
+        super().__init__(delay)
+        self.routes = routes
+
+    def respond(self, method, url):
+        path = url.split("?", 1)[0]
+        with self.lock:
+            for suffix, responses in self.routes.items():
+                if path.endswith(suffix):
+                    return responses.pop(0) if len(responses) > 1 else responses[0]
+        return FakeResponse(404)
+
+
+class PagedIssuesHttp(FakeHttp):
+    def __init__(self, total, delay=0.02, fail_once=()):
+        super().__init__(delay)
+        self.total = total
+        self.fail_once = set(fail_once)
+        self.offsets = []
+
+    def respond(self, method, url):
+        q = parse_qs(urlsplit(url).query)
+        limit, offset = int(q["limit"][0]), int(q["offset"][0])
+        with self.lock:
+            self.offsets.append(offset)
+            if offset in self.fail_once:
+                self.fail_once.discard(offset)
+                return FakeResponse(400, {"detail": "flaky"})
+        rows = [{"id": f"i{n}"} for n in range(offset, min(offset + limit, self.total))]
+        return FakeResponse(200, {"pagination": {"limit": limit, "offset": offset, "totalResults": self.total}, "results": rows})
+
+
+def unthrottled_auth(http=None, **kwargs) -> AuthSession:
+    auth = AuthSession(http=http, **kwargs)
+    auth.limiter = RateLimiter({}, enabled=False)
+    return auth
+
+
+def unthrottled_client(http=None, **kwargs) -> ACCClient:
+    client = ACCClient(**kwargs)
+    client.auth.limiter = RateLimiter({}, enabled=False)
+    if http is not None:
+        client.auth.http = http
+    return client
+
+
+class ForgeCaseMixin(CaseLoggerMixin):
+    dataset: dict | None = None
+
+    def setUp(self):
+        super().setUp()
+        invalidate_token_cache()
+        OAuthToken.objects.create(access_token="tok", refresh_token="r", expires_at=int(time.time()) + 3600)
+        if self.dataset is not None:
+            self.ds = Dataset(**self.dataset)
+
+    def tearDown(self):
+        invalidate_token_cache()
+        super().tearDown()
+
+    def forge_settings(self, forge, **extra):
+        return override_settings(**{
+            "FORGE_BASE_URL": forge.base_url,
+            "ACC_ACCOUNT_ID": self.ds.account_id,
+            "TARGET_PROJECT_NAME": self.ds.project_name,
+            **extra,
+        })
+
+    def make_client(self, **kwargs):
+        client = unthrottled_client(**kwargs)
+        client.auth.ensure_token()
+        return client
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from core.services.auth import AuthSession
+from tests.forge_case import FakeResponse, RoutedHttp, unthrottled_client
+from tests.logging_config import CaseLoggerMixin
+
+BASE = "https://developer.api.autodesk.com"
+
+
+@override_settings(FORGE_BASE_URL=BASE, FORGE_RETRY_BACKOFF_BASE=0.01, FORGE_RETRY_BACKOFF_MAX=0.05)
+@patch.object(AuthSession, "ensure_token", return_value="tok")
+class AsyncClientTests(CaseLoggerMixin, TestCase):
+    def test_comments_fan_out_is_bounded(self, _tok):
+        routes = {f"/issues/i{n}/comments": [FakeResponse(200, {"results": [{"body": f"c{n}"}]})] for n in range(12)}
+        http = RoutedHttp(routes, delay=0.02)
+        client = unthrottled_client(http)
+        with self.settings(FORGE_COMMENTS_CONCURRENCY=3):
+            out = client.fetch_comments_many("pid", [f"i{n}" for n in range(12)])
+        self.assertEqual(out["i7"], [{"body": "c7"}])
+        self.assertEqual(len(http.calls), 12)
+        self.assertLessEqual(http.max_in_flight, 3)
+
+    def test_worker_threads_close_their_database_connections(self, _tok):
+        http = RoutedHttp({"/issues/i1/comments": [FakeResponse(200, {"results": []})]})
+        with patch("core.services.aio.connection") as conn:
+            unthrottled_client(http).fetch_comments_many("pid", ["i1"])
+        self.assertEqual(conn.close.call_count, 2)
+
+    def test_retries_429_with_retry_after(self, _tok):
+        routes = {
+            "/issues/i1/comments": [
+                FakeResponse(429, headers={"Retry-After": "0"}),
+                FakeResponse(200, {"results": [{"body": "ok"}]}),
+            ]
+        }
+        http = RoutedHttp(routes)
+        out = unthrottled_client(http).fetch_comments_many("pid", ["i1"])
+        self.assertEqual(out["i1"], [{"body": "ok"}])
+        self.assertEqual(len(http.calls), 2)
+
+    def test_item_infos_resolve_name_path_and_failures(self, _tok):
+        routes = {
+            "/items/urn%3A1/tip": [FakeResponse(200, {"data": {"attributes": {"name": "plan.pdf"}, "links": {"webView": {"href": "https://acc/1"}}}})],
+            "/items/urn%3A1/parent": [FakeResponse(200, {"data": {"id": "f2"}})],
+            "/folders/f2": [FakeResponse(200, {"data": {"attributes": {"displayName": "Plans"}}})],
+            "/folders/f2/parent": [FakeResponse(200, {"data": {"id": "f1"}})],
+            "/folders/f1": [FakeResponse(200, {"data": {"attributes": {"displayName": "Project Files"}}})],
+            "/items/urn%3A2/tip": [FakeResponse(500)],
+        }
+        out = unthrottled_client(RoutedHttp(routes)).get_item_infos("b.pid", ["urn:1", "urn:2"])
+        self.assertEqual(out["urn:1"].path, "Project Files/Plans")
+        self.assertTrue(out["urn:1"].is_pdf)
+        self.assertEqual(out["urn:1"].web_link, "https://acc/1")
+        self.assertIsNone(out["urn:2"])
@@ -0,0 +1,71 @@
+import time
+import threading
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from core.models import OAuthToken
+from core.services.auth import AuthSession, invalidate_token_cache
+from tests.logging_config import CaseLoggerMixin
+
+
+class FakeTokenResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, n):
+        self._n = n
+
+    def json(self):
+        return {"access_token": f"new{self._n}", "refresh_token": f"r{self._n}", "expires_in": 3600}
+
+
+class SlowTokenHttp:
+    def __init__(self):
+        self.posts = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, **kwargs):
+        with self._lock:
+            self.posts += 1
+            n = self.posts
+        time.sleep(0.05)
+        return FakeTokenResponse(n)
+
+
+@override_settings(FORGE_BASE_URL="https://developer.api.autodesk.com", FORGE_TOKEN_PROACTIVE_REFRESH=0)
+class TokenCacheTests(CaseLoggerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        invalidate_token_cache()
+
+    def tearDown(self):
+        invalidate_token_cache()
+        super().tearDown()
+
+    def test_ensure_token_reads_database_once(self):
+        OAuthToken.objects.create(access_token="tok", refresh_token="r", expires_at=int(time.time()) + 3600)
+        with self.assertNumQueries(1):
+            self.assertEqual(AuthSession(http=SlowTokenHttp()).ensure_token(), "tok")
+        with self.assertNumQueries(0):
+            for _ in range(50):
+                self.assertEqual(AuthSession(http=SlowTokenHttp()).ensure_token(), "tok")
+
+    def test_concurrent_expiry_refreshes_once(self):
+        row = OAuthToken(access_token="old", refresh_token="r0", expires_at=int(time.time()) - 10)
+        http = SlowTokenHttp()
+        seen = []
+        with patch.object(AuthSession, "_row", return_value=row), patch.object(OAuthToken, "save"):
+            threads = [threading.Thread(target=lambda: seen.append(AuthSession(http=http).ensure_token())) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(http.posts, 1)
+        self.assertEqual(set(seen), {"new1"})
+
+    def test_invalidate_forces_reload(self):
+        OAuthToken.objects.create(access_token="tok", refresh_token="r", expires_at=int(time.time()) + 3600)
+        self.assertEqual(AuthSession(http=SlowTokenHttp()).ensure_token(), "tok")
+        OAuthToken.objects.all().update(access_token="tok2")
+        self.assertEqual(AuthSession(http=SlowTokenHttp()).ensure_token(), "tok")
+        invalidate_token_cache()
+        self.assertEqual(AuthSession(http=SlowTokenHttp()).ensure_token(), "tok2")
@@ -0,0 +1,62 @@
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from core.models import CommentThread
+from core.services.aggregate import IssueAggregator
+from core.services.comment_cache import get_comment_cache, reset_comment_cache
+from tests.forge_case import ForgeCaseMixin
+
+COMMENTS = "GET /construction/issues/v1/projects/([^/]+)/issues/([^/]+)/comments"
+
+
+class CommentCacheTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=80, documents=10, depth=2, fanout=2, pdf_ratio=1.0, seed=6)
+
+    def setUp(self):
+        super().setUp()
+        reset_comment_cache()
+
+    def tearDown(self):
+        reset_comment_cache()
+        super().tearDown()
+
+    def report(self, forge):
+        with self.forge_settings(forge):
+            return IssueAggregator(self.make_client()).collect_rows()
+
+    def threads_needed(self):
+        return [i for i in self.ds.issues if i["placements"] and i["commentCount"]]
+
+    def test_unchanged_threads_are_served_from_the_cache(self):
+        with FakeForge(self.ds) as forge:
+            first = self.report(forge)
+            needed = len(self.threads_needed())
+            self.assertEqual(forge.counts[COMMENTS], needed)
+            forge.counts.clear()
+            second = self.report(forge)
+            self.assertEqual(forge.counts[COMMENTS], 0)
+        self.assertEqual(first, second)
+        self.assertEqual(get_comment_cache().stats(), {"hits": needed, "misses": needed, "hit_ratio": 0.5})
+
+    def test_changed_issue_is_refetched(self):
+        with FakeForge(self.ds) as forge:
+            self.report(forge)
+            issue = self.threads_needed()[0]
+            self.ds.comments[issue["id"]].append({"id": "late", "body": "Late reply", "createdAt": "2030-01-01T00:00:00Z"})
+            issue["commentCount"] += 1
+            issue["updatedAt"] = "2030-01-01T00:00:00Z"
+            forge.counts.clear()
+            rows = self.report(forge)
+            self.assertEqual(forge.counts[COMMENTS], 1)
+        self.assertTrue(next(r for r in rows if r.issue_id == issue["id"]).issue_comments.endswith("Late reply"))
+
+    def test_failed_fetch_is_not_cached(self):
+        issue = self.threads_needed()[0]
+        saved = self.ds.comments.pop(issue["id"])
+        with FakeForge(self.ds) as forge:
+            self.report(forge)
+            self.assertFalse(CommentThread.objects.filter(issue_id=issue["id"]).exists())
+            self.ds.comments[issue["id"]] = saved
+            forge.counts.clear()
+            rows = self.report(forge)
+            self.assertEqual(forge.counts[COMMENTS], 1)
+        self.assertNotEqual(next(r for r in rows if r.issue_id == issue["id"]).issue_comments, "")
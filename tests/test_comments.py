@@ -0,0 +1,29 @@
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from tests.forge_case import ForgeCaseMixin
+
+COMMENTS = "GET /construction/issues/v1/projects/([^/]+)/issues/([^/]+)/comments"
+
+
+class CommentPaginationTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=3, documents=2, seed=1)
+
+    def setUp(self):
+        super().setUp()
+        self.long = self.ds.issues[0]["id"]
+        self.ds.comments[self.long] = [
+            {"id": f"c{n}", "body": f"Comment {n}", "createdAt": f"2025-01-01T00:{n // 60:02d}:{n % 60:02d}Z"} for n in range(250)
+        ]
+
+    def test_sync_get_comments_follows_pages(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            thread = self.make_client().issues.get_comments(self.ds.issues_project_id, self.long)
+            self.assertEqual(forge.counts[COMMENTS], 3)
+        self.assertEqual(thread, self.ds.comments[self.long])
+
+    def test_async_comments_follow_pages(self):
+        ids = [i["id"] for i in self.ds.issues]
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            out = self.make_client().fetch_comments_many(self.ds.issues_project_id, ids)
+            self.assertEqual(forge.counts[COMMENTS], 3 + len(ids) - 1)
+        self.assertEqual(out, {i: self.ds.comments[i] for i in ids})
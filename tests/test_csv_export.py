@@ -1,5 +1,7 @@
+import csv
+import io
 import unittest
-from core.services.csv_export import rows_to_csv
+from core.services.csv_export import CSV_HEADERS, iter_csv_chunks, rows_to_csv
 from core.dto import IssueRow
 from tests.logging_config import CaseLoggerMixin
 
@@ -27,3 +29,60 @@ class CsvExportTests(CaseLoggerMixin, unittest.TestCase):
         s = content.decode("utf-8")
         self.assertIn("project id,project name,document id,document name,document path,link to the document page the issue located in,issue id,issue type,issue sub type,issue status,issue due date,issue start date,issue title,issue description,issue comments", s)
         self.assertIn("p,n,d1,doc.pdf,Root,http://x,i1,T,S,open,2025-08-20,2025-08-10,Title,Desc,C1", s)
+
+    def test_chunks_are_streamed_and_match_whole_export(self):
+        pulled = []
+
+        def rows():
+            for n in range(200):
+                pulled.append(n)
+                yield {"issue id": f"i{n}", "issue title": "x" * 50}
+
+        chunks = iter_csv_chunks(rows(), chunk_size=1024)
+        first = next(chunks)
+        self.assertTrue(first.startswith(b"project id,"))
+        self.assertEqual(pulled, [])
+        first += next(chunks)
+        self.assertLess(len(pulled), 200)
+        rest = list(chunks)
+        self.assertGreater(len(rest), 5)
+        self.assertEqual(first + b"".join(rest), rows_to_csv({"issue id": f"i{n}", "issue title": "x" * 50} for n in range(200)))
+
+    def test_empty_export_still_has_headers(self):
+        self.assertEqual(list(iter_csv_chunks([])), [rows_to_csv([])])
+        self.assertTrue(rows_to_csv([]).startswith(b"project id,"))
+
+    def test_issue_rows_and_mappings_produce_identical_output(self):
+        row = IssueRow(
+            project_id="p",
+            project_name="Proj, \"Main\"",
+            document_id="d1",
+            document_name="plan – ü.pdf",
+            document_path="Root/A",
+            web_link="http://x?a=1&b=2",
+            issue_id="i1",
+            issue_type="T",
+            issue_sub_type="",
+            issue_status="open",
+            issue_due_date=None,
+            issue_start_date="2025-08-10",
+            issue_title="Line one\nline two",
+            issue_description="  padded  ",
+            issue_comments="a, b",
+        )
+        buf = io.StringIO(newline="")
+        writer = csv.DictWriter(buf, fieldnames=CSV_HEADERS, extrasaction="ignore")
+        writer.writeheader()
+        for _ in range(3):
+            writer.writerow(row.to_csv_row())
+        legacy = buf.getvalue().encode("utf-8")
+        self.assertEqual(rows_to_csv([row] * 3), legacy)
+        self.assertEqual(rows_to_csv([row.to_csv_row(), row, dict(row.to_csv_row(), extra="ignored")]), legacy)
+
+    def test_mappings_missing_columns_get_blanks(self):
+        content = rows_to_csv([{"issue id": "i9"}]).decode("utf-8").splitlines()
+        self.assertEqual(content[1], ",,,,,,i9,,,,,,,,")
+
+    def test_unsupported_rows_are_rejected(self):
+        with self.assertRaises(TypeError):
+            rows_to_csv([("p", "n")])
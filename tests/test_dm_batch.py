@@ -0,0 +1,57 @@
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from core.models import DocumentRecord
+from tests.forge_case import ForgeCaseMixin
+
+COMMANDS = "POST /data/v1/projects/([^/]+)/commands"
+TIP = "GET /data/v1/projects/([^/]+)/items/([^/]+)/tip"
+
+
+class BatchedItemLookupTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=0, documents=120, depth=3, fanout=3, seed=4)
+
+    def setUp(self):
+        super().setUp()
+        self.urns = list(self.ds.items)
+
+    def resolve(self, forge, urns, **overrides):
+        with self.forge_settings(forge, **overrides):
+            return self.make_client().get_item_infos(self.ds.project_id, urns)
+
+    def test_batches_match_per_item_resolution(self):
+        with FakeForge(self.ds) as forge:
+            expected = self.resolve(forge, self.urns, FORGE_DM_BATCH_SIZE=0)
+            self.assertEqual(forge.counts[TIP], len(self.urns))
+            forge.counts.clear()
+            DocumentRecord.objects.all().delete()
+            docs = self.resolve(forge, self.urns, FORGE_DM_BATCH_SIZE=50)
+            self.assertEqual(forge.counts[COMMANDS], 3)
+            self.assertEqual(forge.counts[TIP], 0)
+        self.assertEqual(docs, expected)
+
+    def test_missing_items_and_rejected_batches_fall_back_to_per_item_calls(self):
+        missing = "urn:adsk.wipprod:dm.lineage:gone"
+        with FakeForge(self.ds, commands_limit=10) as forge:
+            docs = self.resolve(forge, self.urns[:30] + [missing], FORGE_DM_BATCH_SIZE=20)
+            self.assertEqual(forge.counts[COMMANDS], 1)
+            self.assertEqual(forge.counts[TIP], 31)
+        self.assertIsNone(docs[missing])
+        self.assertTrue(all(docs[u] for u in self.urns[:30]))
+
+    def test_unlisted_urn_in_a_good_batch_is_looked_up_individually(self):
+        missing = "urn:adsk.wipprod:dm.lineage:gone"
+        with FakeForge(self.ds) as forge:
+            docs = self.resolve(forge, self.urns[:5] + [missing])
+            self.assertEqual(forge.counts[COMMANDS], 1)
+            self.assertEqual(forge.counts[TIP], 1)
+        self.assertIsNone(docs[missing])
+        self.assertEqual(docs[self.urns[0]].path, self.ds.folder_path(self.ds.items[self.urns[0]]["folder"]))
+
+    def test_rejected_batch_endpoint_is_not_called_again_in_the_same_run(self):
+        with FakeForge(self.ds, commands_limit=10) as forge, self.forge_settings(forge, FORGE_DM_BATCH_SIZE=20):
+            client = self.make_client()
+            first = client.get_item_infos(self.ds.project_id, self.urns[:60])
+            second = client.get_item_infos(self.ds.project_id, self.urns[60:])
+            self.assertEqual(forge.counts[COMMANDS], 1)
+            self.assertEqual(forge.counts[TIP], len(self.urns))
+        self.assertTrue(all(first.values()) and all(second.values()))
@@ -0,0 +1,65 @@
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from core.services.aggregate import IssueAggregator
+from core.services.dm_helpers import index_folder_contents
+from tests.forge_case import ForgeCaseMixin
+from tests.logging_config import CaseLoggerMixin
+
+CONTENTS = "GET /data/v1/projects/([^/]+)/folders/([^/]+)/contents"
+TIP = "GET /data/v1/projects/([^/]+)/items/([^/]+)/tip"
+FOLDER = "GET /data/v1/projects/([^/]+)/folders/([^/]+)"
+
+
+class IndexFolderContentsTests(CaseLoggerMixin, TestCase):
+    def test_items_map_to_their_tip_version_and_folders_are_listed(self):
+        contents = {
+            "data": [
+                {"type": "folders", "id": "f1", "attributes": {"displayName": "Sheets"}},
+                {"type": "items", "id": "urn:1", "relationships": {"tip": {"data": {"id": "v:1?version=2"}}}},
+                {"type": "items", "id": "urn:2", "relationships": {"tip": {"data": {"id": "v:2?version=1"}}}},
+            ],
+            "included": [
+                {"type": "versions", "id": "v:1?version=2", "attributes": {"name": "A.pdf", "fileType": "pdf", "versionNumber": 2},
+                 "links": {"webView": {"href": "https://acc/a"}}},
+            ],
+        }
+        docs, folders = index_folder_contents(contents, "Project Files/X")
+        self.assertEqual(folders, [("f1", "Sheets")])
+        self.assertEqual(list(docs), ["urn:1"])
+        self.assertEqual(docs["urn:1"].path, "Project Files/X")
+        self.assertEqual(docs["urn:1"].version, 2)
+        self.assertTrue(docs["urn:1"].is_pdf)
+
+
+class CrawlResolverTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=40, documents=30, depth=4, fanout=2, seed=3)
+
+    def report(self, forge, resolver):
+        with self.forge_settings(forge):
+            return IssueAggregator(self.make_client(), resolver=resolver).collect_rows()
+
+    def test_crawl_indexes_every_item_with_its_path(self):
+        with FakeForge(self.ds, page_size=3) as forge, self.forge_settings(forge):
+            index = self.make_client().crawl_documents(self.ds.project_id)
+            pages = sum(max(1, -(-len(c) // 3)) for c in self.ds.children.values())
+            self.assertEqual(forge.counts[CONTENTS], pages)
+        self.assertEqual(set(index), set(self.ds.items))
+        for urn, it in self.ds.items.items():
+            names = []
+            fid = it["folder"]
+            while fid:
+                names.append(self.ds.folders[fid]["name"])
+                fid = self.ds.folders[fid]["parent"]
+            self.assertEqual(index[urn].path, "/".join(reversed(names)))
+            self.assertEqual(index[urn].is_pdf, it["file_type"] == "pdf")
+
+    def test_crawl_report_matches_lookup_without_per_item_calls(self):
+        with FakeForge(self.ds) as forge:
+            expected = self.report(forge, "lookup")
+            forge.counts.clear()
+            rows = self.report(forge, "crawl")
+            self.assertEqual(forge.counts[TIP], 0)
+            self.assertEqual(forge.counts[FOLDER], 0)
+            self.assertEqual(forge.counts[CONTENTS], len(self.ds.folders))
+        key = lambda r: (r.issue_id, r.document_id)
+        self.assertEqual(sorted(rows, key=key), sorted(expected, key=key))
@@ -0,0 +1,42 @@
+from collections import defaultdict
+from django.test import TestCase, override_settings
+from benchmarks.fake_forge import FakeForge
+from tests.forge_case import ForgeCaseMixin
+
+FOLDER = "GET /data/v1/projects/([^/]+)/folders/([^/]+)"
+FOLDER_PARENT = "GET /data/v1/projects/([^/]+)/folders/([^/]+)/parent"
+
+
+@override_settings(FORGE_DM_BATCH_SIZE=0)
+class FolderCacheTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=0, documents=40, depth=5, fanout=2, seed=11)
+
+    def ancestors(self, folder_id):
+        out = set()
+        while folder_id:
+            out.add(folder_id)
+            folder_id = self.ds.folders[folder_id]["parent"]
+        return out
+
+    def test_sibling_document_path_costs_no_folder_calls(self):
+        by_folder = defaultdict(list)
+        for urn, it in self.ds.items.items():
+            by_folder[it["folder"]].append(urn)
+        siblings = next(urns for urns in by_folder.values() if len(urns) >= 2)
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            dm = self.make_client().dm
+            first = dm.get_item_info(self.ds.project_id, siblings[0])
+            folder_calls = forge.counts[FOLDER]
+            second = dm.get_item_info(self.ds.project_id, siblings[1])
+            self.assertEqual(forge.counts[FOLDER], folder_calls)
+            self.assertEqual(folder_calls, 5)
+        self.assertEqual(first.path, second.path)
+        self.assertEqual(len(first.path.split("/")), 5)
+
+    def test_parallel_resolution_fetches_each_folder_once(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            docs = self.make_client().get_item_infos(self.ds.project_id, list(self.ds.items))
+            needed = set().union(*(self.ancestors(it["folder"]) for it in self.ds.items.values()))
+            self.assertEqual(forge.counts[FOLDER], len(needed))
+            self.assertEqual(forge.counts[FOLDER_PARENT], len(needed))
+        self.assertTrue(all(d and d.path.startswith("Project Files/") for d in docs.values()))
@@ -0,0 +1,55 @@
+from django.test import TestCase, override_settings
+from benchmarks.fake_forge import FakeForge
+from core.models import DocumentRecord, DocumentLookupFailure
+from tests.forge_case import ForgeCaseMixin
+
+TIP = "GET /data/v1/projects/([^/]+)/items/([^/]+)/tip"
+ITEM_PARENT = "GET /data/v1/projects/([^/]+)/items/([^/]+)/parent"
+FOLDER = "GET /data/v1/projects/([^/]+)/folders/([^/]+)"
+
+
+@override_settings(FORGE_DM_BATCH_SIZE=0)
+class DocumentStoreTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=0, documents=12, depth=3, fanout=2, seed=5)
+
+    def setUp(self):
+        super().setUp()
+        self.urns = list(self.ds.items)
+
+    def test_second_run_only_revalidates_tips(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            first = self.make_client().get_item_infos(self.ds.project_id, self.urns)
+            self.assertEqual(DocumentRecord.objects.count(), len(self.urns))
+            forge.counts.clear()
+            second = self.make_client().get_item_infos(self.ds.project_id, self.urns)
+            self.assertEqual(forge.counts[TIP], len(self.urns))
+            self.assertEqual(forge.counts[ITEM_PARENT], 0)
+            self.assertEqual(forge.counts[FOLDER], 0)
+        self.assertEqual(first, second)
+
+    def test_new_version_is_fully_resolved(self):
+        bumped = self.urns[0]
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            self.make_client().get_item_infos(self.ds.project_id, self.urns)
+            self.ds.items[bumped]["version"] += 1
+            forge.counts.clear()
+            docs = self.make_client().get_item_infos(self.ds.project_id, self.urns)
+            self.assertEqual(forge.counts[ITEM_PARENT], 1)
+            self.assertEqual(forge.counts[FOLDER], 3)
+        self.assertEqual(docs[bumped].version, self.ds.items[bumped]["version"])
+        rec = DocumentRecord.objects.get(project_id=self.ds.project_id, urn=bumped)
+        self.assertEqual(rec.version_number, self.ds.items[bumped]["version"])
+
+    def test_failed_lookup_is_skipped_until_it_expires(self):
+        missing = "urn:adsk.wipprod:dm.lineage:missing"
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            docs = self.make_client().get_item_infos(self.ds.project_id, [missing])
+            self.assertIsNone(docs[missing])
+            self.assertTrue(DocumentLookupFailure.objects.filter(urn=missing).exists())
+            forge.counts.clear()
+            docs = self.make_client().get_item_infos(self.ds.project_id, [missing])
+            self.assertIsNone(docs[missing])
+            self.assertEqual(sum(forge.counts.values()), 0)
+            DocumentLookupFailure.objects.update(expires_at="2000-01-01T00:00:00Z")
+            self.make_client().get_item_infos(self.ds.project_id, [missing])
+            self.assertEqual(forge.counts[TIP], 1)
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from core.services.aggregate import IssueAggregator
+from core.services.resilience import CircuitBreakers, reset_breakers
+from tests.forge_case import ForgeCaseMixin
+
+
+class FakeForgeEndToEndTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=60, documents=20, depth=4, fanout=2, seed=7)
+
+    def expected_rows(self):
+        out = set()
+        for iss in self.ds.issues:
+            urns = {p["lineageUrn"] for p in iss["placements"]} | {d["urn"] for d in iss["linkedDocuments"]}
+            for u in urns:
+                if self.ds.items[u]["file_type"] == "pdf":
+                    out.add((iss["id"], u))
+        return out
+
+    def run_report(self, forge):
+        with self.forge_settings(
+            forge, FORGE_RETRY_BACKOFF_BASE=0.01, FORGE_RETRY_BACKOFF_MAX=0.05, FORGE_RETRY_MAX_RETRIES=8
+        ):
+            client = self.make_client()
+            client.auth.breakers = CircuitBreakers(failure_threshold=1000, reset_timeout=1)
+            return IssueAggregator(client).collect_rows()
+
+    def test_report_over_real_http(self):
+        with FakeForge(self.ds) as forge:
+            rows = self.run_report(forge)
+        self.assertEqual({(r.issue_id, r.document_id) for r in rows}, self.expected_rows())
+        row = rows[0]
+        doc = self.ds.items[row.document_id]
+        self.assertEqual(row.document_name, doc["name"])
+        self.assertTrue(row.document_path.startswith("Project Files/Folder 1-"))
+        self.assertEqual(len(row.document_path.split("/")), 4)
+
+    def test_report_survives_throttling_and_server_errors(self):
+        with FakeForge(self.ds, rate_429=0.1, rate_5xx=0.05, retry_after=0, seed=3) as forge:
+            rows = self.run_report(forge)
+        self.assertEqual({(r.issue_id, r.document_id) for r in rows}, self.expected_rows())
+
+    def test_one_failing_item_does_not_trip_the_breaker_for_the_others(self):
+        bad, *good = sorted(self.ds.items)
+        with FakeForge(self.ds) as forge, self.forge_settings(
+            forge, FORGE_DM_BATCH_SIZE=0, FORGE_RETRY_BACKOFF_BASE=0.001, FORGE_RETRY_BACKOFF_MAX=0.002,
+            FORGE_RETRY_MAX_RETRIES=5, FORGE_CIRCUIT_FAILURE_THRESHOLD=5,
+        ):
+            reset_breakers()
+            self.addCleanup(reset_breakers)
+            tip = forge._item_tip
+            forge._item_tip = lambda h, q, b, p, urn: forge._send(h, 500, {}) if urn == bad else tip(h, q, b, p, urn)
+            self.assertEqual(self.make_client().get_item_infos(self.ds.project_id, [bad]), {bad: None})
+            docs = self.make_client().get_item_infos(self.ds.project_id, good)
+        self.assertTrue(all(docs[u] for u in good))
@@ -0,0 +1,63 @@
+import time
+from unittest.mock import patch
+from django.test import SimpleTestCase, override_settings
+from core.services.auth import AuthSession
+from core.services.http_cache import ResponseCache, DEFAULT_TTLS
+from tests.forge_case import FakeResponse, ScriptedHttp, unthrottled_auth
+from tests.logging_config import CaseLoggerMixin
+
+BASE = "https://developer.api.autodesk.com"
+FOLDER_URL = f"{BASE}/data/v1/projects/b.p/folders/f1"
+
+
+@override_settings(
+    FORGE_BASE_URL=BASE,
+    CACHES={"forge_http": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test-http-cache"}},
+)
+@patch.object(AuthSession, "ensure_token", return_value="tok")
+class ResponseCacheTests(CaseLoggerMixin, SimpleTestCase):
+    def make_auth(self, http):
+        auth = unthrottled_auth(http)
+        auth.response_cache = ResponseCache(DEFAULT_TTLS, alias="forge_http", retention=10**6)
+        return auth
+
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import caches
+        caches["forge_http"].clear()
+
+    def test_fresh_entry_is_served_without_request(self, _tok):
+        http = ScriptedHttp([FakeResponse(200, {"data": {"id": "f1"}}, {"ETag": '"v1"'})])
+        auth = self.make_auth(http)
+        self.assertEqual(auth.get(FOLDER_URL).json()["data"]["id"], "f1")
+        r = auth.get(FOLDER_URL)
+        self.assertTrue(getattr(r, "from_cache", False))
+        self.assertEqual(r.json()["data"]["id"], "f1")
+        self.assertEqual(len(http.sent_headers), 1)
+        st = auth.response_cache.stats()
+        self.assertEqual((st["hits"], st["misses"], st["stores"]), (1, 1, 1))
+
+    def test_stale_entry_revalidates_with_etag(self, _tok):
+        http = ScriptedHttp([
+            FakeResponse(200, {"data": {"id": "f1"}}, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Sep 2025 10:00:00 GMT"}),
+            FakeResponse(304),
+        ])
+        auth = self.make_auth(http)
+        auth.get(FOLDER_URL)
+        with patch("core.services.http_cache.time.time", return_value=time.time() + 90000):
+            r = auth.get(FOLDER_URL)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()["data"]["id"], "f1")
+        self.assertEqual(http.sent_headers[1]["If-None-Match"], '"v1"')
+        self.assertEqual(http.sent_headers[1]["If-Modified-Since"], "Mon, 01 Sep 2025 10:00:00 GMT")
+        self.assertEqual(auth.response_cache.stats()["revalidated"], 1)
+
+    def test_uncached_patterns_and_disabled_cache_pass_through(self, _tok):
+        http = ScriptedHttp([FakeResponse(200, {"results": []}), FakeResponse(200, {"results": []})])
+        auth = self.make_auth(http)
+        url = f"{BASE}/construction/issues/v1/projects/p/issues"
+        auth.get(url)
+        auth.get(url)
+        self.assertEqual(len(http.sent_headers), 2)
+        auth.response_cache.enabled = False
+        self.assertIsNone(auth.response_cache.lookup(FOLDER_URL))
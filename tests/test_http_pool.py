@@ -0,0 +1,44 @@
+import time
+import threading
+from django.test import TestCase, override_settings
+from core.models import OAuthToken
+from core.services import http_pool
+from core.services.auth import AuthSession, invalidate_token_cache
+from tests.forge_case import FakeResponse, ScriptedHttp
+from tests.logging_config import CaseLoggerMixin
+
+
+@override_settings(FORGE_BASE_URL="https://developer.api.autodesk.com")
+class HttpPoolTests(CaseLoggerMixin, TestCase):
+    def tearDown(self):
+        http_pool.close_session()
+        invalidate_token_cache()
+        super().tearDown()
+
+    def test_build_session_mounts_sized_adapter(self):
+        s = http_pool.build_session(pool_connections=3, pool_maxsize=7, pool_block=True, keep_alive=False)
+        adapter = s.get_adapter("https://developer.api.autodesk.com/")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(s.headers.get("Connection"), "close")
+
+    def test_get_session_is_shared_across_threads(self):
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(http_pool.get_session())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(s) for s in seen}), 1)
+        self.assertIs(AuthSession().http, seen[0])
+
+    def test_auth_session_routes_requests_through_pool(self):
+        OAuthToken.objects.create(access_token="tok", refresh_token="r", expires_at=int(time.time()) + 3600)
+        http = ScriptedHttp([FakeResponse(200)])
+        resp = AuthSession(http=http).get("https://developer.api.autodesk.com/data/v1/x", timeout=5)
+        self.assertEqual(resp.status_code, 200)
+        method, url, kwargs = http.calls[0]
+        self.assertEqual(method, "GET")
+        self.assertEqual(kwargs["headers"]["Authorization"], "Bearer tok")
+        self.assertEqual(kwargs["timeout"], 5)
@@ -1,6 +1,7 @@
 from django.test import SimpleTestCase, override_settings
 from core.dto import Document
 from core.services.aggregate import IssueAggregator
+from core.services.report_client import ReportClient
 from tests.logging_config import CaseLoggerMixin
 
 
@@ -9,28 +10,43 @@ class FakeIssues:
         self._type_map = type_map
         self._subtype_map = subtype_map
         self._comments_map = comments_map
+        self.comment_calls = []
 
     def issue_types_map(self, project_id):
         return self._type_map, self._subtype_map
 
     def get_comments(self, project_id, issue_id):
+        self.comment_calls.append(issue_id)
         return self._comments_map.get(issue_id, [])
 
 
-class FakeClient:
+class FakeClient(ReportClient):
     def __init__(self, issues_list, docs_by_urn, comments_map):
         self._issues_list = issues_list
         self._docs_by_urn = docs_by_urn
+        self.item_calls = []
+        self.crawls = 0
         self.issues = FakeIssues({"t1": "Quality"}, {"s1": "Clash"}, comments_map)
 
     def get_project_id_by_name(self, name):
         return "b.pid123"
 
-    def list_issues(self, issues_project_id):
-        return self._issues_list
+    def iter_issues(self, issues_project_id, query=None):
+        return iter(self._issues_list)
 
-    def get_item_info(self, dm_project_id, urn):
-        return self._docs_by_urn.get(urn)
+    def get_item_infos(self, dm_project_id, urns):
+        self.item_calls += urns
+        return {u: self._docs_by_urn.get(u) for u in urns}
+
+    def crawl_documents(self, dm_project_id):
+        self.crawls += 1
+        return dict(self._docs_by_urn)
+
+    def get_comment_threads(self, issues_project_id, issues):
+        return {iss["id"]: self.issues.get_comments(issues_project_id, iss["id"]) for iss in issues}
+
+    def fetch_comments_many(self, issues_project_id, issue_ids):
+        return {i: self.issues.get_comments(issues_project_id, i) for i in issue_ids}
 
 
 @override_settings(TARGET_PROJECT_NAME="DEV TASK 1 Project")
@@ -69,3 +85,45 @@ class IssueAggregatorTests(CaseLoggerMixin, SimpleTestCase):
         self.assertEqual(r["issue due date"], "2025-08-20")
         self.assertIn("viewableGuid=g123", r["link to the document page the issue located in"])
         self.assertEqual(r["issue comments"], "First, Second")
+
+    def test_comments_are_loaded_only_for_row_producing_issues(self):
+        pdf = Document(id="urn:1", name="plan.pdf", path="Root", web_link="https://acc/doc1", is_pdf=True)
+        txt = Document(id="urn:2", name="notes.txt", path="Root", web_link="https://acc/doc2", is_pdf=False)
+        issues_list = [
+            {"id": "pdf", "placements": [{"lineageUrn": "urn:1"}], "commentCount": 2},
+            {"id": "silent", "placements": [{"lineageUrn": "urn:1"}], "commentCount": 0},
+            {"id": "txt", "placements": [{"lineageUrn": "urn:2"}], "commentCount": 5},
+            {"id": "none", "commentCount": 1},
+        ]
+        comments_map = {"pdf": [{"body": "x"}], "silent": [{"body": "never read"}], "txt": [{"body": "y"}]}
+        client = FakeClient(issues_list, {"urn:1": pdf, "urn:2": txt}, comments_map)
+        rows = IssueAggregator(client).collect_rows()
+        self.assertEqual(client.issues.comment_calls, ["pdf"])
+        self.assertEqual([(r.issue_id, r.issue_comments) for r in rows], [("pdf", "x"), ("silent", "")])
+
+    def test_crawl_resolver_uses_the_folder_index(self):
+        pdf = Document(id="urn:1", name="plan.pdf", path="Root", web_link="https://acc/doc1", is_pdf=True)
+        issues_list = [{"id": "i1", "placements": [{"lineageUrn": "urn:1"}]}]
+        client = FakeClient(issues_list, {"urn:1": pdf}, {})
+        rows = IssueAggregator(client, resolver="crawl").collect_rows()
+        self.assertEqual([r.document_id for r in rows], ["urn:1"])
+        self.assertEqual((client.crawls, client.item_calls), (1, []))
+
+    @override_settings(REPORT_ISSUE_BATCH_SIZE=2)
+    def test_rows_stream_batch_by_batch(self):
+        pdf = Document(id="urn:1", name="plan.pdf", path="Root", web_link="https://acc/doc1", is_pdf=True)
+        pulled = []
+
+        class StreamingClient(FakeClient):
+            def iter_issues(self, issues_project_id, query=None):
+                for iss in self._issues_list:
+                    pulled.append(iss["id"])
+                    yield iss
+
+        issues_list = [{"id": f"i{n}", "placements": [{"lineageUrn": "urn:1"}]} for n in range(6)]
+        client = StreamingClient(issues_list, {"urn:1": pdf}, {})
+        rows = IssueAggregator(client).iter_rows()
+        self.assertEqual(next(rows).issue_id, "i0")
+        self.assertEqual(pulled, ["i0", "i1"])
+        self.assertEqual([r.issue_id for r in rows], ["i1", "i2", "i3", "i4", "i5"])
+        self.assertEqual(client.issues.comment_calls, [f"i{n}" for n in range(6)])
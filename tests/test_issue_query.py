@@ -0,0 +1,72 @@
+from django.http import QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from benchmarks.fake_forge import FakeForge
+from core.services.aggregate import IssueAggregator
+from core.services.issue_query import IssueQuery, ISSUE_FIELDS
+from tests.forge_case import ForgeCaseMixin
+from tests.logging_config import CaseLoggerMixin
+from web.views_report import report_csv
+
+ISSUES = "GET /construction/issues/v1/projects/([^/]+)/issues"
+
+
+class IssueQueryTests(CaseLoggerMixin, SimpleTestCase):
+    def test_parses_repeated_and_comma_separated_values(self):
+        q = IssueQuery.from_mapping(QueryDict("status=open,in_review&status=draft&issue_type=Quality&due_from=2025-02-01"))
+        self.assertEqual(q.status, ("open", "in_review", "draft"))
+        self.assertEqual(q.issue_type, ("Quality",))
+        self.assertEqual(
+            q.with_type_ids({"t1": "Quality"}).params(),
+            {"filter[status]": "open,in_review,draft", "filter[issueTypeId]": "t1", "filter[dueDate]": "2025-02-01.."},
+        )
+
+    def test_empty_query_is_falsy_and_sends_no_filters(self):
+        q = IssueQuery.from_mapping({"status": None, "due_from": ""})
+        self.assertFalse(q)
+        self.assertEqual(q.params(), {})
+
+    def test_rejects_malformed_dates(self):
+        with self.assertRaises(ValueError):
+            IssueQuery.from_mapping({"due_to": "20/02/2025"})
+        with self.assertRaises(ValueError):
+            IssueQuery.from_mapping({"updated_from": "yesterday"})
+
+    def test_matches_applies_inclusive_ranges(self):
+        q = IssueQuery(start_from="2025-01-02", start_to="2025-01-03", status=("open",))
+        self.assertTrue(q.matches({"status": "open", "startDate": "2025-01-03"}))
+        self.assertFalse(q.matches({"status": "open", "startDate": "2025-01-04"}))
+        self.assertFalse(q.matches({"status": "closed", "startDate": "2025-01-02"}))
+        self.assertFalse(q.matches({"status": "open"}))
+
+    def test_report_csv_rejects_bad_filters(self):
+        resp = report_csv(RequestFactory().get("/report.csv", {"due_from": "soon"}))
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn(b"due_from", resp.content)
+
+
+class FilterPushdownTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=300, documents=20, depth=2, fanout=2, seed=12)
+
+    def report(self, forge, query=None):
+        with self.forge_settings(forge):
+            return IssueAggregator(self.make_client(), query=query).collect_rows()
+
+    def test_filters_run_at_the_api(self):
+        query = IssueQuery(status=("open",), issue_type=("Quality",), due_from="2025-01-10", due_to="2025-01-20")
+        with FakeForge(self.ds) as forge:
+            everything = self.report(forge)
+            forge.counts.clear()
+            rows = self.report(forge, query)
+            self.assertEqual(forge.counts[ISSUES], 1)
+        expected = [
+            r for r in everything
+            if r.issue_status == "open" and r.issue_type == "Quality" and "2025-01-10" <= r.issue_due_date <= "2025-01-20"
+        ]
+        self.assertTrue(expected)
+        self.assertEqual(rows, expected)
+
+    def test_listing_requests_only_the_fields_the_report_reads(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            issue = self.make_client().list_issues(self.ds.issues_project_id)[0]
+        self.assertNotIn("createdAt", issue)
+        self.assertLessEqual(set(issue), set(ISSUE_FIELDS))
@@ -0,0 +1,110 @@
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from core.models import StoredIssue, StoredComment, IssueSyncState
+from core.services.aggregate import IssueAggregator
+from core.services.issue_store import IssueStore
+from tests.forge_case import ForgeCaseMixin
+
+ISSUES = "GET /construction/issues/v1/projects/([^/]+)/issues"
+COMMENTS = "GET /construction/issues/v1/projects/([^/]+)/issues/([^/]+)/comments"
+
+
+class IssueStoreTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=150, documents=20, depth=3, fanout=2, seed=9)
+
+    def report(self, forge, source, **kwargs):
+        with self.forge_settings(forge):
+            return IssueAggregator(self.make_client(), source=source, **kwargs).collect_rows()
+
+    def touch(self, issue, **changes):
+        issue.update(changes)
+        issue["updatedAt"] = "2030-01-01T00:00:00Z"
+
+    def test_store_report_matches_api_report(self):
+        with FakeForge(self.ds) as forge:
+            expected = self.report(forge, "api")
+            rows = self.report(forge, "store")
+        self.assertEqual(rows, expected)
+        self.assertEqual(StoredIssue.objects.count(), 150)
+        self.assertEqual(StoredComment.objects.count(), sum(len(c) for c in self.ds.comments.values()))
+        self.assertEqual(
+            IssueSyncState.objects.get(project_id=self.ds.issues_project_id).watermark,
+            max(i["updatedAt"] for i in self.ds.issues),
+        )
+
+    def test_second_sync_only_fetches_changed_issues(self):
+        with FakeForge(self.ds) as forge:
+            self.report(forge, "store")
+            changed = self.ds.issues[7]
+            self.touch(changed, title="Renamed")
+            self.ds.comments[changed["id"]].append({"id": "new-c", "body": "Late reply", "createdAt": "2030-01-01T00:00:00Z"})
+            changed["commentCount"] += 1
+            forge.counts.clear()
+            rows = self.report(forge, "store")
+            self.assertEqual(forge.counts[COMMENTS], 1)
+            expected = self.report(forge, "api")
+        self.assertEqual(rows, expected)
+        thread = IssueStore(self.ds.issues_project_id).comments_map([changed["id"]])[changed["id"]]
+        self.assertEqual(thread[-1]["body"], "Late reply")
+        stored = StoredIssue.objects.get(issue_id=changed["id"]).data
+        self.assertEqual(stored["title"], "Renamed")
+
+    def test_incremental_sync_sends_watermark_filter(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            store = IssueStore(self.ds.issues_project_id)
+            self.assertEqual(store.sync(self.make_client())["changed"], 150)
+            self.touch(self.ds.issues[3])
+            forge.counts.clear()
+            result = store.sync(self.make_client())
+            self.assertEqual(result["changed"], 1)
+            self.assertEqual(forge.counts[ISSUES], 2)
+            self.assertEqual(forge.counts[COMMENTS], 1)
+            self.assertEqual(result["watermark"], "2030-01-01T00:00:00Z")
+
+    def test_deleted_and_vanished_issues_are_removed(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            store = IssueStore(self.ds.issues_project_id)
+            store.sync(self.make_client())
+            deleted = self.ds.issues[0]
+            self.touch(deleted, deletedAt="2030-01-01T00:00:00Z")
+            self.assertEqual(store.sync(self.make_client())["removed"], 1)
+            vanished = self.ds.issues.pop(1)
+            self.assertEqual(store.sync(self.make_client())["removed"], 0)
+            self.assertEqual(store.sync(self.make_client(), full=True)["removed"], 1)
+        ids = set(StoredIssue.objects.values_list("issue_id", flat=True))
+        self.assertNotIn(deleted["id"], ids)
+        self.assertNotIn(vanished["id"], ids)
+        self.assertFalse(StoredComment.objects.filter(issue_id=vanished["id"]).exists())
+
+    def test_issue_deleted_between_incremental_syncs_is_removed(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            store = IssueStore(self.ds.issues_project_id)
+            store.sync(self.make_client())
+            self.touch(self.ds.issues[2])
+            self.assertEqual(store.sync(self.make_client())["changed"], 1)
+            deleted = self.ds.issues[5]
+            deleted["deletedAt"] = deleted["updatedAt"] = "2030-01-02T00:00:00Z"
+            result = store.sync(self.make_client())
+        self.assertEqual(result["removed"], 1)
+        self.assertEqual(result["watermark"], "2030-01-02T00:00:00Z")
+        self.assertFalse(StoredIssue.objects.filter(issue_id=deleted["id"]).exists())
+        self.assertFalse(StoredComment.objects.filter(issue_id=deleted["id"]).exists())
+
+    def test_failed_comment_fetch_keeps_issue_for_next_sync(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            store = IssueStore(self.ds.issues_project_id)
+            store.sync(self.make_client())
+            broken, later = [i for i in self.ds.issues if self.ds.comments[i["id"]]][:2]
+            self.touch(broken, title="Renamed")
+            later["updatedAt"] = "2030-01-02T00:00:00Z"
+            thread = self.ds.comments.pop(broken["id"])
+            result = store.sync(self.make_client())
+            self.assertEqual((result["changed"], result["failed"]), (1, 1))
+            self.assertEqual(result["watermark"], "2030-01-01T00:00:00Z")
+            self.assertNotEqual(StoredIssue.objects.get(issue_id=broken["id"]).data["title"], "Renamed")
+            self.assertEqual(StoredComment.objects.filter(issue_id=broken["id"]).count(), len(thread))
+            self.ds.comments[broken["id"]] = thread
+            result = store.sync(self.make_client())
+        self.assertEqual((result["changed"], result["failed"]), (1, 0))
+        self.assertEqual(result["watermark"], "2030-01-02T00:00:00Z")
+        self.assertEqual(StoredIssue.objects.get(issue_id=broken["id"]).data["title"], "Renamed")
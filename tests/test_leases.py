@@ -0,0 +1,70 @@
+import time
+import datetime as dt
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.models import Lock, OAuthToken
+from core.services import leases
+from core.services.auth import AuthSession, REFRESH_LEASE, invalidate_token_cache
+from tests.logging_config import CaseLoggerMixin
+
+
+class CountingHttp:
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        raise AssertionError("refresh should not be issued while a peer holds the lease")
+
+
+class LeaseTests(CaseLoggerMixin, TestCase):
+    def test_acquire_is_exclusive_until_release(self):
+        owner = leases.acquire("job", ttl=30)
+        self.assertIsNotNone(owner)
+        self.assertIsNone(leases.acquire("job", ttl=30))
+        self.assertTrue(leases.is_held("job"))
+        leases.release("job", owner)
+        self.assertIsNotNone(leases.acquire("job", ttl=30))
+
+    def test_expired_lease_is_taken_over(self):
+        Lock.objects.create(name="job", owner="dead", expires_at=timezone.now() - dt.timedelta(seconds=1))
+        owner = leases.acquire("job", ttl=30)
+        self.assertIsNotNone(owner)
+        self.assertEqual(Lock.objects.get(name="job").owner, owner)
+
+    def test_lock_without_expiry_is_taken_over(self):
+        Lock.objects.create(name="job")
+        self.assertFalse(leases.is_held("job"))
+        owner = leases.acquire("job", ttl=30)
+        self.assertIsNotNone(owner)
+        self.assertEqual(Lock.objects.get(name="job").owner, owner)
+
+    def test_release_ignores_other_owner(self):
+        owner = leases.acquire("job", ttl=30)
+        leases.release("job", "someone-else")
+        self.assertTrue(Lock.objects.filter(name="job", owner=owner).exists())
+
+
+@override_settings(
+    FORGE_BASE_URL="https://developer.api.autodesk.com",
+    FORGE_TOKEN_PROACTIVE_REFRESH=0,
+    FORGE_TOKEN_REFRESH_WAIT=1,
+)
+class RefreshLeaseTests(CaseLoggerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        invalidate_token_cache()
+
+    def tearDown(self):
+        invalidate_token_cache()
+        super().tearDown()
+
+    def test_waits_for_peer_and_reuses_its_token(self):
+        stale = OAuthToken.objects.create(access_token="old", refresh_token="r0", expires_at=int(time.time()) - 10)
+        leases.acquire(REFRESH_LEASE, ttl=30, owner="peer")
+        OAuthToken.objects.filter(pk=stale.pk).update(access_token="peer-new", refresh_token="r1", expires_at=int(time.time()) + 3600)
+        http = CountingHttp()
+        AuthSession(http=http)._refresh(stale)
+        self.assertEqual(http.posts, 0)
+        self.assertEqual(AuthSession(http=http).ensure_token(), "peer-new")
+        self.assertTrue(OAuthToken.objects.exists())
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+from django.test import SimpleTestCase, Client, override_settings
+from core.services.auth import AuthSession
+from core.services.metrics import HttpMetrics, endpoint_template, http_metrics
+from tests.forge_case import FakeResponse, ScriptedHttp, unthrottled_auth
+from tests.logging_config import CaseLoggerMixin
+
+BASE = "https://developer.api.autodesk.com"
+
+
+class MetricsTests(CaseLoggerMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        http_metrics.reset()
+
+    def test_endpoint_template_replaces_ids(self):
+        self.assertEqual(
+            endpoint_template(f"{BASE}/data/v1/projects/b.1/items/urn%3Aadsk%3Ax/tip"),
+            "/data/v1/projects/{id}/items/{id}/tip",
+        )
+        self.assertEqual(
+            endpoint_template(f"{BASE}/construction/issues/v1/projects/p1/issues/i9/comments?limit=100"),
+            "/construction/issues/v1/projects/{id}/issues/{id}/comments",
+        )
+
+    def test_render_prometheus_histogram_and_counters(self):
+        m = HttpMetrics()
+        m.record("GET", f"{BASE}/data/v1/projects/p/folders/f1", 200, 0.07, 120)
+        m.record("GET", f"{BASE}/data/v1/projects/p/folders/f2", 429, 0.3, 10)
+        m.record_retry("GET", f"{BASE}/data/v1/projects/p/folders/f2", "429")
+        text = m.render_prometheus()
+        labels = 'method="GET",endpoint="/data/v1/projects/{id}/folders/{id}"'
+        self.assertIn(f'forge_http_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn(f'forge_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1', text)
+        self.assertIn(f'forge_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f"forge_http_response_bytes_total{{{labels}}} 130", text)
+        self.assertIn(f'forge_http_retries_total{{{labels},reason="429"}} 1', text)
+        self.assertIn(f"forge_http_throttled_total{{{labels}}} 1", text)
+
+    @override_settings(FORGE_BASE_URL=BASE, FORGE_RETRY_BACKOFF_BASE=0.001)
+    @patch.object(AuthSession, "ensure_token", return_value="tok")
+    def test_auth_session_records_calls_and_retries(self, _tok):
+        auth = unthrottled_auth(ScriptedHttp([FakeResponse(503, content=b""), FakeResponse(200, content=b"{}")]))
+        auth.get(f"{BASE}/project/v1/hubs/b.1/projects")
+        snap = http_metrics.snapshot()[0]
+        self.assertEqual(snap["endpoint"], "/project/v1/hubs/{id}/projects")
+        self.assertEqual(snap["statuses"], {"503": 1, "200": 1})
+        self.assertEqual(snap["retries"], {"5xx": 1})
+        self.assertEqual(snap["bytes"], 2)
+
+    def test_metrics_view_is_public(self):
+        http_metrics.record("GET", f"{BASE}/data/v1/projects/p/items/i/tip", 200, 0.01, 5)
+        resp = Client().get("/metrics")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain"))
+        self.assertIn("forge_http_requests_total", resp.content.decode())
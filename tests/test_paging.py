@@ -0,0 +1,65 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from benchmarks.fake_forge import FakeForge
+from core.services.resilience import Deadline
+from tests.forge_case import ForgeCaseMixin, PagedIssuesHttp
+
+
+class IssueStreamingTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=250, documents=5, seed=2)
+
+    def test_issue_pages_stream_in_order(self):
+        with FakeForge(self.ds) as forge, self.forge_settings(forge):
+            client = self.make_client()
+            pages = list(client.issues.iter_issue_pages(self.ds.issues_project_id))
+            self.assertEqual([len(p) for p in pages], [100, 100, 50])
+            ids = [i["id"] for i in self.ds.issues]
+            self.assertEqual([i["id"] for i in client.iter_issues(self.ds.issues_project_id)], ids)
+            self.assertEqual([i["id"] for i in client.list_issues(self.ds.issues_project_id)], ids)
+
+
+@override_settings(FORGE_BASE_URL="https://forge.test", FORGE_ISSUES_PAGE_CONCURRENCY=4)
+class ConcurrentIssuePagesTests(ForgeCaseMixin, TestCase):
+    def client_with(self, http):
+        client = self.make_client()
+        client.auth.http = http
+        return client
+
+    def test_remaining_pages_are_fetched_in_parallel_in_stable_order(self):
+        http = PagedIssuesHttp(total=1050)
+        issues = self.client_with(http).list_issues("pid")
+        self.assertEqual([i["id"] for i in issues], [f"i{n}" for n in range(1050)])
+        self.assertEqual(http.offsets[0], 0)
+        self.assertEqual(sorted(http.offsets), list(range(0, 1100, 100)))
+        self.assertGreater(http.max_in_flight, 1)
+        self.assertLessEqual(http.max_in_flight, 4)
+
+    def test_failed_page_is_retried_on_its_own(self):
+        http = PagedIssuesHttp(total=600, fail_once={300})
+        issues = self.client_with(http).list_issues("pid")
+        self.assertEqual([i["id"] for i in issues], [f"i{n}" for n in range(600)])
+        self.assertEqual(http.offsets.count(300), 2)
+        self.assertEqual(len(http.offsets), 7)
+
+    @override_settings(FORGE_ISSUES_PAGE_RETRIES=0)
+    def test_page_failure_surfaces_when_retries_are_exhausted(self):
+        http = PagedIssuesHttp(total=600, fail_once={300})
+        with self.assertRaises(RuntimeError):
+            self.client_with(http).list_issues("pid")
+
+    @override_settings(FORGE_RETRY_BACKOFF_BASE=0.01, FORGE_RETRY_BACKOFF_MAX=0.02)
+    def test_page_retry_backs_off_before_refetching(self):
+        http = PagedIssuesHttp(total=600, fail_once={300})
+        client = self.client_with(http)
+        with mock.patch("core.services.issues.sleep_backoff", return_value=True) as backoff:
+            client.list_issues("pid")
+        backoff.assert_called_once_with(1, None, 0.01, 0.02, client.auth.deadline)
+
+    @override_settings(FORGE_RETRY_BACKOFF_BASE=60, FORGE_RETRY_BACKOFF_MAX=60)
+    def test_page_retry_gives_up_when_backoff_would_pass_the_deadline(self):
+        http = PagedIssuesHttp(total=600, fail_once={300})
+        client = self.client_with(http)
+        client.auth.deadline = Deadline(30)
+        with self.assertRaises(RuntimeError):
+            client.list_issues("pid")
+        self.assertEqual(http.offsets.count(300), 1)
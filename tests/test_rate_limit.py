@@ -0,0 +1,77 @@
+import time
+import unittest
+from django.test import override_settings
+from core.services.rate_limit import RateLimiter, endpoint_family
+from core.services.resilience import Deadline, DeadlineExceeded
+from tests.logging_config import CaseLoggerMixin
+
+BASE = "https://developer.api.autodesk.com"
+
+
+class RateLimitTests(CaseLoggerMixin, unittest.TestCase):
+    def test_endpoint_family(self):
+        self.assertEqual(endpoint_family(f"{BASE}/data/v1/projects/p/items/i/tip"), "data/v1")
+        self.assertEqual(endpoint_family(f"{BASE}/construction/issues/v1/projects/p/issues"), "issues/v1")
+        self.assertEqual(endpoint_family(f"{BASE}/project/v1/hubs/b.x/projects"), "project/v1")
+        self.assertEqual(endpoint_family(f"{BASE}/oss/v2/buckets/b"), "other")
+
+    def test_bucket_paces_calls_per_family(self):
+        limiter = RateLimiter({"data/v1": 50.0})
+        url = f"{BASE}/data/v1/x"
+        t0 = time.monotonic()
+        for _ in range(60):
+            limiter.acquire(url)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.15)
+        self.assertEqual(limiter.stats()["data/v1"]["acquired"], 60)
+        self.assertEqual(limiter.stats()["issues/v1"]["acquired"], 0)
+
+    def test_throttle_lowers_rate_and_successes_raise_it(self):
+        limiter = RateLimiter({"issues/v1": 8.0}, increase_step=1.0, increase_every=2)
+        url = f"{BASE}/construction/issues/v1/x"
+        limiter.observe(url, 429, "0")
+        st = limiter.stats()["issues/v1"]
+        self.assertEqual(st["rate"], 4.0)
+        self.assertEqual(st["throttled"], 1)
+        for _ in range(4):
+            limiter.observe(url, 200)
+        self.assertEqual(limiter.stats()["issues/v1"]["rate"], 6.0)
+
+    def test_throttles_within_the_decrease_window_lower_the_rate_once(self):
+        limiter = RateLimiter({"issues/v1": 8.0}, decrease_window=0.2)
+        url = f"{BASE}/construction/issues/v1/x"
+        for _ in range(3):
+            limiter.observe(url, 429)
+        self.assertEqual(limiter.stats()["issues/v1"]["rate"], 4.0)
+        time.sleep(0.25)
+        limiter.observe(url, 429)
+        self.assertEqual(limiter.stats()["issues/v1"]["rate"], 2.0)
+
+    @override_settings(FORGE_RATE_LIMITS={"data/v1": 7.0, "other": 3.0})
+    def test_rates_default_to_settings(self):
+        limiter = RateLimiter({"other": 4.0})
+        self.assertEqual(set(limiter.stats()), {"data/v1", "other"})
+        self.assertEqual(limiter.stats()["data/v1"]["max_rate"], 7.0)
+        self.assertEqual(limiter.stats()["other"]["max_rate"], 4.0)
+
+    def test_wait_that_would_pass_the_deadline_fails_fast(self):
+        limiter = RateLimiter({"project/v1": 100.0})
+        url = f"{BASE}/project/v1/hubs"
+        limiter.observe(url, 429, "30")
+        t0 = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            limiter.acquire(url, Deadline(1.0))
+        self.assertLess(time.monotonic() - t0, 0.5)
+
+    def test_retry_after_blocks_bucket(self):
+        limiter = RateLimiter({"project/v1": 100.0})
+        url = f"{BASE}/project/v1/hubs"
+        limiter.observe(url, 429, "1")
+        t0 = time.monotonic()
+        limiter.acquire(url)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.9)
+
+    def test_disabled_limiter_is_noop(self):
+        limiter = RateLimiter({}, enabled=False)
+        self.assertEqual(limiter.acquire(f"{BASE}/data/v1/x"), 0.0)
+        limiter.observe(f"{BASE}/data/v1/x", 429, "10")
+        self.assertEqual(limiter.stats()["data/v1"]["throttled"], 0)
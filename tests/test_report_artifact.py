@@ -0,0 +1,114 @@
+import os
+import gzip
+import shutil
+import tempfile
+import datetime as dt
+from django.test import TestCase
+from django.utils.http import http_date
+from benchmarks.fake_forge import FakeForge
+from core.models import ReportJob
+from core.services.rate_limit import reset_limiter
+from core.services.report_jobs import get_report_jobs, reset_report_jobs
+from tests.forge_case import ForgeCaseMixin
+
+
+class ReportArtifactTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=80, documents=10, depth=2, fanout=2, seed=41)
+
+    def setUp(self):
+        super().setUp()
+        reset_report_jobs()
+        self.out = tempfile.mkdtemp()
+        self.forge = self.enterContext(FakeForge(self.ds))
+        self.enterContext(self.forge_settings(
+            self.forge,
+            REPORT_OUTPUT_DIR=self.out,
+            REPORT_JOB_WORKERS=0,
+            REPORT_MAX_AGE=300,
+            FORGE_RATE_LIMIT_ENABLED=False,
+        ))
+        reset_limiter()
+
+    def tearDown(self):
+        reset_report_jobs()
+        reset_limiter()
+        shutil.rmtree(self.out, ignore_errors=True)
+        super().tearDown()
+
+    def fetch(self, path="/report.csv", **headers):
+        resp = self.client.get(path, headers=headers)
+        body = b"".join(resp.streaming_content) if resp.streaming else resp.content
+        return resp, body
+
+    def test_second_request_is_served_from_the_artifact(self):
+        first, built = self.fetch()
+        self.assertNotIn("ETag", first)
+        self.forge.counts.clear()
+        resp, body = self.fetch()
+        self.assertEqual(body, built)
+        self.assertEqual(sum(self.forge.counts.values()), 0)
+        job = ReportJob.objects.get()
+        self.assertEqual(resp["ETag"], f'"{job.sha256}"')
+        self.assertEqual(resp["Last-Modified"], http_date(job.finished_at.timestamp()))
+        self.assertIn("no-cache", resp["Cache-Control"])
+
+    def test_conditional_requests_get_304(self):
+        self.fetch()
+        resp, _ = self.fetch()
+        not_modified, body = self.fetch(if_none_match=resp["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(body, b"")
+        self.assertEqual(not_modified["ETag"], resp["ETag"])
+        since, _ = self.fetch(if_modified_since=resp["Last-Modified"])
+        self.assertEqual(since.status_code, 304)
+        changed, _ = self.fetch(if_none_match='"something-else"')
+        self.assertEqual(changed.status_code, 200)
+
+    def test_stale_artifact_is_served_while_a_rebuild_is_queued(self):
+        _, built = self.fetch()
+        old = ReportJob.objects.get()
+        ReportJob.objects.filter(pk=old.pk).update(finished_at=old.finished_at - dt.timedelta(seconds=600))
+        self.ds.issues[0]["title"] = "Renamed while stale"
+        self.ds.issues[0]["updatedAt"] = "2030-01-01T00:00:00Z"
+        self.forge.counts.clear()
+        resp, body = self.fetch()
+        self.assertEqual(body, built)
+        self.assertEqual(sum(self.forge.counts.values()), 0)
+        queued = ReportJob.objects.get(status="queued")
+        self.assertEqual(self.fetch()[1], built)
+        self.assertEqual(ReportJob.objects.filter(status="queued").count(), 1)
+
+        self.assertEqual(get_report_jobs().drain(), 1)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "done")
+        self.assertNotEqual(queued.sha256, old.sha256)
+        fresh, body = self.fetch(if_none_match=resp["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh["ETag"], f'"{queued.sha256}"')
+        with open(queued.path, "rb") as f:
+            self.assertEqual(body, f.read())
+        self.assertFalse(os.path.exists(old.path))
+        old.refresh_from_db()
+        self.assertEqual(old.path, "")
+
+    def test_fresh_bypasses_the_artifact(self):
+        self.fetch()
+        self.forge.counts.clear()
+        resp, _ = self.fetch("/report.csv?fresh=1")
+        self.assertNotIn("ETag", resp)
+        self.assertGreater(sum(self.forge.counts.values()), 0)
+        self.assertEqual(ReportJob.objects.filter(status="done").count(), 2)
+
+    def test_gzip_artifact_uses_a_weak_etag(self):
+        _, built = self.fetch()
+        resp, body = self.fetch(accept_encoding="gzip")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertTrue(resp["ETag"].startswith('W/"'))
+        self.assertEqual(gzip.decompress(body), built)
+        self.assertEqual(self.fetch(accept_encoding="gzip", if_none_match=resp["ETag"])[0].status_code, 304)
+
+    def test_filtered_reports_have_their_own_artifact(self):
+        self.fetch()
+        resp, _ = self.fetch("/report.csv?status=open")
+        self.assertNotIn("ETag", resp)
+        self.assertEqual(ReportJob.objects.filter(status="done").count(), 2)
@@ -0,0 +1,61 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from benchmarks.fake_forge import FakeForge
+from core.services.aggregate import IssueAggregator
+from core.services.csv_export import rows_to_csv
+from core.services.rate_limit import reset_limiter
+from tests.forge_case import ForgeCaseMixin
+
+
+class ReportCommandTests(ForgeCaseMixin, TestCase):
+    dataset = dict(issues=120, documents=15, depth=2, fanout=2, seed=20)
+
+    def setUp(self):
+        super().setUp()
+        self.out = tempfile.mkdtemp()
+
+    def tearDown(self):
+        reset_limiter()
+        shutil.rmtree(self.out, ignore_errors=True)
+        super().tearDown()
+
+    def settings_for(self, forge):
+        return self.forge_settings(
+            forge,
+            REPORT_OUTPUT_DIR=self.out,
+            REPORT_ISSUE_BATCH_SIZE=25,
+            FORGE_RATE_LIMIT_ENABLED=False,
+        )
+
+    def test_report_is_streamed_to_a_single_complete_file(self):
+        with FakeForge(self.ds) as forge, self.settings_for(forge):
+            reset_limiter()
+            call_command("report_issues", stdout=io.StringIO())
+            expected = rows_to_csv(IssueAggregator(self.make_client()).collect_rows())
+        names = [n for n in os.listdir(self.out) if n != "jobs"]
+        self.assertEqual(len(names), 1)
+        self.assertRegex(names[0], r"^acc_issues_\d{8}_\d{6}\.csv$")
+        with open(os.path.join(self.out, names[0]), "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_failure_mid_stream_leaves_no_partial_file(self):
+        original = IssueAggregator.iter_rows
+
+        def broken(agg):
+            rows = original(agg)
+            for _ in range(3):
+                yield next(rows)
+            raise RuntimeError("Issues API went away")
+
+        with FakeForge(self.ds) as forge, self.settings_for(forge), mock.patch.object(IssueAggregator, "iter_rows", broken):
+            reset_limiter()
+            with self.assertRaises(CommandError):
+                call_command("report_issues", stdout=io.StringIO())
+        self.assertEqual(os.listdir(self.out), ["jobs"])
+        self.assertEqual(os.listdir(os.path.join(self.out, "jobs")), [])
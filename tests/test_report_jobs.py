@@ -0,0 +1,230 @@
+import os
+import datetime as dt
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from benchmarks.fake_forge import FakeForge
+from core.models import Lock, ReportJob
+from core.services import leases
+from core.services.aggregate import IssueAggregator
+from core.services.csv_export import rows_to_csv
+from core.services.issue_query import IssueQuery
+from core.services.rate_limit import reset_limiter
+from core.services.report_jobs import ReportJobRunner, get_report_jobs, key_lease_name, report_params, reset_report_jobs
+from tests.forge_case import ForgeCaseMixin
+from tests.logging_config import CaseLoggerMixin
+
+
+class ReportJobCase(ForgeCaseMixin):
+    dataset = dict(issues=160, documents=15, depth=2, fanout=2, seed=31)
+
+    def setUp(self):
+        super().setUp()
+        reset_report_jobs()
+        self.out = tempfile.mkdtemp()
+
+    def tearDown(self):
+        reset_report_jobs()
+        reset_limiter()
+        shutil.rmtree(self.out, ignore_errors=True)
+        super().tearDown()
+
+    def settings_for(self, forge, **extra):
+        return self.forge_settings(forge, **{
+            "REPORT_OUTPUT_DIR": self.out,
+            "REPORT_ISSUE_BATCH_SIZE": 50,
+            "FORGE_RATE_LIMIT_ENABLED": False,
+            **extra,
+        })
+
+    def expected_csv(self, query=None):
+        return rows_to_csv(IssueAggregator(self.make_client(), query=query).collect_rows())
+
+
+class ReportJobApiTests(ReportJobCase, TestCase):
+    def test_job_runs_and_reports_progress(self):
+        with FakeForge(self.ds) as forge, self.settings_for(forge, REPORT_JOB_WORKERS=0):
+            reset_limiter()
+            resp = self.client.post("/reports/")
+            self.assertEqual(resp.status_code, 202)
+            job = resp.json()
+            self.assertEqual(job["status"], "queued")
+            self.assertEqual(resp["Location"], job["status_url"])
+            self.assertEqual(self.client.get(f"/reports/{job['id']}/download").status_code, 409)
+            self.assertEqual(get_report_jobs().drain(), 1)
+            status = self.client.get(job["status_url"]).json()
+            expected = self.expected_csv()
+        self.assertEqual(status["status"], "done")
+        self.assertEqual(status["progress"]["issues_fetched"], 160)
+        self.assertGreater(status["progress"]["documents_resolved"], 0)
+        self.assertEqual(status["progress"]["rows_built"], expected.count(b"\n") - 1)
+        resp = self.client.get(status["download_url"])
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("attachment", resp["Content-Disposition"])
+        self.assertEqual(b"".join(resp.streaming_content), expected)
+
+    def test_filters_are_carried_into_the_job(self):
+        with FakeForge(self.ds) as forge, self.settings_for(forge, REPORT_JOB_WORKERS=0):
+            resp = self.client.post("/reports/", {"status": ["open", "closed"], "due_from": "2025-01-05", "source": "store"})
+            job = ReportJob.objects.get(pk=resp.json()["id"])
+        self.assertEqual(job.params["query"], {"status": ["open", "closed"], "due_from": "2025-01-05"})
+        self.assertEqual(job.params["source"], "store")
+        self.assertEqual(IssueQuery.from_mapping(job.params["query"]).status, ("open", "closed"))
+
+    def test_start_requires_the_csrf_token_from_the_index(self):
+        client = Client(enforce_csrf_checks=True)
+        with override_settings(REPORT_JOB_WORKERS=0):
+            self.assertEqual(client.post("/reports/").status_code, 403)
+            self.assertEqual(client.get("/").status_code, 200)
+            token = client.cookies["csrftoken"].value
+            self.assertEqual(client.post("/reports/", HTTP_X_CSRFTOKEN=token).status_code, 202)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_bad_requests(self):
+        with override_settings(REPORT_JOB_WORKERS=0):
+            self.assertEqual(self.client.post("/reports/", {"due_to": "tomorrow"}).status_code, 400)
+            self.assertEqual(self.client.post("/reports/", {"resolver": "guess"}).status_code, 400)
+            self.assertEqual(self.client.get("/reports/").status_code, 405)
+            missing = "/reports/00000000-0000-0000-0000-000000000000/"
+            self.assertEqual(self.client.get(missing).status_code, 404)
+            self.assertEqual(self.client.get(missing + "download").status_code, 404)
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_failed_job_records_the_error(self):
+        with FakeForge(self.ds) as forge, self.settings_for(forge, TARGET_PROJECT_NAME="Nope"):
+            runner = ReportJobRunner(workers=0)
+            job = runner.submit(report_params(IssueQuery()))
+            runner.drain()
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("Nope", job.error)
+        self.assertFalse(leases.is_held(key_lease_name(job.key)))
+
+    def test_orphaned_running_job_is_reclaimed(self):
+        runner = ReportJobRunner(workers=0)
+        job = ReportJob.objects.create(status="running", key="a")
+        held = ReportJob.objects.create(status="running", key="b")
+        owner = leases.acquire(key_lease_name("b"), ttl=60)
+        self.assertTrue(runner.is_orphaned(job))
+        self.assertFalse(runner.is_orphaned(held))
+        claimed, claim_owner = runner.claim()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertIsNone(runner.claim())
+        leases.release(key_lease_name("a"), claim_owner)
+        leases.release(key_lease_name("b"), owner)
+
+
+class ReportCoalescingTests(ReportJobCase, TestCase):
+    def test_identical_requests_join_the_build_in_flight(self):
+        runner = ReportJobRunner(workers=0)
+        params = report_params(IssueQuery(status=("open",)))
+        job, owner = runner.lead_or_join(params)
+        self.assertIsNotNone(owner)
+        self.assertEqual(job.status, "running")
+        joined, joined_owner = runner.lead_or_join(report_params(IssueQuery(status=("open",))))
+        self.assertEqual((joined.pk, joined_owner), (job.pk, None))
+        self.assertEqual(runner.submit(params).pk, job.pk)
+        other, other_owner = runner.lead_or_join(report_params(IssueQuery(status=("closed",))))
+        self.assertNotEqual(other.pk, job.pk)
+        self.assertIsNotNone(other_owner)
+        leases.release(key_lease_name(job.key), owner)
+        leases.release(key_lease_name(other.key), other_owner)
+
+    def test_crashed_builder_is_taken_over(self):
+        runner = ReportJobRunner(workers=0)
+        params = report_params(IssueQuery())
+        job, owner = runner.lead_or_join(params)
+        Lock.objects.filter(name=key_lease_name(job.key)).update(expires_at=timezone.now() - dt.timedelta(seconds=1))
+        self.assertTrue(runner.is_orphaned(ReportJob.objects.get(pk=job.pk)))
+        taken, new_owner = runner.lead_or_join(params)
+        self.assertEqual(taken.pk, job.pk)
+        self.assertNotIn(new_owner, (None, owner))
+        leases.release(key_lease_name(job.key), new_owner)
+
+    def test_concurrent_report_csv_shares_one_build(self):
+        with FakeForge(self.ds) as forge, self.settings_for(forge, REPORT_JOB_WORKERS=0):
+            reset_limiter()
+            runner = get_report_jobs()
+            leader, owner = runner.lead_or_join(report_params(IssueQuery()))
+            real_wait = runner.wait
+
+            def wait_for_leader(job, timeout=None):
+                for _ in runner.build(leader, owner):
+                    pass
+                return real_wait(job, timeout)
+
+            forge.counts.clear()
+            with mock.patch.object(runner, "wait", wait_for_leader):
+                resp = self.client.get("/report.csv")
+                body = iter(resp.streaming_content)
+                header = next(body)
+                self.assertTrue(header.startswith(b"project id,"))
+                self.assertEqual(sum(forge.counts.values()), 0)
+                shared = header + b"".join(body)
+            expected = self.expected_csv()
+        self.assertEqual(shared, expected)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+
+    def test_run_or_join_takes_over_a_cancelled_build(self):
+        with FakeForge(self.ds) as forge, self.settings_for(forge, REPORT_JOB_WORKERS=0):
+            reset_limiter()
+            runner = get_report_jobs()
+            params = report_params(IssueQuery())
+            leader, owner = runner.lead_or_join(params)
+            real_wait = runner.wait
+
+            def cancel_leader(job, timeout=None):
+                ReportJob.objects.filter(pk=leader.pk).update(status="failed", error="cancelled", finished_at=timezone.now())
+                leases.release(key_lease_name(leader.key), owner)
+                return real_wait(job, timeout)
+
+            with mock.patch.object(runner, "wait", cancel_leader):
+                job = runner.run_or_join(params)
+            self.assertNotEqual(job.pk, leader.pk)
+            self.assertEqual(job.status, "done")
+            with open(job.path, "rb") as f:
+                self.assertEqual(f.read(), self.expected_csv())
+
+
+class LeaseHeartbeatTests(CaseLoggerMixin, TransactionTestCase):
+    def test_heartbeat_keeps_lease_alive_and_notices_loss(self):
+        owner = leases.acquire("report:hb", ttl=0.3)
+        with leases.Heartbeat("report:hb", owner, ttl=0.3, interval=0.05) as heartbeat:
+            time.sleep(0.6)
+            self.assertTrue(leases.is_held("report:hb"))
+            Lock.objects.filter(name="report:hb").delete()
+            deadline = time.time() + 2
+            while not heartbeat.lost.is_set() and time.time() < deadline:
+                time.sleep(0.02)
+            self.assertTrue(heartbeat.lost.is_set())
+        self.assertFalse(leases.is_held("report:hb"))
+
+
+class ReportJobPoolTests(ReportJobCase, TransactionTestCase):
+    def test_worker_pool_runs_jobs_off_the_calling_thread(self):
+        seen = []
+
+        class RecordingRunner(ReportJobRunner):
+            def run(self, job, owner):
+                seen.append(threading.current_thread().name)
+                super().run(job, owner)
+
+        with FakeForge(self.ds) as forge, self.settings_for(forge):
+            reset_limiter()
+            queue = ReportJobRunner(workers=0)
+            jobs = [queue.submit(report_params(IssueQuery(status=(s,)))) for s in ("open", "closed")]
+            self.assertEqual(queue.submit(report_params(IssueQuery(status=("open",)))).pk, jobs[0].pk)
+            self.assertEqual(RecordingRunner(workers=1).kick().result(timeout=30), 2)
+            expected = {s: self.expected_csv(IssueQuery(status=(s,))) for s in ("open", "closed")}
+        self.assertTrue(all(name.startswith("report-job") for name in seen), seen)
+        for job, s in zip(jobs, ("open", "closed")):
+            job.refresh_from_db()
+            self.assertEqual(job.status, "done", job.error)
+            with open(job.path, "rb") as f:
+                self.assertEqual(f.read(), expected[s])
+        self.assertEqual(len(os.listdir(os.path.join(self.out, "jobs"))), 2)
@@ -0,0 +1,98 @@
+import time
+import unittest
+import requests
+from unittest.mock import patch
+from django.test import SimpleTestCase, override_settings
+from core.services.auth import AuthSession
+from core.services.resilience import CircuitBreakers, CircuitOpen, Deadline, DeadlineExceeded
+from tests.forge_case import FakeResponse, ScriptedHttp, unthrottled_auth
+from tests.logging_config import CaseLoggerMixin
+
+BASE = "https://developer.api.autodesk.com"
+
+
+class CircuitBreakerTests(CaseLoggerMixin, unittest.TestCase):
+    def test_opens_after_threshold_and_recovers_via_probe(self):
+        breakers = CircuitBreakers(failure_threshold=3, reset_timeout=0.05)
+        url = f"{BASE}/data/v1/projects/p/items/i/tip"
+        for _ in range(3):
+            breakers.before(url)
+            breakers.observe(url, 503)
+        with self.assertRaises(CircuitOpen):
+            breakers.before(url)
+        breakers.before(f"{BASE}/construction/issues/v1/projects/p/issues")
+        time.sleep(0.06)
+        breakers.before(url)
+        with self.assertRaises(CircuitOpen):
+            breakers.before(url)
+        breakers.observe(url, 200)
+        breakers.before(url)
+
+    def test_released_probe_lets_next_call_probe(self):
+        breakers = CircuitBreakers(failure_threshold=1, reset_timeout=0)
+        url = f"{BASE}/data/v1/projects/p/items/i/tip"
+        breakers.observe(url, 503)
+        breakers.before(url)
+        breakers.release(url)
+        breakers.before(url)
+        with self.assertRaises(CircuitOpen):
+            breakers.before(url)
+
+    def test_deadline_clamps_timeouts(self):
+        d = Deadline(0.5)
+        self.assertLessEqual(d.timeout(30), 0.5)
+        d.expires = time.monotonic() - 1
+        with self.assertRaises(DeadlineExceeded):
+            d.timeout(30)
+
+
+@override_settings(FORGE_BASE_URL=BASE, FORGE_RETRY_MAX_RETRIES=5, FORGE_RETRY_BACKOFF_BASE=0.5, FORGE_RETRY_BACKOFF_MAX=10.0)
+@patch.object(AuthSession, "ensure_token", return_value="tok")
+class AuthSessionResilienceTests(CaseLoggerMixin, SimpleTestCase):
+    def make_auth(self, http, deadline=None, threshold=3):
+        auth = unthrottled_auth(http, deadline=deadline)
+        auth.breakers = CircuitBreakers(failure_threshold=threshold, reset_timeout=60)
+        return auth
+
+    def test_open_circuit_fails_fast_without_calling_api(self, _tok):
+        http = ScriptedHttp([requests.ConnectionError("down")])
+        auth = self.make_auth(http, threshold=2)
+        auth.backoff_base = 0.001
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                auth.get(f"{BASE}/data/v1/x")
+        self.assertEqual(len(http.calls), 10)
+        with self.assertRaises(CircuitOpen):
+            auth.get(f"{BASE}/data/v1/y")
+        self.assertEqual(len(http.calls), 10)
+
+    def test_retries_of_one_request_count_as_one_failure(self, _tok):
+        http = ScriptedHttp([FakeResponse(503)])
+        auth = self.make_auth(http, threshold=2)
+        auth.backoff_base = 0.001
+        self.assertEqual(auth.get(f"{BASE}/data/v1/x").status_code, 503)
+        self.assertEqual(len(http.calls), 5)
+        http.responses = [FakeResponse(200)]
+        self.assertEqual(auth.get(f"{BASE}/data/v1/y").status_code, 200)
+
+    def test_deadline_stops_retries_early(self, _tok):
+        http = ScriptedHttp([FakeResponse(503, headers={"Retry-After": "5"})])
+        auth = self.make_auth(http, deadline=Deadline(1.0), threshold=100)
+        t0 = time.monotonic()
+        resp = auth.get(f"{BASE}/data/v1/x", timeout=30)
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(len(http.calls), 1)
+        self.assertLess(time.monotonic() - t0, 1.0)
+        self.assertLessEqual(http.calls[0][2]["timeout"], 1.0)
+
+    def test_expired_deadline_does_not_hold_half_open_probe(self, _tok):
+        http = ScriptedHttp([FakeResponse(200)])
+        auth = self.make_auth(http, deadline=Deadline(0), threshold=1)
+        auth.breakers.reset_timeout = 0
+        url = f"{BASE}/data/v1/x"
+        auth.breakers.observe(url, 503)
+        with self.assertRaises(DeadlineExceeded):
+            auth.get(url)
+        auth.deadline = None
+        self.assertEqual(auth.get(url).status_code, 200)
+        self.assertEqual(len(http.calls), 1)
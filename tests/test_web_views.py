@@ -1,9 +1,47 @@
+import gzip
+import shutil
+import tempfile
 from unittest.mock import patch
 from django.test import TestCase, Client, override_settings
 from core.dto import IssueRow
 from tests.logging_config import CaseLoggerMixin
 
 
+NO_AUTH_MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+
+class FakeIA:
+    def __init__(self, client, **kwargs):
+        pass
+
+    def iter_rows(self):
+        yield IssueRow(
+            project_id="p1",
+            project_name="DEV TASK 1 Project",
+            document_id="d1",
+            document_name="doc.pdf",
+            document_path="Root",
+            web_link="http://x",
+            issue_id="i1",
+            issue_type="T",
+            issue_sub_type="S",
+            issue_status="open",
+            issue_due_date="2025-08-20",
+            issue_start_date="2025-08-10",
+            issue_title="Title",
+            issue_description="Desc",
+            issue_comments="C1",
+        )
+
+
 @override_settings(
     FORGE_CLIENT_ID="cid",
     FORGE_CLIENT_SECRET="sec",
@@ -17,6 +55,9 @@ class WebViewsTests(CaseLoggerMixin, TestCase):
     def setUp(self):
         super().setUp()
         self.client = Client()
+        out = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out, ignore_errors=True)
+        self.enterContext(override_settings(REPORT_OUTPUT_DIR=out))
 
     def test_index_unauthenticated(self):
         class DummyQS:
@@ -52,37 +93,40 @@ class WebViewsTests(CaseLoggerMixin, TestCase):
         self.assertIn("client_id=cid", loc)
         self.assertIn("redirect_uri=http%3A%2F%2Ftestserver%2Fauth%2Fcallback%2F", loc)
 
-    @override_settings(MIDDLEWARE=[
-    "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    ])
+    @override_settings(MIDDLEWARE=NO_AUTH_MIDDLEWARE)
     def test_report_csv_success(self):
-        class FakeIA:
-            def __init__(self, client): pass
-            def collect_rows(self):
-                return [IssueRow(
-                    project_id="p1",
-                    project_name="DEV TASK 1 Project",
-                    document_id="d1",
-                    document_name="doc.pdf",
-                    document_path="Root",
-                    web_link="http://x",
-                    issue_id="i1",
-                    issue_type="T",
-                    issue_sub_type="S",
-                    issue_status="open",
-                    issue_due_date="2025-08-20",
-                    issue_start_date="2025-08-10",
-                    issue_title="Title",
-                    issue_description="Desc",
-                    issue_comments="C1",
-                )]
-        with patch("web.views_report.IssueAggregator", FakeIA):
+        with patch("core.services.report_jobs.IssueAggregator", FakeIA):
             resp = self.client.get("/report.csv")
             self.assertEqual(resp.status_code, 200)
-            self.assertIn("project id,project name,document id", resp.content.decode("utf-8"))
+            self.assertTrue(resp.streaming)
+            self.assertNotIn("Content-Encoding", resp)
+            self.assertIn("project id,project name,document id", b"".join(resp.streaming_content).decode("utf-8"))
+
+    @override_settings(MIDDLEWARE=NO_AUTH_MIDDLEWARE)
+    def test_report_csv_sends_header_before_rows_are_built(self):
+        pulled = []
+
+        class SlowIA(FakeIA):
+            def iter_rows(self):
+                pulled.append(1)
+                yield from super().iter_rows()
+
+        with patch("core.services.report_jobs.IssueAggregator", SlowIA):
+            resp = self.client.get("/report.csv")
+            body = iter(resp.streaming_content)
+            self.assertTrue(next(body).startswith(b"project id,"))
+            self.assertEqual(pulled, [])
+            self.assertIn(b"p1,DEV TASK 1 Project,d1", b"".join(body))
+
+    @override_settings(MIDDLEWARE=NO_AUTH_MIDDLEWARE)
+    def test_report_csv_gzip_when_accepted(self):
+        with patch("core.services.report_jobs.IssueAggregator", FakeIA):
+            plain = b"".join(self.client.get("/report.csv").streaming_content)
+            resp = self.client.get("/report.csv", headers={"accept-encoding": "gzip, deflate"})
+            self.assertEqual(resp["Content-Encoding"], "gzip")
+            self.assertIn("Accept-Encoding", resp["Vary"])
+            self.assertEqual(gzip.decompress(b"".join(resp.streaming_content)), plain)
+            with override_settings(REPORT_CSV_GZIP=False):
+                resp = self.client.get("/report.csv", headers={"accept-encoding": "gzip"})
+                self.assertNotIn("Content-Encoding", resp)
+                self.assertEqual(b"".join(resp.streaming_content), plain)
@@ -9,7 +9,7 @@ class EnsureForgeAuthMiddleware:
 
     def __call__(self, request):
         path = request.path or ""
-        if path.startswith("/auth/") or path.startswith("/admin/") or path == "/token/":
+        if path.startswith("/auth/") or path.startswith("/admin/") or path == "/token/" or path == "/metrics":
             return self.get_response(request)
         try:
             AuthSession().ensure_token()
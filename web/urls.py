@@ -1,6 +1,8 @@
 from django.urls import path
 from .views_auth import index, login_start, oauth_callback, show_token
 from .views_report import report_csv
+from .views_metrics import metrics
+from .views_jobs import start_report_job, report_job_status, report_job_download
 
 urlpatterns = [
     path("", index, name="index"),
@@ -8,4 +10,8 @@ urlpatterns = [
     path("auth/callback/", oauth_callback, name="oauth_callback"),
     path("token/", show_token),
     path("report.csv", report_csv, name="report_csv"),
+    path("reports/", start_report_job, name="start_report_job"),
+    path("reports/<uuid:job_id>/", report_job_status, name="report_job_status"),
+    path("reports/<uuid:job_id>/download", report_job_download, name="report_job_download"),
+    path("metrics", metrics, name="metrics"),
 ]
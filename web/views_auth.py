@@ -4,10 +4,13 @@ import logging
 import requests
 from django.http import JsonResponse, HttpResponseRedirect, HttpResponse, HttpResponseBadRequest
 from django.conf import settings
+from django.views.decorators.csrf import ensure_csrf_cookie
 from core.models import OAuthToken
+from core.services.auth import invalidate_token_cache
 
 logger = logging.getLogger("app")
 
+@ensure_csrf_cookie
 def index(request):
     tok = OAuthToken.objects.order_by("-updated_at").first()
     authed = bool(tok and tok.expires_at > int(time.time()))
@@ -52,6 +55,7 @@ def oauth_callback(request):
         refresh_token=p.get("refresh_token", ""),
         expires_at=int(time.time()) + int(p.get("expires_in", 0))
     )
+    invalidate_token_cache()
     logger.info("event=auth.callback_exchange result=success")
     return HttpResponseRedirect("/")
 
@@ -0,0 +1,61 @@
+import os
+import logging
+from django.http import FileResponse, Http404, HttpResponseBadRequest, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+from core.models import ReportJob
+from core.services.issue_query import IssueQuery
+from core.services.report_jobs import DONE, QUEUED, get_report_jobs, job_status, report_params
+
+logger = logging.getLogger("app")
+
+RESOLVERS = ("lookup", "crawl")
+SOURCES = ("api", "store")
+
+def _job_or_404(job_id) -> ReportJob:
+    try:
+        return ReportJob.objects.get(pk=job_id)
+    except ReportJob.DoesNotExist:
+        raise Http404("No such report job")
+
+def _job_payload(job: ReportJob) -> dict:
+    out = job_status(job)
+    out["status_url"] = reverse("report_job_status", args=[job.id])
+    out["download_url"] = reverse("report_job_download", args=[job.id]) if job.status == DONE else None
+    return out
+
+@require_POST
+def start_report_job(request):
+    data = request.POST if request.POST else request.GET
+    try:
+        query = IssueQuery.from_mapping(data)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    resolver = data.get("resolver") or None
+    source = data.get("source") or None
+    if resolver not in (None, *RESOLVERS):
+        return HttpResponseBadRequest(f"resolver must be one of {', '.join(RESOLVERS)}")
+    if source not in (None, *SOURCES):
+        return HttpResponseBadRequest(f"source must be one of {', '.join(SOURCES)}")
+    job = get_report_jobs().submit(report_params(query, resolver=resolver, source=source))
+    logger.info("event=report_job.http_start job=%s", job.id)
+    resp = JsonResponse(_job_payload(job), status=202)
+    resp["Location"] = reverse("report_job_status", args=[job.id])
+    return resp
+
+@require_GET
+def report_job_status(request, job_id):
+    job = _job_or_404(job_id)
+    runner = get_report_jobs()
+    if job.status == QUEUED or runner.is_orphaned(job):
+        runner.kick()
+    return JsonResponse(_job_payload(job))
+
+@require_GET
+def report_job_download(request, job_id):
+    job = _job_or_404(job_id)
+    if job.status != DONE:
+        return JsonResponse(_job_payload(job), status=409)
+    if not job.path or not os.path.exists(job.path):
+        return JsonResponse({**_job_payload(job), "error": "Report file is no longer available"}, status=410)
+    return FileResponse(open(job.path, "rb"), as_attachment=True, filename="acc_issues_report.csv", content_type="text/csv; charset=utf-8")
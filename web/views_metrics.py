@@ -0,0 +1,5 @@
+from django.http import HttpResponse
+from core.services.metrics import http_metrics
+
+def metrics(request):
+    return HttpResponse(http_metrics.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,22 +1,105 @@
 import logging
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponse
+import re
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.conf import settings
-from core.services.acc_client import ACCClient
-from core.services.aggregate import IssueAggregator
-from core.services.csv_export import rows_to_csv
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.text import compress_sequence
+from core.services.issue_query import IssueQuery
+from core.services.csv_export import csv_header
+from core.services.report_jobs import CANCELLED, DONE, FAILED, get_report_jobs, report_key, report_params
 
 logger = logging.getLogger("app")
 
-def report_csv(request):
-    client = ACCClient()
-    logger.info("event=report.http_start project=%s", settings.TARGET_PROJECT_NAME)
+_accepts_gzip = re.compile(r"\bgzip\b")
+
+def _wants_gzip(request) -> bool:
+    if not getattr(settings, "REPORT_CSV_GZIP", True):
+        return False
+    return bool(_accepts_gzip.search(request.headers.get("Accept-Encoding", "")))
+
+def _file_chunks(f, chunk_size: int = 64 * 1024):
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+def _stream_report(params: dict, compressed: bool):
+    runner = get_report_jobs()
+    header = csv_header()
+    header_sent = False
+    n_bytes = 0
+    job = None
     try:
-        rows = IssueAggregator(client).collect_rows()
+        while True:
+            job, owner = runner.lead_or_join(params)
+            if owner is not None:
+                chunks = runner.build(job, owner)
+                if header_sent:
+                    next(chunks)
+                for chunk in chunks:
+                    n_bytes += len(chunk)
+                    yield chunk
+                break
+            if not header_sent:
+                header_sent = True
+                n_bytes += len(header)
+                yield header
+            job = runner.wait(job, timeout=float(getattr(settings, "REPORT_RUN_DEADLINE", 0) or 0) or None)
+            if job.status == DONE:
+                f = open(job.path, "rb")
+                f.seek(len(header))
+                for chunk in _file_chunks(f):
+                    n_bytes += len(chunk)
+                    yield chunk
+                break
+            if job.status == FAILED and job.error != CANCELLED:
+                raise RuntimeError(job.error)
     except Exception as e:
-        logger.error("event=report.http_error error=%s", str(e))
+        logger.error("event=report.http_error job=%s bytes=%s error=%s", job.id if job else None, n_bytes, str(e))
+        raise
+    logger.info("event=report.http_written job=%s bytes=%s gzip=%s coalesced=%s", job.id, n_bytes, compressed, owner is None)
+
+def _serve_artifact(request, job, compressed: bool):
+    f = open(job.path, "rb")
+    content = _file_chunks(f)
+    if compressed:
+        content = compress_sequence(content)
+    resp = StreamingHttpResponse(content, content_type="text/csv; charset=utf-8")
+    etag = f'"{job.sha256}"'
+    resp["ETag"] = f"W/{etag}" if compressed else etag
+    resp["Last-Modified"] = http_date(job.finished_at.timestamp())
+    patch_cache_control(resp, private=True, no_cache=True)
+    conditional = get_conditional_response(
+        request, etag=resp["ETag"], last_modified=int(job.finished_at.timestamp()), response=resp
+    )
+    if conditional is not resp:
+        f.close()
+    return conditional
+
+def report_csv(request):
+    try:
+        query = IssueQuery.from_mapping(request.GET)
+    except ValueError as e:
         return HttpResponseBadRequest(str(e))
-    content = rows_to_csv(rows)
-    resp = HttpResponse(content, content_type="text/csv; charset=utf-8")
-    resp["Content-Disposition"] = 'attachment; filename="acc_issues_report.csv"'
-    logger.info("event=report.http_written rows=%s bytes=%s", len(rows), len(content))
+    compressed = _wants_gzip(request)
+    params = report_params(query)
+    runner = get_report_jobs()
+    artifact = None if request.GET.get("fresh") else runner.latest(report_key(params))
+    if artifact is not None:
+        stale = runner.is_stale(artifact)
+        if stale:
+            runner.submit(params)
+        logger.info("event=report.http_cached job=%s stale=%s", artifact.id, stale)
+        resp = _serve_artifact(request, artifact, compressed)
+    else:
+        logger.info("event=report.http_start project=%s", settings.TARGET_PROJECT_NAME)
+        content = _stream_report(params, compressed)
+        if compressed:
+            content = compress_sequence(content)
+        resp = StreamingHttpResponse(content, content_type="text/csv; charset=utf-8")
+    if resp.status_code == 200:
+        resp["Content-Disposition"] = 'attachment; filename="acc_issues_report.csv"'
+        if compressed:
+            resp["Content-Encoding"] = "gzip"
+    patch_vary_headers(resp, ("Accept-Encoding",))
     return resp